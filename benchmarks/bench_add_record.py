@@ -0,0 +1,62 @@
+"""
+Benchmark for AddressBook.add_record.
+
+Inserts generated contacts in random name order and prints the time per insert for
+growing book sizes. With the sorted name index the time per insert stays flat, so the
+total time grows linearly with the number of contacts.
+
+Usage:
+    python -m benchmarks.bench_add_record
+    python -m benchmarks.bench_add_record 10000 100000 1000000
+"""
+
+import random
+import string
+import sys
+from time import perf_counter
+
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.entities import Phone, User
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def generate_records(n: int, seed: int = 0) -> list[Record]:
+    """
+    The generate_records function creates n records with unique random names and one phone number each.
+    """
+    rnd = random.Random(seed)
+    records = []
+    for number in range(n):
+        name = "".join(rnd.choices(string.ascii_lowercase, k=8)) + str(number)
+        record = Record(User(name))
+        record.add_phone_number(Phone(f"+380{rnd.randrange(10**9):09d}"))
+        records.append(record)
+    return records
+
+
+def bench_add_record(n: int) -> float:
+    """
+    The bench_add_record function returns the time in seconds spent adding n records to an empty address book.
+    """
+    records = generate_records(n)
+    address_book = AB()
+    start = perf_counter()
+    for record in records:
+        address_book.add_record(record)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """
+    The main function runs the benchmark for every size and prints the results.
+    """
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    print(f"{'contacts':>10} | {'total, s':>9} | {'per insert, us':>14}")
+    for n in sizes:
+        total = bench_add_record(n)
+        print(f"{n:>10} | {total:>9.3f} | {total / n * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for the bulk import of contacts.
+
+Writes a CSV file of generated contacts, a few of them invalid, and prints the time and the
+rows per minute of importing it into an empty address book with 1 worker process and with
+all CPUs.
+
+Usage:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import 1000000
+"""
+
+import csv
+import io
+import os
+import random
+import string
+import sys
+import tempfile
+from time import perf_counter
+
+from personal_helper.address_book import AddressBook as AB
+from personal_helper.importer import IMPORT_FIELDS, import_contacts
+
+ROWS = 200_000
+
+
+def write_contacts(file_name: str, n: int, seed: int = 0) -> None:
+    """
+    The write_contacts function writes a CSV file of n contacts, one in a hundred of them invalid.
+    """
+    rnd = random.Random(seed)
+    with open(file_name, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(IMPORT_FIELDS)
+        for number in range(n):
+            name = "".join(rnd.choices(string.ascii_lowercase, k=8)) + "".join(
+                string.ascii_lowercase[int(digit)] for digit in str(number)
+            )
+            phone = f"+380{number:09d}" if number % 100 else "12"
+            birthday = f"{rnd.randrange(1, 29):02d}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1950, 2010)}"
+            writer.writerow([name, phone, f"{name}@example.com", birthday])
+
+
+def bench_import(file_name: str, workers: int) -> tuple[float, int]:
+    """
+    The bench_import function returns the time in seconds to import the file into an empty
+    address book and the number of imported contacts.
+    """
+    address_book = AB()
+    start = perf_counter()
+    with open(file_name, encoding="utf-8", newline="") as file:
+        imported, _ = import_contacts(address_book, file, "csv", io.StringIO(), workers)
+    return perf_counter() - start, imported
+
+
+def main() -> None:
+    """
+    The main function runs the benchmark with one worker and with all CPUs and prints the results.
+    """
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_name = os.path.join(temp_dir, "contacts.csv")
+        write_contacts(file_name, rows)
+        for workers in sorted({1, os.cpu_count() or 1}):
+            elapsed, imported = bench_import(file_name, workers)
+            print(
+                f"{workers:>3} workers: {imported} contacts in {elapsed:.2f} s, "
+                f"{rows / elapsed * 60:,.0f} rows per minute"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark for reading one contact from a stored address book.
+
+Stores generated contacts both as the pickled dict of the earlier versions and as an
+indexed snapshot, then prints the time to load the book and read one contact from it.
+The pickled dict is unpickled whole, the snapshot reads only its directory and one record.
+
+Usage:
+    python -m benchmarks.bench_load_contact
+    python -m benchmarks.bench_load_contact 10000 100000
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+from time import perf_counter
+
+from personal_helper.address_book import AddressBook as AB
+from benchmarks.bench_add_record import generate_records
+
+SIZES = [10_000, 100_000]
+
+
+def bench_load_contact(file_name: str, name: str) -> float:
+    """
+    The bench_load_contact function returns the time in seconds to open the file and read one contact.
+    """
+    start = perf_counter()
+    AB.from_file(file_name).get_contact(name)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """
+    The main function prints the time to read one contact for every book size and file format.
+    """
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pickle_file = os.path.join(temp_dir, "address_book.pickle")
+        snapshot_file = os.path.join(temp_dir, "address_book.bin")
+        for size in sizes:
+            address_book = AB()
+            for record in generate_records(size):
+                address_book.add_record(record)
+            with open(pickle_file, "wb") as file:
+                pickle.dump(address_book.data, file)
+            address_book.save_records_to_file(snapshot_file)
+            name = list(address_book)[size // 2]
+
+            pickled = bench_load_contact(pickle_file, name)
+            snapshot = bench_load_contact(snapshot_file, name)
+            print(f"{size:>9} contacts: pickle {pickled * 1000:8.1f} ms, snapshot {snapshot * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark for the memory taken by the contacts.
+
+Builds an address book of generated contacts, each with a birthday, two phone numbers and
+an email, and prints the bytes of memory allocated per contact, measured with tracemalloc,
+and the bytes per contact of the pickled records, as they are written to the snapshot file.
+The memory is measured for the usual AddressBook and for the ColumnarAddressBook.
+
+Usage:
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory 10000 100000 1000000
+"""
+
+import pickle
+import random
+import string
+import sys
+import tracemalloc
+from datetime import date
+
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.columnar import ColumnarAddressBook
+from personal_helper.entities import Email, Phone, User
+
+SIZES = [10_000, 100_000]
+
+
+def build_address_book(n: int, book_class: type[AB] = AB, seed: int = 0) -> AB:
+    """
+    The build_address_book function creates an address book of the given class with n contacts
+    with a birthday, two phone numbers and an email each.
+    """
+    rnd = random.Random(seed)
+    address_book = book_class()
+    for number in range(n):
+        name = "".join(rnd.choices(string.ascii_lowercase, k=8)) + str(number)
+        record = Record(User(name, date(1950 + rnd.randrange(60), rnd.randrange(1, 13), rnd.randrange(1, 29))))
+        record.add_phone_number(Phone(f"380{rnd.randrange(10**9):09d}"))
+        record.add_phone_number(Phone(f"380{rnd.randrange(10**9):09d}"))
+        record.add_email(Email(f"{name}@example.com"))
+        address_book.add_record(record)
+    return address_book
+
+
+def bench_memory(n: int, book_class: type[AB] = AB) -> tuple[float, float]:
+    """
+    The bench_memory function returns the bytes of memory and the bytes of pickle per contact
+    of an address book of the given class with n contacts.
+    """
+    tracemalloc.start()
+    address_book = build_address_book(n, book_class)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    pickled = sum(len(pickle.dumps(record)) for record in address_book.values())
+    return memory / n, pickled / n
+
+
+def main() -> None:
+    """
+    The main function runs the benchmark for every size and prints the results.
+    """
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    print(f"{'contacts':>10} | {'memory, B':>10} | {'columnar, B':>11} | {'pickle, B':>10}")
+    for n in sizes:
+        memory, pickled = bench_memory(n)
+        columnar, _ = bench_memory(n, ColumnarAddressBook)
+        print(f"{n:>10} | {memory:>10.0f} | {columnar:>11.0f} | {pickled:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
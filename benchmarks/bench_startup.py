@@ -0,0 +1,121 @@
+"""
+Benchmark for the startup of pbot.
+
+Runs pbot commands with python -X importtime in a temporary directory, which is the home
+and the working directory of the calls, so the sort command only sorts an empty folder of
+it. It prints for every command the time spent importing modules beyond those of a bare
+interpreter, the number of modules of the package imported and the wall time of the whole
+call, each the best of several runs. A command whose import time is over its budget is flagged, and the
+benchmark exits with code 1, so it can guard the startup in CI.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --scale 2
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGETS = {
+    "-h": 30.0,
+    "note -f work": 50.0,
+    "search -s ab": 110.0,
+    "show -a all": 110.0,
+    "sort -d work": 130.0,
+}
+
+
+def import_times(stderr: str) -> dict[str, int]:
+    """
+    The import_times function returns the cumulative microseconds of every top-level import
+    of the -X importtime output. The imports run inside functions are top-level as well.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def imported_modules(stderr: str) -> set[str]:
+    """
+    The imported_modules function returns the names of all the modules of the package listed
+    in the -X importtime output. The main module is not listed.
+    """
+    return {
+        line.split("|")[2].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line and "personal_helper" in line
+    }
+
+
+def run(args: list[str], home: str) -> tuple[float, str]:
+    """
+    The run function runs python -X importtime with the arguments in the home directory and
+    returns the wall time in seconds and the standard error.
+    """
+    start = perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=home,
+        env={**os.environ, "HOME": home, "PYTHONPATH": ROOT},
+        check=False,
+    )
+    return perf_counter() - start, result.stderr
+
+
+def bench_startup(command: str, home: str, baseline: set[str], runs: int) -> tuple[float, int, float]:
+    """
+    The bench_startup function returns the best import time in milliseconds, the number of
+    the modules of the package imported and the best wall time in milliseconds of the command.
+    """
+    best_import = best_wall = float("inf")
+    modules = 0
+    for _ in range(runs):
+        wall, stderr = run(["-m", "personal_helper.run_bot", *command.split()], home)
+        times = import_times(stderr)
+        best_import = min(best_import, sum(time for name, time in times.items() if name not in baseline) / 1000)
+        best_wall = min(best_wall, wall * 1000)
+        modules = len(imported_modules(stderr))
+    return best_import, modules, best_wall
+
+
+def main() -> None:
+    """
+    The main function runs the benchmark for every command and checks the budgets.
+    """
+    parser = argparse.ArgumentParser(description="Startup benchmark of pbot.")
+    parser.add_argument("--runs", type=int, default=5, help="runs of every command, the best is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the budgets for slower machines")
+    arguments = parser.parse_args()
+
+    over = []
+    with tempfile.TemporaryDirectory() as home:
+        os.makedirs(os.path.join(home, "work"))
+        baseline = set(import_times(run(["-c", "pass"], home)[1])) | {"runpy", "personal_helper"}
+        print(f"{'command':<16} | {'imports, ms':>11} | {'budget, ms':>10} | {'modules':>7} | {'wall, ms':>8}")
+        for command, budget in BUDGETS.items():
+            imports, modules, wall = bench_startup(command, home, baseline, arguments.runs)
+            budget *= arguments.scale
+            flag = "  OVER BUDGET" if imports > budget else ""
+            if flag:
+                over.append(command)
+            print(f"{command:<16} | {imports:>11.1f} | {budget:>10.1f} | {modules:>7} | {wall:>8.1f}{flag}")
+
+    if over:
+        print(f"{len(over)} commands are over their import budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
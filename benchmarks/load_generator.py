@@ -0,0 +1,174 @@
+"""
+Load generator for the pbot server.
+
+Opens a number of client connections that send a mix of read commands (show, search, birth,
+whois) and write commands (add, change) as fast as the server answers, and prints the p50
+and p99 latency of the reads and of the writes.
+
+Without --socket the generator starts "pbot serve" in a temporary home directory, fills it
+with generated contacts through a batch and stops the server at the end.
+
+Usage:
+    python -m benchmarks.load_generator
+    python -m benchmarks.load_generator --clients 32 --requests 500 --writes 0.2
+    python -m benchmarks.load_generator --socket ~/pbot.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from statistics import quantiles
+
+CONTACTS = 2000
+
+
+def random_name(rnd: random.Random) -> str:
+    """
+    The random_name function returns a random contact name made of letters only.
+    """
+    return "".join(rnd.choices(string.ascii_lowercase, k=10)).title()
+
+
+def random_phone(rnd: random.Random) -> str:
+    """
+    The random_phone function returns a random Ukrainian mobile phone number.
+    """
+    return f"38050{rnd.randrange(10**7):07d}"
+
+
+def next_command(rnd: random.Random, names: list[str], writes: float) -> tuple[str, str]:
+    """
+    The next_command function returns the kind, read or write, and the line of a random command.
+    """
+    if rnd.random() < writes:
+        if rnd.random() < 0.5:
+            name = random_name(rnd)
+            names.append(name)
+            return "write", f"add -n {name} -p {random_phone(rnd)}"
+        return "write", f"change -n {rnd.choice(names)} -p {random_phone(rnd)}"
+
+    choice = rnd.randrange(4)
+    if choice == 0:
+        return "read", f"show -a {rnd.choice(names)}"
+    if choice == 1:
+        return "read", f"search -s {rnd.choice(names)[:3]}"
+    if choice == 2:
+        return "read", "birth -d 30"
+    return "read", f"whois -p {random_phone(rnd)}"
+
+
+async def client(
+    socket_path: str, seed: int, requests: int, writes: float, names: list[str],
+    latencies: dict[str, list[float]],
+) -> None:
+    """
+    The client function sends requests one after another over one connection and records
+    the latency of every request by its kind.
+    """
+    rnd = random.Random(seed)
+    reader, writer = await asyncio.open_unix_connection(socket_path, limit=2**24)
+    for _ in range(requests):
+        kind, command = next_command(rnd, names, writes)
+        start = time.perf_counter()
+        writer.write(json.dumps({"command": command}).encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencies[kind].append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def generate_load(
+    socket_path: str, clients: int, requests: int, writes: float, names: list[str]
+) -> dict[str, list[float]]:
+    """
+    The generate_load function runs the clients at the same time and returns the latencies.
+    """
+    latencies: dict[str, list[float]] = {"read": [], "write": []}
+    await asyncio.gather(*(
+        client(socket_path, seed, requests, writes, names, latencies)
+        for seed in range(clients)
+    ))
+    return latencies
+
+
+def start_server(home: str) -> tuple[subprocess.Popen, str, list[str]]:
+    """
+    The start_server function fills a temporary home directory with contacts and starts
+    pbot serve in it. It returns the server process, the socket path and the contact names.
+    """
+    rnd = random.Random(-1)
+    names = [random_name(rnd) for _ in range(CONTACTS)]
+    script = os.path.join(home, "contacts.txt")
+    with open(script, "w", encoding="utf-8") as file:
+        for name in names:
+            file.write(f"add -n {name} -p {random_phone(rnd)}\n")
+
+    env = dict(os.environ, HOME=home)
+    command = [sys.executable, "-m", "personal_helper.run_bot"]
+    subprocess.run(command + ["batch", script], env=env, stdout=subprocess.DEVNULL, check=True)
+    server = subprocess.Popen(command + ["serve"], env=env, stdout=subprocess.DEVNULL)
+
+    socket_path = os.path.join(home, "pbot.sock")
+    while not os.path.exists(socket_path):
+        time.sleep(0.05)
+    return server, socket_path, names
+
+
+def report(kind: str, latencies: list[float]) -> None:
+    """
+    The report function prints the number of requests and the p50 and p99 latency in milliseconds.
+    """
+    if len(latencies) < 2:
+        print(f"{kind:>6}: {len(latencies)} requests")
+        return
+    percentiles = quantiles(latencies, n=100)
+    print(
+        f"{kind:>6}: {len(latencies):>6} requests, "
+        f"p50 {percentiles[49] * 1000:7.2f} ms, p99 {percentiles[98] * 1000:7.2f} ms"
+    )
+
+
+def main() -> None:
+    """
+    The main function runs the load against the server and prints the latencies.
+    """
+    parser = argparse.ArgumentParser(description="mixed read/write load for pbot serve")
+    parser.add_argument("--socket", help="Socket of a running server")
+    parser.add_argument("--clients", type=int, default=16, help="Number of connections")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per connection")
+    parser.add_argument("--writes", type=float, default=0.1, help="Share of the writes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        server = None
+        if args.socket:
+            socket_path, names = os.path.expanduser(args.socket), ["Alice"]
+        else:
+            server, socket_path, names = start_server(home)
+        try:
+            start = time.perf_counter()
+            latencies = asyncio.run(
+                generate_load(socket_path, args.clients, args.requests, args.writes, names)
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} requests in {elapsed:.2f} s, {total / elapsed:.0f} requests/s")
+    report("read", latencies["read"])
+    report("write", latencies["write"])
+
+
+if __name__ == "__main__":
+    main()
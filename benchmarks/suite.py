@@ -0,0 +1,263 @@
+"""
+Benchmark suite for the address book, the notes and the file sorter.
+
+Builds address books of generated contacts, note stores and trees of files of growing sizes,
+times the main operations on them and writes the results to a JSON file. The time of every
+operation is the best of several runs, divided by the number of calls in a run, so the
+results of different sizes can be compared with each other.
+
+With --baseline the results are compared with those of a stored JSON file and every
+operation slower than the baseline by more than the threshold is flagged as a regression,
+and the suite exits with code 1. benchmarks/baseline.json holds the results of the default
+sizes; --save-baseline writes the results of the run there.
+
+The largest books take about 1.2 kB of memory per contact, so 10M contacts need over 12 GB.
+
+Usage:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --sizes 1000 10000 100000 1000000 10000000 --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.3
+    python -m benchmarks.suite --save-baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+from unittest.mock import patch
+
+from personal_helper import commands
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.entities import Email, Phone, User
+from personal_helper.notes import Notes
+from personal_helper.sorting_files import SortingFiles
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = [1_000, 10_000, 100_000]
+NOTES = [1_000, 10_000]
+FILES = [100, 1_000]
+CALLS = 100
+EXTENSIONS = ["jpg", "png", "mp4", "txt", "pdf", "docx", "mp3", "zip", "tar", "py", "csv"]
+
+
+def generate_records(n: int, seed: int = 0) -> list[Record]:
+    """
+    The generate_records function creates n records with unique random names, a birthday,
+    two phone numbers and an email each. The same seed gives the same records.
+    """
+    rnd = random.Random(seed)
+    records = []
+    for number in range(n):
+        name = "".join(rnd.choices(string.ascii_lowercase, k=8)) + str(number)
+        record = Record(User(name, date(1950 + rnd.randrange(60), rnd.randrange(1, 13), rnd.randrange(1, 29))))
+        record.add_phone_number(Phone(f"+380{rnd.randrange(10**9):09d}"))
+        record.add_phone_number(Phone(f"+380{rnd.randrange(10**9):09d}"))
+        record.add_email(Email(f"{name}@example.com"))
+        records.append(record)
+    return records
+
+
+def measure(run: Callable[[], object], calls: int, repeat: int, setup: Callable[[], object] | None = None) -> float:
+    """
+    The measure function returns the best time in seconds per call of the runs, where every
+    run makes the given number of calls. The setup is called before every run and not timed.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        run()
+        best = min(best, perf_counter() - start)
+    return best / calls
+
+
+def bench_address_book(n: int, repeat: int) -> dict[str, float]:
+    """
+    The bench_address_book function times the operations of an address book of n contacts
+    and returns the seconds per call of every operation.
+    """
+    rnd = random.Random(n)
+    records = generate_records(n)
+    names = [record.user.name for record in rnd.sample(records, min(CALLS, n))]
+    phones = [record.phones()[0][4:10] for record in rnd.sample(records, min(CALLS, n))]
+    results: dict[str, float] = {}
+
+    def add_records() -> None:
+        address_book = AB()
+        for record in records:
+            address_book.add_record(record)
+
+    results["add_record"] = measure(add_records, n, repeat)
+    address_book = AB()
+    for record in records:
+        address_book.add_record(record)
+
+    def search() -> None:
+        for name, phone in zip(names, phones):
+            address_book.search(name[:3])
+            address_book.search(phone)
+
+    results["search"] = measure(search, 2 * len(names), repeat)
+    results["get_contact"] = measure(lambda: [address_book.get_contact(name) for name in names], len(names), repeat)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull), \
+            patch.object(commands, "load_contact_book", return_value=address_book):
+        results["birthday_in_next_days"] = measure(lambda: commands.birthday_in_next_days("7"), 1, repeat)
+        results["print_contacts"] = measure(lambda: commands.print_contacts(address_book), 1, repeat)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_name = os.path.join(temp_dir, "address_book.bin")
+        results["save_records_to_file"] = measure(lambda: address_book.save_records_to_file(file_name), 1, repeat)
+        results["read_records_from_file"] = measure(lambda: AB().read_records_from_file(file_name), 1, repeat)
+    return results
+
+
+def bench_notes(n: int, repeat: int) -> dict[str, float]:
+    """
+    The bench_notes function times the search and the adding of notes in a store of n notes
+    and returns the seconds per call of every operation.
+    """
+    rnd = random.Random(n)
+    words = ["".join(rnd.choices(string.ascii_lowercase, k=6)) for _ in range(1000)]
+    stored = {
+        (f"#tag{number}",): " ".join(rnd.choices(words, k=12)) for number in range(n)
+    }
+    notes = Notes()
+    results: dict[str, float] = {}
+
+    def reset() -> None:
+        notes.data = dict(stored)
+
+    def add_notes() -> None:
+        for number in range(CALLS):
+            notes.add_note([f"#new{number}"], "text of the new note")
+
+    with redirect_stdout(io.StringIO()):
+        reset()
+        results["find"] = measure(lambda: [notes.find(word) for word in words[:10]], 10, repeat)
+        results["add_note"] = measure(add_notes, CALLS, repeat, setup=reset)
+    return results
+
+
+def make_tree(path: Path, n: int) -> None:
+    """
+    The make_tree function creates n empty files with various extensions in nested folders.
+    """
+    rnd = random.Random(n)
+    for number in range(n):
+        folder = path.joinpath(*(f"folder{rnd.randrange(5)}" for _ in range(rnd.randrange(4))))
+        folder.mkdir(parents=True, exist_ok=True)
+        folder.joinpath(f"file{number}.{rnd.choice(EXTENSIONS)}").touch()
+
+
+def bench_sorting_files(n: int, repeat: int) -> dict[str, float]:
+    """
+    The bench_sorting_files function times the sorting of a tree of n files and returns the
+    seconds per sorting.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir, "tree")
+
+        def setup() -> None:
+            shutil.rmtree(path, ignore_errors=True)
+            make_tree(path, n)
+
+        def sort_files() -> None:
+            sorting_files = SortingFiles(path)
+            sorting_files.files_addresses()
+            sorting_files.sort_extensions()
+            sorting_files.removing_files()
+            sorting_files.del_empty_folders()
+
+        return {"sort": measure(sort_files, 1, repeat, setup=setup)}
+
+
+def run_suite(sizes: list[int], notes: list[int], files: list[int], repeat: int) -> dict[str, float]:
+    """
+    The run_suite function runs all benchmarks and returns the seconds per call of every
+    operation, keyed by "<group>.<operation>[<size>]".
+    """
+    results: dict[str, float] = {}
+    groups = [
+        ("address_book", bench_address_book, sizes),
+        ("notes", bench_notes, notes),
+        ("sorting_files", bench_sorting_files, files),
+    ]
+    for group, bench, group_sizes in groups:
+        for size in group_sizes:
+            for operation, seconds in bench(size, repeat).items():
+                key = f"{group}.{operation}[{size}]"
+                results[key] = seconds
+                print(f"{key:<45} {seconds * 1e6:>14.2f} us", file=sys.stderr)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    The compare function prints the change of every operation against the baseline and
+    returns the keys of the operations slower than the baseline by more than the threshold.
+    The operations missing from either side are skipped.
+    """
+    regressions = []
+    print(f"{'operation':<45} | {'baseline, us':>13} | {'current, us':>13} | {'change':>8}")
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        change = seconds / baseline[key] - 1 if baseline[key] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<45} | {baseline[key] * 1e6:>13.2f} | {seconds * 1e6:>13.2f} | {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    """
+    The main function runs the suite, writes the results and compares them with the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark suite of the personal helper.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of contacts")
+    parser.add_argument("--notes", type=int, nargs="+", default=NOTES, help="numbers of notes")
+    parser.add_argument("--files", type=int, nargs="+", default=FILES, help="numbers of files to sort")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of every operation, the best is kept")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="JSON file with the results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown flagged as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {BASELINE}")
+    arguments = parser.parse_args()
+
+    results = run_suite(arguments.sizes, arguments.notes, arguments.files, arguments.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    for output in filter(None, [arguments.output, BASELINE if arguments.save_baseline else None]):
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, arguments.threshold)
+        if regressions:
+            print(f"{len(regressions)} operations are slower than the baseline by more than {arguments.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
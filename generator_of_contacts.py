@@ -1,58 +1,266 @@
-"""..."""
-from datetime import datetime
+"""
+The generator_of_contacts module fills the address book or a JSON Lines file with fake contacts.
+
+The contacts are generated in chunks in a pool of worker processes and written chunk by
+chunk in order, so millions of contacts are generated without holding them all in memory
+and without waiting for one process. The same seed gives the same contacts, whatever the
+number of workers, as long as the chunk size and the version of Faker are the same: every
+chunk draws from its own random generator seeded with the seed and its first contact.
+
+Faker is slow to call for every contact, so every worker creates one Faker per locale and
+draws pools of names, user names and email domains from it once. The contacts are then
+put together from the pools with the random generator of the chunk.
+
+The distributions are set by:
+    - phones: The weights of 0, 1, 2, ... phone numbers per contact.
+    - emails: The share of the contacts with an email.
+    - birthdays: The share of the contacts with a birthday.
+    - cyrillic: The share of the contacts with Ukrainian names in Cyrillic.
+
+The names are "<first name> <last name> <tag>", where the tag is made of letters from the
+number of the contact, so they are unique and valid. The phone numbers are unique as well.
+The rows of the JSON Lines file have the keys name, phones, emails and birthday, as the
+files read by the import command.
+
+Usage:
+    python generator_of_contacts.py 10
+    python generator_of_contacts.py 10000000 --workers 8 --output contacts.jsonl
+    python generator_of_contacts.py 100000 --seed 7 --phones 0.1 0.6 0.3 --emails 0.5 --cyrillic 0.3
+"""
+
+import argparse
+import json
+import os
 import random
-from faker import Factory
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from itertools import accumulate
+from string import ascii_lowercase
+from typing import Any, Callable, Iterable, Iterator, TextIO
 
+from faker import Faker
 
 from personal_helper.address_book import Record, AddressBook as AB
-from personal_helper.entities import Phone, User, Email
-from personal_helper.constants import FILE
-from personal_helper.utils import sanitize_phone_number
-
-def generator_contacts(n=10) -> list[dict]:
-    """
-    The generator_contacts function generates a list of contacts.
-    """
-    locales = ['en_US']
-    locale = random.choice(locales)
-    contacts: list = []
-    for _ in range(n):
-        fake = Factory.create(locale)
-        contact = {}
-        contact['name'] = fake.first_name()
-        contact['birthday'] = fake.date()
-        contact['phone_number'] = fake.phone_number()
-        contact['email'] = fake.ascii_email()
-        print(contact)
-        contacts.append(contact)
-    return contacts
-
-def move_to_address_book(contacts, address_book):
-    """
-    The move_to_address_book function takes a list of dictionaries and an address book as arguments.
-    It then iterates through the list of dictionaries, creating a Record object for each dictionary in the list.
-    The function then adds that record to the address book.
-    """
-    for contact in contacts:
-        contact_name = contact['name'].strip().lower()
-        date_object = datetime.strptime(contact['birthday'], '%Y-%m-%d')
-        birthday = date_object.strftime('%d-%m-%Y')
-        
-        phone = Phone(sanitize_phone_number(contact['phone_number']))
-        
-        email = Email(contact['email'])
-        user = User(contact_name)
-        contact = Record(user)
-        contact.add_email(email)
-        contact.add_phone_number(phone)
-        contact.add_birthday(birthday)
-        address_book.add_record(contact)
+from personal_helper.constants import LETTERS
+from personal_helper.importer import validate_row
+from personal_helper.storage import get_storage
+
+LOCALES = {"latin": "en_US", "cyrillic": "uk_UA"}
+POOL_SIZE = 2000
+CHUNK_SIZE = 10000
+MAX_PHONES = 8
+PHONE_STEP = 387420489
+FIRST_BIRTHDAY = date(1940, 1, 1).toordinal()
+LAST_BIRTHDAY = date(2010, 12, 31).toordinal()
+DISTRIBUTION = {"phones": (0.1, 0.6, 0.3), "emails": 0.8, "birthdays": 0.9, "cyrillic": 0.0}
+
+
+@lru_cache(maxsize=None)
+def faker_for(locale: str) -> Faker:
+    """
+    The faker_for function returns the Faker of the locale, created once per process.
+    """
+    return Faker(locale)
+
+
+@lru_cache(maxsize=None)
+def pools(locale: str, seed: int) -> dict[str, list[str]]:
+    """
+    The pools function draws the first names, last names, user names and email domains of
+    the locale from its Faker, once per process and seed. The apostrophe of the Ukrainian
+    names is replaced with the one allowed in contact names, the names with other characters
+    not allowed, such as the double names, are left out, and the user names are kept to the
+    characters allowed in emails.
+    """
+    fake = faker_for(locale)
+    fake.seed_instance(seed)
+    first = [fake.first_name().replace("'", "ʼ") for _ in range(POOL_SIZE)]
+    last = [fake.last_name().replace("'", "ʼ") for _ in range(POOL_SIZE)]
+    users = [re.sub(r"[^a-z0-9_.]", "", fake.user_name().lower()) for _ in range(POOL_SIZE)]
+    return {
+        "first": [name for name in first if not name.strip(LETTERS)],
+        "last": [name for name in last if not name.strip(LETTERS)],
+        "users": [user if user[:1].isalpha() else "user" + user for user in users],
+        "domains": [fake.free_email_domain() for _ in range(POOL_SIZE // 20)],
+    }
+
+
+def tag(number: int) -> str:
+    """
+    The tag function writes the number of the contact with letters: 0 is "A", 26 is "Ba".
+    """
+    letters = ""
+    while True:
+        number, rest = divmod(number, 26)
+        letters = ascii_lowercase[rest] + letters
+        if not number:
+            return letters.title()
+
+
+def phone_number(slot: int, seed: int) -> str:
+    """
+    The phone_number function returns the phone number of the slot. The slots are mapped to
+    the nine digits one to one, so the numbers of different slots never repeat.
+    """
+    return f"+380{((slot + 1) * PHONE_STEP + seed) % 10**9:09d}"
+
+
+def generate_chunk(task: tuple[int, int, int, dict, bool]) -> Any:
+    """
+    The generate_chunk function generates the contacts of one chunk in a worker process.
+    It returns the records of the contacts, or their rows as the text of a JSON Lines file.
+
+    :param task: tuple: Pass the seed, the number of the first contact, the number of the
+        contacts, the distribution and whether to return records
+    """
+    seed, start, count, distribution, as_records = task
+    rnd = random.Random(f"{seed}:{start}")
+    latin = pools(LOCALES["latin"], seed)
+    cyrillic = pools(LOCALES["cyrillic"], seed)
+    phones_count = list(range(len(distribution["phones"])))
+    phones_weights = list(accumulate(distribution["phones"]))
+
+    rows = []
+    for number in range(start, start + count):
+        pool = cyrillic if rnd.random() < distribution["cyrillic"] else latin
+        row: dict[str, Any] = {
+            "name": f"{rnd.choice(pool['first'])} {rnd.choice(pool['last'])} {tag(number)}",
+            "phones": [
+                phone_number(number * MAX_PHONES + phone, seed)
+                for phone in range(rnd.choices(phones_count, cum_weights=phones_weights)[0])
+            ],
+            "emails": [],
+            "birthday": None,
+        }
+        if rnd.random() < distribution["emails"]:
+            row["emails"].append(f"{rnd.choice(pool['users'])}{number}@{rnd.choice(pool['domains'])}")
+        if rnd.random() < distribution["birthdays"]:
+            birthday = date.fromordinal(rnd.randint(FIRST_BIRTHDAY, LAST_BIRTHDAY))
+            row["birthday"] = f"{birthday.day:02d}-{birthday.month:02d}-{birthday.year}"
+        rows.append(row)
+
+    if as_records:
+        return [validate_row(row) for row in rows]
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _ordered(function: Callable, tasks: Iterable, workers: int) -> Iterator[Any]:
+    """
+    Yields the results of the function for the tasks in order. With several workers the
+    tasks run in a pool of processes, with at most two tasks per worker in flight.
+    """
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque = deque()
+        while True:
+            for task in tasks:
+                pending.append(executor.submit(function, task))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            yield pending.popleft().result()
+
+
+def generate_chunks(
+    n: int,
+    seed: int = 0,
+    workers: int = 1,
+    as_records: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    **distribution: Any,
+) -> Iterator[Any]:
+    """
+    The generate_chunks function yields the chunks of n generated contacts in order, as lists
+    of records or as the text of a JSON Lines file.
+
+    :param n: int: Specify the number of contacts
+    :param seed: int: Specify the seed of the contacts
+    :param workers: int: Specify the number of worker processes
+    :param as_records: bool: Yield records instead of text
+    :param chunk_size: int: Specify the number of contacts generated by a worker at a time
+    :param distribution: Override the phones, emails, birthdays or cyrillic of DISTRIBUTION
+    """
+    if len(distribution.get("phones", ())) > MAX_PHONES + 1:
+        raise ValueError(f"A contact can't have more than {MAX_PHONES} phone numbers")
+    distribution = {**DISTRIBUTION, **distribution}
+    tasks = (
+        (seed, start, min(chunk_size, n - start), distribution, as_records)
+        for start in range(0, n, chunk_size)
+    )
+    yield from _ordered(generate_chunk, tasks, workers)
+
+
+def generator_contacts(n: int = 10, seed: int = 0, **distribution: Any) -> list[dict]:
+    """
+    The generator_contacts function generates a list of n contacts as rows.
+    """
+    text = "".join(generate_chunks(n, seed, **distribution))
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def write_jsonl(chunks: Iterable[str], file: TextIO) -> None:
+    """
+    The write_jsonl function writes the chunks of a JSON Lines file as they are generated.
+    """
+    for chunk in chunks:
+        file.write(chunk)
+
+
+def write_storage(chunks: Iterable[list[Record]], storage: Any) -> AB:
+    """
+    The write_storage function replaces the stored address book with the generated contacts.
+    Every chunk is added to the address book and committed to the storage at once.
+    """
+    storage.replace(AB())
+    address_book = storage.load()
+    for records in chunks:
+        address_book.add_records(records)
+        storage.save(address_book)
     return address_book
 
-if __name__ == '__main__':
-    address_book = AB()
-    contacts = generator_contacts(10)
-    address_book = move_to_address_book(contacts, address_book)
-    address_book.save_records_to_file(FILE)
-    
-     
\ No newline at end of file
+
+def main() -> None:
+    """
+    The main function generates the contacts and writes them to the file or the storage.
+    """
+    parser = argparse.ArgumentParser(description="Generates fake contacts.")
+    parser.add_argument("n", type=int, nargs="?", default=10, help="number of contacts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", help="JSON Lines file, - for the standard output, the storage if not given")
+    parser.add_argument("--phones", type=float, nargs="+", default=DISTRIBUTION["phones"],
+                        help="weights of 0, 1, 2, ... phone numbers")
+    parser.add_argument("--emails", type=float, default=DISTRIBUTION["emails"], help="share with an email")
+    parser.add_argument("--birthdays", type=float, default=DISTRIBUTION["birthdays"], help="share with a birthday")
+    parser.add_argument("--cyrillic", type=float, default=DISTRIBUTION["cyrillic"], help="share of Cyrillic names")
+    arguments = parser.parse_args()
+
+    chunks = generate_chunks(
+        arguments.n,
+        arguments.seed,
+        arguments.workers,
+        as_records=arguments.output is None,
+        phones=tuple(arguments.phones),
+        emails=arguments.emails,
+        birthdays=arguments.birthdays,
+        cyrillic=arguments.cyrillic,
+    )
+    if arguments.output is None:
+        write_storage(chunks, get_storage())
+    elif arguments.output == "-":
+        write_jsonl(chunks, sys.stdout)
+    else:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            write_jsonl(chunks, file)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,24 +7,217 @@ This module defines the following classes:
 """
 
 import calendar
-import re
-import pickle
-from datetime import datetime
-from typing import Union, Any, List
+import threading
+from datetime import date, datetime
+from typing import Union, Any, Iterable, Iterator, List
 from collections import UserDict
 
 
 try:
     from .entities import Phone, User, Email
+    from .indexes import (
+        SortedList,
+        PhoneNgramIndex,
+        NameIndex,
+        FuzzyIndex,
+        PhoneDirectory,
+        EmailDirectory,
+        EmailDomainIndex,
+        BirthdayCalendar,
+    )
+    from .snapshot import LazyRecords, read_snapshot, write_snapshot
 except ImportError:
     from entities import Phone, User, Email
+    from indexes import (
+        SortedList,
+        PhoneNgramIndex,
+        NameIndex,
+        FuzzyIndex,
+        PhoneDirectory,
+        EmailDirectory,
+        EmailDomainIndex,
+        BirthdayCalendar,
+    )
+    from snapshot import LazyRecords, read_snapshot, write_snapshot
 
 
 class AddressBook(UserDict):
     """
     A class that represents an address book containing contact records.
+
+    The contact names are kept in a sorted index, so the address book is iterated in name
+    order without re-sorting the whole book after every change.
+
+    The secondary indexes are built on first use and then kept up to date: the address book
+    registers itself as the owner of the records it holds, and a record reports every change
+    of its data back to the owner through record_changed.
+
+    An address book opened with from_file keeps its records in LazyRecords, so a record is
+    read from the snapshot file only when it is accessed. The values of the fields listed in
+    SNAPSHOT_FIELDS are saved for every contact in the sections of the snapshot, and the
+    indexes over these fields are built from the sections instead of the records.
+
+    The commands that only read the address book may run at the same time in the threads of
+    the server. An index is built under _build_lock and stored only once it is complete, so
+    it is built once and no thread sees it half built. The lock is shared by the class, so
+    it is not pickled with an address book.
     """
 
+    SNAPSHOT_FIELDS = ("phones", "email_addresses")
+    _build_lock = threading.RLock()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._names = SortedList()
+        self._name_index: NameIndex | None = None
+        self._fuzzy_index: FuzzyIndex | None = None
+        self._record_indexes: dict[type, Any] = {}
+        self._changes: set[str] = set()
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, name: str, record: "Record") -> None:
+        if self._store(name, record):
+            self._names.add(name)
+            for index in self._name_indexes():
+                index.add(name)
+
+    def __delitem__(self, name: str) -> None:
+        record = self.data.pop(name)
+        self._names.remove(name)
+        if record._book is self:
+            record._book = None
+        for index in self._name_indexes():
+            index.remove(name)
+        for index in self._record_indexes.values():
+            index.remove(name)
+        self._changes.add(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def copy(self) -> "AddressBook":
+        """Returns a shallow copy of the address book with its own name index."""
+        return self.__class__(self)
+
+    @property
+    def name_index(self) -> NameIndex:
+        """Returns the casefolded index over the contact names, building it on first use."""
+        if self._name_index is None:
+            with self._build_lock:
+                if self._name_index is None:
+                    index = NameIndex()
+                    index.build(self._names)
+                    self._name_index = index
+        return self._name_index
+
+    @property
+    def fuzzy_index(self) -> FuzzyIndex:
+        """Returns the trigram index for the names with typos, building it on first use."""
+        if self._fuzzy_index is None:
+            with self._build_lock:
+                if self._fuzzy_index is None:
+                    index = FuzzyIndex()
+                    index.build(self._names)
+                    self._fuzzy_index = index
+        return self._fuzzy_index
+
+    def _name_indexes(self) -> list[NameIndex | FuzzyIndex]:
+        """Returns the indexes over the contact names that are built."""
+        return [index for index in (self._name_index, self._fuzzy_index) if index is not None]
+
+    @property
+    def phone_index(self) -> PhoneNgramIndex:
+        """Returns the n-gram index over the phone numbers, building it on first use."""
+        return self._record_index(PhoneNgramIndex)
+
+    @property
+    def phone_directory(self) -> PhoneDirectory:
+        """Returns the map from phone numbers to their owners, building it on first use."""
+        return self._record_index(PhoneDirectory)
+
+    @property
+    def email_directory(self) -> EmailDirectory:
+        """Returns the map from email addresses to their owners, building it on first use."""
+        return self._record_index(EmailDirectory)
+
+    @property
+    def domain_index(self) -> EmailDomainIndex:
+        """Returns the map from email domains to the contacts, building it on first use."""
+        return self._record_index(EmailDomainIndex)
+
+    @property
+    def birthday_calendar(self) -> BirthdayCalendar:
+        """Returns the calendar of the contacts' birthdays, building it on first use."""
+        return self._record_index(BirthdayCalendar)
+
+    def _record_index(self, index_class: type) -> Any:
+        """
+        Returns the index of the given class over the record data, building it on first use.
+        The index reads the values of every record through the Record method named by its field.
+        """
+        index = self._record_indexes.get(index_class)
+        if index is None:
+            with self._build_lock:
+                index = self._record_indexes.get(index_class)
+                if index is None:
+                    index = index_class()
+                    index.build(self._field_values(index.field))
+                    self._record_indexes[index_class] = index
+        return index
+
+    def _field_values(self, field: str) -> Iterator[tuple[str, List[Any]]]:
+        """
+        Yields the names of the contacts with the values returned by the Record method named
+        by the field. For a lazy address book whose snapshot has the section of the field,
+        the values of the records never read come from the section, so no record is unpickled.
+        """
+        stored = self.data.section(field) if isinstance(self.data, LazyRecords) else None
+        if stored is None:
+            for name, record in self.data.items():
+                yield name, getattr(record, field)()
+            return
+
+        loaded = self.data.loaded()
+        for name in self._names:
+            record = loaded.get(name)
+            yield name, getattr(record, field)() if record is not None else stored[name]
+
+    def record_changed(self, record: "Record") -> None:
+        """
+        Updates the indexes after the data of a record in the address book was changed.
+        """
+        name = record.user.name
+        if self.data.get(name) is record:
+            self._index_record(name, record)
+            self._changes.add(name)
+
+    def pop_changes(self) -> dict[str, "Record | None"]:
+        """
+        Returns the records added or changed since the last call, with None for the deleted
+        ones, and starts tracking the changes anew.
+        """
+        changes = {name: self.data.get(name) for name in self._changes}
+        self._changes = set()
+        return changes
+
+    def _index_record(self, name: str, record: "Record") -> None:
+        """
+        Puts the current data of the record into the indexes that are already built.
+        """
+        for index in self._record_indexes.values():
+            index.update(name, getattr(record, index.field)())
+
+    def iter_records(self) -> Iterator["Record"]:
+        """
+        Yields the records in name order. The records of the snapshot file that were not read
+        before are not kept in memory, so going through a large book once uses little memory.
+        """
+        if isinstance(self.data, LazyRecords):
+            for name in self._names:
+                yield self.data.peek(name)
+        else:
+            for name in self._names:
+                yield self.data[name]
+
     def get_contact(self, name: str) -> "Record":
         """Returns the contact record for the given name."""
         return self.data[name]
@@ -35,20 +228,55 @@ class AddressBook(UserDict):
         """
         name = record.user.name
         if name:
-            self.data[name] = record
-            self.sort_addressbook()
+            self[name] = record
+
+    def add_records(self, records: Iterable["Record"]) -> None:
+        """
+        Adds many contact records at once. The names of the new contacts are put into the
+        name index together, which sorts it anew when they are many.
+        """
+        new_names = [
+            record.user.name for record in records
+            if record.user.name and self._store(record.user.name, record)
+        ]
+        self._names.update(new_names)
+        for index in self._name_indexes():
+            for name in new_names:
+                index.add(name)
+
+    def _store(self, name: str, record: "Record") -> bool:
+        """
+        Puts the record into the data and the record indexes and marks it as changed.
+        Returns True if the name is new to the address book. A record of the snapshot that
+        was never read has no owner to release, so it is not read to be replaced.
+        """
+        is_new = name not in self.data
+        in_memory = self.data.loaded() if isinstance(self.data, LazyRecords) else self.data
+        old_record = in_memory.get(name)
+        if old_record is not None and old_record is not record and old_record._book is self:
+            old_record._book = None
+
+        self.data[name] = record
+        if record._book is None:
+            record._book = self
+        self._index_record(name, record)
+        self._changes.add(name)
+        return is_new
 
     def delete_record(self, record_name: str) -> None:
         """
         Removes a contact record from the address book.
         """
-        del self.data[record_name]
+        del self[record_name]
 
     def sort_addressbook(self) -> None:
         """
-        The sort_addressbool function sorts the address book by name.
+        The sort_addressbook function rebuilds the name indexes of the address book.
+        The indexes are kept up to date on every change, so this is only needed after self.data
+        was modified directly.
         """
-        self.data = dict(sorted(self.data.items(), key=lambda x: x[0]))
+        self._names = SortedList(self.data)
+        self._name_index = self._fuzzy_index = None
 
     def search(self, criteria: str) -> Union[str, "AddressBook"]:
         """
@@ -57,39 +285,140 @@ class AddressBook(UserDict):
         serch_contacts = AddressBook()
 
         if criteria.isdigit():
-            for record in self.data.values():
-                for phone_number in record.phone_numbers:
-                    if re.search(criteria, phone_number.subrecord.phone):
-                        serch_contacts.add_record(record)
+            for name in self.phone_index.search(criteria):
+                serch_contacts.add_record(self.data[name])
 
         else:
-            for record in self.data.values():
-                if re.search(criteria, record.user.name.lower()):
-                    serch_contacts.add_record(record)
+            for name in self.name_index.search(criteria):
+                serch_contacts.add_record(self.data[name])
 
         if len(serch_contacts) == 0:
             return f"According to this '{criteria}' criterion, no matches were found"
 
         return serch_contacts
 
-    def save_records_to_file(self, file_name: str) -> None:
+    def find_by_phone(self, phone: str) -> List[str]:
+        """
+        Returns the names of the contacts that own the phone number.
+        The phone number is compared by its digits only.
+        """
+        return sorted(self.phone_directory.get(phone))
+
+    def find_by_email(self, email: str) -> List[str]:
+        """
+        Returns the names of the contacts that own the email address, ignoring case.
+        """
+        return sorted(self.email_directory.get(email))
+
+    def find_by_domain(self, domain: str) -> List[str]:
         """
-        Save the data in the address book to a binary file using pickle.
+        Returns the names of the contacts that have an email address in the domain, ignoring case.
         """
-        with open(file_name, "wb") as file:
-            pickle.dump(self.data, file)
+        return sorted(self.domain_index.get(domain))
+
+    def upcoming_birthdays(
+        self, days: int, current_date: date | None = None
+    ) -> List["Record"]:
+        """
+        Returns the contacts with a birthday within the given number of days, the birthday today
+        included, ordered by the number of days left and then by name.
+        """
+        if current_date is None:
+            current_date = date.today()
+        return [
+            self.data[name]
+            for _, name in self.birthday_calendar.upcoming(days, current_date)
+        ]
+
+    def complete_name(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Returns up to limit contact names starting with the prefix, ignoring case.
+        """
+        return self.name_index.prefix(prefix, limit)
+
+    def suggest_names(self, name: str, limit: int = 3) -> List[str]:
+        """
+        Returns up to limit contact names within a few typos of the name, ignoring case,
+        the closest first.
+        """
+        return self.fuzzy_index.suggest(name, limit)
+
+    def similar_names(self, text: str, limit: int = 10) -> List[tuple[str, float]]:
+        """
+        Returns up to limit contact names with their trigram similarity to the text, ignoring
+        case, the most similar first.
+        """
+        return self.fuzzy_index.similar(text, limit)
+
+    def save_records_to_file(self, file_name: str, generation: int = 0) -> None:
+        """
+        Save the records of the address book to a snapshot file in name order, with the
+        values of the SNAPSHOT_FIELDS of every contact in the sections. The records that were
+        never read from the snapshot of a lazy address book are copied to the new file, and
+        their values to the sections, without unpickling them.
+        """
+        sections = {field: dict(self._field_values(field)) for field in self.SNAPSHOT_FIELDS}
+        write_snapshot(file_name, self, self.data, generation, sections)
 
     def read_records_from_file(self, file_name: str) -> None:
         """
-        Read data from a binary file using pickle and update the address book.
+        Read the records from a snapshot file or a pickle file of an earlier version
+        and update the address book.
+        """
+        content = self._open_file(file_name)
+        self.update(content)
+        if isinstance(content, LazyRecords):
+            content.close()
+
+    def close(self) -> None:
+        """
+        Closes the snapshot file of an address book opened with from_file. The records that
+        were not read yet are no longer available.
+        """
+        if isinstance(self.data, LazyRecords):
+            self.data.close()
+
+    @classmethod
+    def from_file(cls, file_name: str) -> "AddressBook":
+        """
+        Returns the address book stored in a file. Only the contact names are read from a
+        snapshot file, a record is read when it is accessed for the first time.
+        """
+        return cls.from_records(cls._open_file(file_name))
+
+    @classmethod
+    def from_records(cls, content: Any) -> "AddressBook":
+        """
+        Returns an address book holding the records opened by read_snapshot, or a mapping
+        of the records read from a file of an earlier version.
+        """
+        address_book = cls()
+        if isinstance(content, LazyRecords):
+            content.on_load = address_book._adopt
+            address_book.data = content
+            address_book._names = SortedList(content)
+        else:
+            address_book.update(content)
+            address_book._changes = set()
+        return address_book
+
+    @staticmethod
+    def _open_file(file_name: str) -> Any:
+        """
+        Opens a snapshot file, or unpickles a file of an earlier version.
         """
         try:
-            with open(file_name, "rb") as file:
-                content = pickle.load(file)
-                self.data.update(content)
+            return read_snapshot(file_name)
         except FileNotFoundError as error:
             raise FileNotFoundError(f"File not found {file_name}") from error
 
+    def _adopt(self, record: "Record") -> None:
+        """
+        Registers the address book as the owner of a record read from its snapshot file.
+        """
+        if record._book is None:
+            record._book = self
+
 
 class Record:
     """
@@ -99,9 +428,8 @@ class Record:
 
     Attributes:
         user (User): The User object representing the user details of the contact.
-        phone_numbers (List[Record.Subrecord]): A list of Subrecord objects representing the phone numbers of
-        the contact.
-        emails (List[Record.Subrecord]): A list of Subrecord objects representing the emails of the contact.
+        phone_numbers (List[Phone]): The phone numbers of the contact.
+        emails (List[Email]): The emails of the contact.
 
     Methods:
         add_phone_number: Adds a new phone number to the contact.
@@ -111,38 +439,84 @@ class Record:
         add_birthday: Adds a birthday date to the contact.
 
         days_to_birthday: Calculates the number of days until the next birthday of the contact.
+
+    The record uses __slots__ and is pickled as a tuple of the user and the lists of the phone
+    numbers and the emails. The records of the earlier versions, whose lists held a Subrecord
+    around every phone number and email, are unwrapped when they are unpickled.
     """
 
     class Subrecord:
         """
-        Subrecord is a class representing a subrecord of a contact, such as a phone number or email.
+        Subrecord wrapped a phone number or an email in the earlier versions. It is kept only
+        so that their files can be unpickled.
 
         Attributes:
-            name (List[str] | None): The name associated with the subrecord.
             subrecord (Any): The subrecord data.
         """
 
         def __init__(self, subrecord: Any):
             self.subrecord = subrecord
 
+    __slots__ = ("user", "phone_numbers", "emails", "_book", "__weakref__")
+
     def __init__(self, user: User):
         self.user = user
-        self.phone_numbers: List["Record.Subrecord"] = []
-        self.emails: List["Record.Subrecord"] = []
+        self.phone_numbers: List[Phone] = []
+        self.emails: List[Email] = []
+        self._book: AddressBook | None = None
+
+    def __getstate__(self) -> tuple:
+        return self.user, self.phone_numbers, self.emails
+
+    def __setstate__(self, state: tuple | dict) -> None:
+        if isinstance(state, dict):
+            state = (
+                state["user"],
+                [getattr(item, "subrecord", item) for item in state["phone_numbers"]],
+                [getattr(item, "subrecord", item) for item in state["emails"]],
+            )
+        self.user, self.phone_numbers, self.emails = state
+        self._book = None
+
+    def _changed(self) -> None:
+        """
+        Reports a change of the contact data to the address book that holds the record.
+        """
+        if self._book is not None:
+            self._book.record_changed(self)
+
+    @property
+    def address_book(self) -> AddressBook | None:
+        """
+        Returns the address book that holds the record, if any.
+        """
+        return self._book
+
+    def phones(self) -> List[str]:
+        """
+        Returns the phone numbers of the contact as strings.
+        """
+        return [number.phone for number in self.phone_numbers]
+
+    def email_addresses(self) -> List[str]:
+        """
+        Returns the emails of the contact as strings.
+        """
+        return [email.email for email in self.emails]
 
     def add_phone_number(self, phone_number: Phone) -> None:
         """
         Adds a new phone number to the contact.
         """
-        subrecord_phone = self.Subrecord(phone_number)
-        self.phone_numbers.append(subrecord_phone)
+        self.phone_numbers.append(phone_number)
+        self._changed()
 
     def add_email(self, email: Email) -> None:
         """
         Adds a new email to the contact.
         """
-        subrecord_email = self.Subrecord(email)
-        self.emails.append(subrecord_email)
+        self.emails.append(email)
+        self._changed()
 
     def change_phone_number(
         self, old_phone_number: Phone, new_phone_number: Phone
@@ -150,18 +524,20 @@ class Record:
         """
         Updates an existing phone number for the contact.
         """
-        for phone_number in self.phone_numbers:
-            if phone_number.subrecord == old_phone_number:
-                phone_number.subrecord.phone = new_phone_number.phone
+        for i, phone_number in enumerate(self.phone_numbers):
+            if phone_number == old_phone_number:
+                self.phone_numbers[i] = Phone(new_phone_number.phone)
+                self._changed()
                 return None
 
     def change_email(self, old_email: Email, new_email: Email) -> None:
         """
         Updates an existing email for the contact.
         """
-        for email in self.emails:
-            if email.subrecord == old_email:
-                email.subrecord.email = new_email.email
+        for i, email in enumerate(self.emails):
+            if email == old_email:
+                self.emails[i] = Email(new_email.email)
+                self._changed()
                 return None
 
     def delete_phone_number(self, phone_number: Phone) -> None:
@@ -169,8 +545,9 @@ class Record:
         Removes a phone number from the contact.
         """
         for i, number in enumerate(self.phone_numbers):
-            if number.subrecord == phone_number:
+            if number == phone_number:
                 del self.phone_numbers[i]
+                self._changed()
                 return None
 
     def delete_email(self, del_email: Email) -> None:
@@ -178,50 +555,53 @@ class Record:
         Removes a email from the contact.
         """
         for i, email in enumerate(self.emails):
-            if email.subrecord == del_email:
+            if email == del_email:
                 del self.emails[i]
+                self._changed()
                 return None
 
     def add_birthday(self, birthday_date: str) -> None:
         """
-        Add a birthday data to the contact.
+        Add a birthday data to the contact. The User is immutable, so it is replaced by a new
+        one with the birthday.
         """
         birthday = datetime.strptime(birthday_date, "%d-%m-%Y").date()
-        self.user.birthday_date = birthday
+        self.user = User(self.user.name, birthday)
+        self._changed()
+
+    def birthday_dates(self) -> List[date]:
+        """
+        Returns the birthday of the contact as a list with one date, or an empty list.
+        """
+        return [self.user.birthday_date] if self.user.birthday_date else []
 
-    def days_to_birthday(self) -> int | None:
+    def days_to_birthday(self, current_date: date | None = None) -> int | None:
         """
         Calculate the number of days to the next birthday.
+        The birthday today gives 0. A birthday on the 29th of February is celebrated on the
+        28th of February in the years that are not leap years.
         """
 
         birthday = self.user.birthday_date
         if birthday:
-            # current_date = datetime(2020, 6, 5)
-            # current_date = datetime(2020, 1, 5)
-            current_date = datetime.now()
-            has_29_february = False
+            if current_date is None:
+                current_date = date.today()
+            elif isinstance(current_date, datetime):
+                current_date = current_date.date()
 
-            if birthday.day == 29 and birthday.month == 2:
-                has_29_february = True
+            next_birthday = birthday_in_year(birthday, current_date.year)
+            if next_birthday < current_date:
+                next_birthday = birthday_in_year(birthday, current_date.year + 1)
 
-            if has_29_february and not calendar.isleap(current_date.year):
-                birthday = birthday.replace(day=28)
+            return (next_birthday - current_date).days
+        return None
 
-            next_birthday = datetime(current_date.year, birthday.month, birthday.day)
 
-            if (days_to_bd := (next_birthday - current_date).days) > 0:
-                return days_to_bd
-            else:
-                next_year = current_date.year + 1
-
-                if has_29_february:
-                    if calendar.isleap(next_year):
-                        next_birthday = next_birthday.replace(year=next_year, day=29)
-                    else:
-                        next_birthday = next_birthday.replace(year=next_year, day=28)
-                else:
-                    next_birthday = next_birthday.replace(year=next_year)
-
-                days_to_bd = (next_birthday - current_date).days
-
-                return days_to_bd
+def birthday_in_year(birthday: date, year: int) -> date:
+    """
+    Returns the date of the birthday in the given year.
+    The 29th of February is moved to the 28th of February if the year is not a leap year.
+    """
+    if birthday.month == 2 and birthday.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
+    return date(year, birthday.month, birthday.day)
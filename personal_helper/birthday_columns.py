@@ -0,0 +1,162 @@
+"""
+The birthday_columns module provides a columnar view of the contacts' birthdays.
+
+This module defines the following classes:
+    - BirthdayColumns: Birth years, months and days of many contacts stored as columns.
+
+This module defines the following functions:
+    - numpy_module: Imports NumPy on the first call.
+
+For NUMPY_MIN_CONTACTS contacts or more the columns are NumPy arrays when NumPy is installed,
+so the days to birthday, the ages and the upcoming window of the whole address book are
+computed in one vectorized pass. For fewer contacts, or without NumPy, the same values are
+computed with plain Python lists, and NumPy is not imported, as importing it takes longer
+than the loop over a small address book.
+"""
+
+from calendar import isleap
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, List
+
+try:
+    from .address_book import Record, birthday_in_year
+    from .constants import NUMPY_MIN_CONTACTS
+except ImportError:
+    from address_book import Record, birthday_in_year
+    from constants import NUMPY_MIN_CONTACTS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@lru_cache(maxsize=None)
+def numpy_module() -> Any:
+    """
+    The numpy_module function imports NumPy on the first call and returns it, or None when
+    NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class BirthdayColumns:
+    """
+    BirthdayColumns stores the birthdays of a sequence of contacts column by column.
+
+    Every result is a list aligned with the contacts passed in, with None for the contacts
+    without a birthday. All values are computed for one current date, so the clock is read
+    once per call instead of once per contact, and they are the same as the values of
+    Record.days_to_birthday, the 29th of February included. The attribute np is the NumPy
+    module when the columns are arrays, and None when they are lists.
+
+    Methods:
+        days_to_birthday: Returns the number of days to the next birthday of every contact.
+
+        ages: Returns the age of every contact.
+
+        upcoming_mask: Returns whether the birthday of every contact is within the next days.
+    """
+
+    def __init__(self, contacts: Iterable[Record]) -> None:
+        birthdays = [contact.user.birthday_date for contact in contacts]
+        self.has_birthday = [birthday is not None for birthday in birthdays]
+        self.years = [birthday.year if birthday else 1 for birthday in birthdays]
+        self.months = [birthday.month if birthday else 1 for birthday in birthdays]
+        self.days = [birthday.day if birthday else 1 for birthday in birthdays]
+
+        self.np = numpy_module() if len(birthdays) >= NUMPY_MIN_CONTACTS else None
+        np = self.np
+        if np is not None:
+            self.has_birthday = np.array(self.has_birthday, dtype=bool)
+            self.years = np.array(self.years, dtype=np.int32)
+            self.months = np.array(self.months, dtype=np.int32)
+            self.days = np.array(self.days, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.has_birthday)
+
+    def days_to_birthday(self, current_date: date | None = None) -> List[int | None]:
+        """
+        Returns the number of days to the next birthday of every contact.
+        """
+        current_date = current_date or date.today()
+        np = self.np
+        if np is None:
+            return [
+                self._days_left(year, month, day, current_date) if has else None
+                for has, year, month, day in zip(
+                    self.has_birthday, self.years, self.months, self.days
+                )
+            ]
+
+        today = np.datetime64(current_date, "D")
+        this_year = self._birthdays_in_year(current_date.year)
+        next_year = self._birthdays_in_year(current_date.year + 1)
+        days_left = np.where(this_year >= today, this_year - today, next_year - today)
+        return self._with_none(days_left.astype(np.int64))
+
+    def ages(self, current_date: date | None = None) -> List[int | None]:
+        """
+        Returns the age of every contact, which grows on the day that days_to_birthday gives 0.
+        """
+        current_date = current_date or date.today()
+        np = self.np
+        if np is None:
+            return [
+                current_date.year
+                - year
+                - (birthday_in_year(date(year, month, day), current_date.year) > current_date)
+                if has
+                else None
+                for has, year, month, day in zip(
+                    self.has_birthday, self.years, self.months, self.days
+                )
+            ]
+
+        today = np.datetime64(current_date, "D")
+        before_birthday = self._birthdays_in_year(current_date.year) > today
+        return self._with_none(current_date.year - self.years - before_birthday)
+
+    def upcoming_mask(self, days: int, current_date: date | None = None) -> List[bool]:
+        """
+        Returns whether every contact has a birthday within the given number of days,
+        the birthday today included.
+        """
+        days_left = self.days_to_birthday(current_date)
+        return [value is not None and value <= days for value in days_left]
+
+    @staticmethod
+    def _days_left(year: int, month: int, day: int, current_date: date) -> int:
+        """
+        Returns the number of days to the next birthday for one contact, without NumPy.
+        """
+        birthday = date(year, month, day)
+        next_birthday = birthday_in_year(birthday, current_date.year)
+        if next_birthday < current_date:
+            next_birthday = birthday_in_year(birthday, current_date.year + 1)
+        return (next_birthday - current_date).days
+
+    def _birthdays_in_year(self, year: int) -> "np.ndarray":
+        """
+        Returns the birthdays of all contacts in the given year as an array of dates.
+        The 29th of February is moved to the 28th of February if the year is not a leap year.
+        """
+        np = self.np
+        days = self.days
+        if not isleap(year):
+            days = np.where((self.months == 2) & (days == 29), 28, days)
+        months = np.datetime64(f"{year:04d}-01", "M") + (self.months - 1)
+        return months.astype("datetime64[D]") + (days - 1)
+
+    def _with_none(self, values: "np.ndarray") -> List[int | None]:
+        """
+        Converts an array of values to a list, with None for the contacts without a birthday.
+        """
+        return [
+            value if has else None
+            for value, has in zip(values.tolist(), self.has_birthday.tolist())
+        ]
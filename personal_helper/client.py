@@ -0,0 +1,59 @@
+"""
+The client module forwards a command to the pbot server.
+
+This module defines the following functions:
+    - send_command: Sends a command to the server and returns its response.
+    - main: Forwards the command line to the server and prints the output.
+
+The client imports only the standard library and the constants, so a command sent to a
+running server does not pay for loading the address book, the notes or the parsers.
+
+Usage:
+    pbotc show -a all
+"""
+
+import json
+import socket
+import sys
+from typing import Any
+
+try:
+    from .constants import SOCKET_FILE
+except ImportError:
+    from constants import SOCKET_FILE
+
+
+def send_command(command: str, socket_path: str = SOCKET_FILE) -> dict[str, Any]:
+    """
+    The send_command function sends one command to the server and returns the response,
+    a dict with the ok flag and the printed output.
+
+    :param command: str: Pass the command line to run
+    :param socket_path: str: Specify the path of the server socket
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({"command": command}).encode() + b"\n")
+        with sock.makefile("rb") as file:
+            return json.loads(file.readline())
+
+
+def main() -> None:
+    """
+    The main function forwards the command line to the server, prints the output and exits
+    with a non-zero code if the command failed.
+    """
+    command = " ".join(sys.argv[1:])
+    try:
+        response = send_command(command)
+    except OSError:
+        print("The pbot server is not running. Start it with: pbot serve")
+        sys.exit(1)
+
+    print(response["output"], end="")
+    if not response["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+The columnar module provides an address book that keeps its contacts in arrays.
+
+This module defines the following classes:
+    - StringPool: Strings stored one after another in a bytearray with a table of their offsets.
+    - ContactColumns: A mapping of contact names to records stored column by column.
+    - ColumnarAddressBook: An AddressBook whose records are kept in ContactColumns.
+
+Every contact is a row of the columns: its birthday as a day ordinal in an array, its phone
+numbers packed into 64-bit integers in one shared array and its emails in a StringPool, the
+row holding the position and the count of its phone numbers and emails. A Record is built
+from the row only when it is accessed and is written back to the row when it changes.
+"""
+
+import pickle
+import weakref
+from array import array
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Any, Callable, Iterator
+
+try:
+    from .address_book import Record, AddressBook as AB
+    from .entities import Phone, User, Email
+    from .indexes import SortedList
+    from .snapshot import LazyRecords
+except ImportError:
+    from address_book import Record, AddressBook as AB
+    from entities import Phone, User, Email
+    from indexes import SortedList
+    from snapshot import LazyRecords
+
+PHONE_DIGITS = 17
+PHONE_POOLED = 1
+PHONE_PLUS = 2
+
+
+class StringPool:
+    """
+    StringPool keeps strings encoded as UTF-8 in one bytearray, with the offset where every
+    string starts in an array. A string is added once and read back by its number.
+
+    Methods:
+        add: Appends a string and returns its number.
+
+        get: Returns the string with the given number.
+    """
+
+    def __init__(self) -> None:
+        self._text = bytearray()
+        self._offsets = array("Q", [0])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def add(self, text: str) -> int:
+        """
+        Appends a string to the pool and returns its number.
+        """
+        self._text += text.encode()
+        self._offsets.append(len(self._text))
+        return len(self._offsets) - 2
+
+    def get(self, number: int) -> str:
+        """
+        Returns the string with the given number.
+        """
+        return self._text[self._offsets[number] : self._offsets[number + 1]].decode()
+
+
+class ContactColumns(MutableMapping):
+    """
+    ContactColumns maps the contact names to their records, stored column by column.
+
+    Setting a record copies its data into a new row; the row it had before is left unused
+    and the columns are rebuilt once the unused rows outnumber the rows in use. Reading a
+    record builds a Record from its row. The built records are remembered while they are in
+    use elsewhere, so a contact read twice is the same Record object.
+
+    Attributes:
+        on_load (Callable | None): Called with every record built from a row.
+
+    Methods:
+        compact: Rebuilds the columns without the unused rows.
+    """
+
+    def __init__(self) -> None:
+        self.on_load: Callable[[Record], None] | None = None
+        self._rows: dict[str, int] = {}
+        self._views: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._clear_columns()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __getitem__(self, name: str) -> Record:
+        record = self._views.get(name)
+        if record is None:
+            record = self._build(name, self._rows[name])
+            self._views[name] = record
+            if self.on_load is not None:
+                self.on_load(record)
+        return record
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        self._rows[name] = self._append(record)
+        self._views[name] = record
+        if len(self._birthdays) > 2 * len(self._rows) + 1024:
+            self.compact()
+
+    def __delitem__(self, name: str) -> None:
+        del self._rows[name]
+        self._views.pop(name, None)
+
+    def compact(self) -> None:
+        """
+        Rebuilds the columns with only the rows of the contacts in the mapping.
+        """
+        records = [(name, self[name]) for name in self._rows]
+        self._clear_columns()
+        for name, record in records:
+            self._rows[name] = self._append(record)
+
+    def _clear_columns(self) -> None:
+        """
+        Starts the columns empty.
+        """
+        self._birthdays = array("i")
+        self._phone_start = array("Q")
+        self._phone_count = array("H")
+        self._email_start = array("Q")
+        self._email_count = array("H")
+        self._phones = array("Q")
+        self._texts = StringPool()
+
+    def _append(self, record: Record) -> int:
+        """
+        Appends the data of the record as a new row and returns the number of the row.
+        """
+        birthday = record.user.birthday_date
+        self._birthdays.append(birthday.toordinal() if birthday else 0)
+        phones = record.phones()
+        self._phone_start.append(len(self._phones))
+        self._phone_count.append(len(phones))
+        self._phones.extend(self._pack_phone(phone) for phone in phones)
+        emails = record.email_addresses()
+        self._email_start.append(len(self._texts))
+        self._email_count.append(len(emails))
+        for email in emails:
+            self._texts.add(email)
+        return len(self._birthdays) - 1
+
+    def _build(self, name: str, row: int) -> Record:
+        """
+        Builds the Record of a row.
+        """
+        birthday = self._birthdays[row]
+        record = Record(User(name, date.fromordinal(birthday) if birthday else None))
+        start = self._phone_start[row]
+        record.phone_numbers = [
+            Phone(self._unpack_phone(value))
+            for value in self._phones[start : start + self._phone_count[row]]
+        ]
+        start = self._email_start[row]
+        record.emails = [
+            Email(self._texts.get(number))
+            for number in range(start, start + self._email_count[row])
+        ]
+        return record
+
+    def _pack_phone(self, phone: str) -> int:
+        """
+        Packs a phone number of up to PHONE_DIGITS digits with an optional leading + into an
+        integer: the digits, their count and the plus sign. Any other phone number is kept in
+        the string pool and its number there is packed instead.
+        """
+        digits = phone[1:] if phone.startswith("+") else phone
+        if digits.isdigit() and digits.isascii() and len(digits) <= PHONE_DIGITS:
+            plus = PHONE_PLUS if phone.startswith("+") else 0
+            return (int(digits) << 7) | (len(digits) << 2) | plus
+        return (self._texts.add(phone) << 1) | PHONE_POOLED
+
+    def _unpack_phone(self, value: int) -> str:
+        """
+        Returns the phone number packed by _pack_phone.
+        """
+        if value & PHONE_POOLED:
+            return self._texts.get(value >> 1)
+        digits = str(value >> 7).zfill((value >> 2) & 0x1F)
+        return "+" + digits if value & PHONE_PLUS else digits
+
+
+class ColumnarAddressBook(AB):
+    """
+    ColumnarAddressBook is an AddressBook whose records are kept in ContactColumns.
+
+    It behaves as the usual AddressBook, with the same indexes and the same tracking of the
+    changes. The records it returns are built from the columns on access, and every change
+    of such a record is written back to its row through record_changed.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.data = ContactColumns()
+        self.data.on_load = self._adopt
+        self.update(*args, **kwargs)
+
+    def record_changed(self, record: Record) -> None:
+        """
+        Writes the record back to the columns and updates the indexes after its data was changed.
+        """
+        name = record.user.name
+        if name in self.data and self.data[name] is record:
+            self.data[name] = record
+            self._index_record(name, record)
+            self._changes.add(name)
+
+    @classmethod
+    def from_records(cls, content: Any) -> "ColumnarAddressBook":
+        """
+        Returns an address book holding the records opened by read_snapshot, or a mapping of
+        the records read from a file of an earlier version. The records of a snapshot are
+        unpickled into the columns one at a time, and the snapshot file is closed afterwards.
+        """
+        address_book = cls()
+        for name in content:
+            if isinstance(content, LazyRecords):
+                address_book.data[name] = pickle.loads(content.encoded(name))
+            else:
+                address_book.data[name] = content[name]
+        address_book._names = SortedList(address_book.data)
+        if isinstance(content, LazyRecords):
+            content.close()
+        return address_book
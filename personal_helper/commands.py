@@ -5,6 +5,14 @@ with an address book. Here is a brief description of each function:
 load_contact_book(): This function loads the contact book from a file, creating an 
 empty contact book if the file doesn't exist.
 
+save_contact_book(addressbook: AB): This function appends the changed contacts to the 
+journal of the contact book file.
+
+Session: While SESSION is open, for example in batch mode, the contact book and the notes 
+are loaded once and saved when the session is flushed instead of on every command.
+Session and the note commands are defined in the session and note_commands modules,
+which don't import the address book, and are imported here as well.
+
 add_contact(contact_name: str, phone_number: str | None = None): This function adds 
 a contact to the phone book. It validates the contact name and phone number (if provided) 
 and saves the contact to the address book file.
@@ -41,16 +49,43 @@ to a contact. It validates the birthday date and updates the contact accordingly
 search_contact(criteria: str): This function searches for a contact in the address book based 
 on the specified criteria. It returns the matching contacts.
 
+whois_phone_number(phone_number: str): This function prints the contacts that own the 
+given phone number.
+
+whois_email(contact_email: str): This function prints the contacts that own the given email.
+
+whois_domain(domain: str): This function prints the contacts that have an email in the given domain.
+
+complete_contact_name(prefix: str, top: int = 10): This function prints the names of the contacts 
+that start with the prefix, for autocompletion.
+
+fuzzy_search_contact(text: str, top: int = 10): This function prints the contacts whose names are 
+the most similar to the text, such as other spellings of the name or names with typos.
+
+migrate_contact_book(target: str): This function copies all contacts from the current storage 
+to the target storage, for example from address_book.bin to SQLite.
+
+import_contact_book(source: str, rejects: str | None, workers: int | None): This function adds 
+the contacts of a CSV or JSON Lines file to the address book and writes the rejected rows to a file.
+
+export_contact_book(file_format: str, output: str | None): This function writes all contacts 
+to a CSV, JSON Lines or vCard file, or to the standard output.
+
 print_contacts(addressbook: AB = None): This function prints all contacts in the address book. 
 If an address book is not provided, it loads the address book from the file.
 
+print_records(contacts: Iterable[Record]): This function prints the given contacts in the given order. 
+The days to birthday of all contacts are computed in one pass by BirthdayColumns.
+
 birthday_in_next_days(days_interval: str): This function checks for contacts with birthdays 
 in the next few days based on the specified days interval.
 
 """
 
-import os.path
-from pathlib import Path
+import os
+import sys
+from datetime import date
+from typing import Iterable
 
 try:
     from .utils import sanitize_phone_number
@@ -63,18 +98,35 @@ try:
         check_name_in_address_book,
         check_name_not_in_address_book,
         check_phone_number_in_address_book,
+        check_phone_number_owner,
         check_phone_number_not_in_address_book,
         check_email_in_address_book,
         check_email_not_in_address_book,
         check_path_address_to_sort_files_in_it,
         check_birthday_in_next_days,
+        storage_backend_validation,
+        export_format_validation,
+    )
+    from .constants import (
+        STORAGE_BACKEND,
+        IMPORT_FORMATS,
+        EXPORT_BUFFER_SIZE,
     )
-    from .constants import FILE
     from .address_book import Record, AddressBook as AB
     from .entities import Phone, User, Email
     from .print_table import TablePrinter
-    from .sorting_files import SortingFiles
-    from .notes import Notes
+    from .storage import get_storage
+    from .session import Session, SESSION
+    from .note_commands import (
+        load_notes,
+        save_notes,
+        add_note_to_data,
+        find_note,
+        show_all_notes,
+        delete_note,
+        edit_note,
+    )
+    from .profiling import PROFILER
 
 except ImportError:
     from utils import sanitize_phone_number
@@ -87,29 +139,69 @@ except ImportError:
         check_name_in_address_book,
         check_name_not_in_address_book,
         check_phone_number_in_address_book,
+        check_phone_number_owner,
         check_phone_number_not_in_address_book,
         check_email_in_address_book,
         check_email_not_in_address_book,
         check_path_address_to_sort_files_in_it,
         check_birthday_in_next_days,
+        storage_backend_validation,
+        export_format_validation,
+    )
+    from constants import (
+        STORAGE_BACKEND,
+        IMPORT_FORMATS,
+        EXPORT_BUFFER_SIZE,
     )
-    from constants import FILE
     from address_book import Record, AddressBook as AB
     from entities import Phone, User, Email
     from print_table import TablePrinter
-    from sorting_files import SortingFiles
-    from notes import Notes
+    from storage import get_storage
+    from session import Session, SESSION
+    from note_commands import (
+        load_notes,
+        save_notes,
+        add_note_to_data,
+        find_note,
+        show_all_notes,
+        delete_note,
+        edit_note,
+    )
+    from profiling import PROFILER
+
+STORAGE = get_storage()
 
+
+@PROFILER.timed("load")
 def load_contact_book() -> AB:
     """
     The load_contact_book function loads the contact book from a file.
     If the file does not exist, it creates an empty contact book.
+    In a session the contact book is loaded once and then reused.
+    """
+
+    if not SESSION.active:
+        return STORAGE.load()
+    if SESSION.addressbook is None:
+        SESSION.addressbook = STORAGE.load()
+    return SESSION.addressbook
+
+
+@PROFILER.timed("persist")
+def save_contact_book(addressbook: AB) -> None:
+    """
+    The save_contact_book function saves the changes of the contact book.
+    Only the changed contacts are appended to the journal of the contact book file,
+    or committed to the database with the sqlite storage.
+    In a session the changes are written when the session is flushed.
+
+    :param addressbook: AB: Pass the addressbook object to the function
     """
 
-    addressbook = AB()
-    if os.path.exists(FILE):
-        addressbook.read_records_from_file(FILE)
-    return addressbook
+    if SESSION.active and addressbook is SESSION.addressbook:
+        SESSION.addressbook_changed = True
+        return
+    STORAGE.save(addressbook)
 
 
 def add_contact(contact_name: str, phone_number: str | None = None) -> None:
@@ -129,9 +221,10 @@ def add_contact(contact_name: str, phone_number: str | None = None) -> None:
         phone_number = sanitize_phone_number(phone_number)
         phone_validation(phone_number)
         phone = Phone(phone_number)
+        check_phone_number_owner(addressbook, phone, contact_name)
         contact.add_phone_number(phone)
     addressbook.add_record(contact)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(f"The contact '{contact_name}' has been added")
 
 
@@ -156,12 +249,12 @@ def print_contact(contact_name: str) -> None:
 
     contact = addressbook.get_contact(contact_name)
     phone_numbers: list | str = [
-        number.subrecord.phone for number in contact.phone_numbers
+        number.phone for number in contact.phone_numbers
     ]
     if not phone_numbers:
         phone_numbers = "-"
 
-    emails: list | str = [email.subrecord.email for email in contact.emails]
+    emails: list | str = [email.email for email in contact.emails]
     if not emails:
         emails = "-"
     birthday = (
@@ -187,7 +280,7 @@ def delete_contact(contact_name: str) -> None:
     check_name_not_in_address_book(addressbook, contact_name)
 
     addressbook.delete_record(contact_name)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(f"The contact '{contact_name}' has been deleted.")
 
 
@@ -209,9 +302,10 @@ def add_phone_number_to_contact(contact_name: str, phone_number: str) -> None:
     contact = addressbook.get_contact(contact_name)
 
     check_phone_number_in_address_book(contact, phone, contact_name)
+    check_phone_number_owner(addressbook, phone, contact_name)
 
     contact.add_phone_number(phone)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The phone number '{phone.phone}' has been successfully added to the '{contact_name}' contact."
     )
@@ -243,10 +337,11 @@ def change_phone_number_contact(
     phone_validation(new_phone_number)
     new_phone = Phone(new_phone_number)
     check_phone_number_in_address_book(contact, new_phone, contact_name)
+    check_phone_number_owner(addressbook, new_phone, contact_name)
 
     contact.change_phone_number(old_phone, new_phone)
     addressbook.add_record(contact)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The contact '{contact_name}' has been updated with the new phone number: {new_phone.phone}"
     )
@@ -270,7 +365,7 @@ def delete_phone_number_contact(contact_name: str, phone_number: str) -> None:
     check_phone_number_not_in_address_book(contact, phone, contact_name)
 
     contact.delete_phone_number(phone)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The phone number '{phone.phone}' was successfully deleted from the '{contact_name}' contact."
     )
@@ -293,10 +388,10 @@ def add_email_to_contact(contact_name: str, contact_email: str) -> None:
     email_validation(contact_email)
     email = Email(contact_email)
 
-    check_email_in_address_book(contact, email, contact_name)
+    check_email_in_address_book(addressbook, email, contact_name)
 
     contact.add_email(email)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The email '{email.email}' has been successfully added to the '{contact_name}' contact."
     )
@@ -327,15 +422,15 @@ def change_email_contact(
     contact = addressbook.get_contact(contact_name)
 
     old_email = Email(contact_old_email)
-    check_email_not_in_address_book(contact, old_email, contact_name)
+    check_email_not_in_address_book(addressbook, old_email, contact_name)
 
     email_validation(contact_new_email)
     new_email = Email(contact_new_email)
 
-    check_email_in_address_book(contact, new_email, contact_name)
+    check_email_in_address_book(addressbook, new_email, contact_name)
 
     contact.change_email(old_email, new_email)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The contact '{contact_name}' has been updated with the new email: {new_email.email}"
     )
@@ -356,10 +451,10 @@ def delete_email_contact(contact_name: str, contact_email: str) -> None:
     contact = addressbook.get_contact(contact_name)
     email = Email(contact_email)
 
-    check_email_not_in_address_book(contact, email, contact_name)
+    check_email_not_in_address_book(addressbook, email, contact_name)
 
     contact.delete_email(email)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The email '{email.email}' was successfully deleted from the '{contact_name}' contact."
     )
@@ -382,7 +477,7 @@ def add_birthday_to_contact(contact_name: str, birthday_date: str) -> None:
     contact.add_birthday(birthday_date)
 
     addressbook.add_record(contact)
-    addressbook.save_records_to_file(FILE)
+    save_contact_book(addressbook)
     print(
         f"The birthday '{birthday_date}' has been added to the '{contact_name}' contact."
     )
@@ -409,6 +504,206 @@ def serch_contact(criteria: str) -> None:
     print(f"{len(result)} contacts were found based on your search criteria!")
 
 
+def print_owners(addressbook: AB, names: list[str]) -> None:
+    """
+    The print_owners function prints the contacts with the given names from the address book.
+
+    :param addressbook: AB: Pass the addressbook object to the function
+    :param names: list[str]: Specify the names of the contacts to be printed
+    """
+    contacts = AB()
+    for name in names:
+        contacts.add_record(addressbook.get_contact(name))
+    print_contacts(contacts)
+
+
+def whois_phone_number(phone_number: str) -> None:
+    """
+    The whois_phone_number function prints the contacts that own the given phone number.
+    The owners are looked up in the phone directory of the address book instead of scanning every contact.
+
+    :param phone_number: str: Specify the phone number to look up
+    """
+    addressbook = load_contact_book()
+    phone_number = sanitize_phone_number(phone_number)
+    phone_validation(phone_number)
+
+    owners = addressbook.find_by_phone(phone_number)
+    if not owners:
+        print(f"The phone number '{phone_number}' does not belong to any contact.")
+        return
+    print_owners(addressbook, owners)
+
+
+def whois_email(contact_email: str) -> None:
+    """
+    The whois_email function prints the contacts that own the given email.
+    The owners are looked up in the email directory of the address book.
+
+    :param contact_email: str: Specify the email to look up
+    """
+    addressbook = load_contact_book()
+    contact_email = contact_email.lower()
+    email_validation(contact_email)
+
+    owners = addressbook.find_by_email(contact_email)
+    if not owners:
+        print(f"The email '{contact_email}' does not belong to any contact.")
+        return
+    print_owners(addressbook, owners)
+
+
+def whois_domain(domain: str) -> None:
+    """
+    The whois_domain function prints the contacts that have an email in the given domain.
+    The contacts are looked up in the email domain index of the address book.
+
+    :param domain: str: Specify the email domain, for example example.com
+    """
+    addressbook = load_contact_book()
+    domain = domain.lower().lstrip("@")
+
+    owners = addressbook.find_by_domain(domain)
+    if not owners:
+        print(f"No contacts have an email in the '{domain}' domain.")
+        return
+    print_owners(addressbook, owners)
+
+
+def complete_contact_name(prefix: str, top: int = 10) -> None:
+    """
+    The complete_contact_name function prints up to top contact names that start with the prefix.
+    It is meant for autocompletion, so it prints only the names, one per line.
+
+    :param prefix: str: Specify the beginning of the contact name
+    :param top: int: Specify the maximum number of names to print
+    """
+    addressbook = load_contact_book()
+    criteria_validation(prefix)
+
+    for name in addressbook.complete_name(prefix, top):
+        print(name)
+
+
+def fuzzy_search_contact(text: str, top: int = 10) -> None:
+    """
+    The fuzzy_search_contact function prints up to top contacts whose names are the most similar
+    to the text, the most similar first. The names are compared by their trigrams, so other
+    spellings of a name, such as Oleksandr and Aleksandr, and names with typos are found.
+
+    :param text: str: Specify the name or a part of it
+    :param top: int: Specify the maximum number of contacts to print
+    """
+    addressbook = load_contact_book()
+    criteria_validation(text)
+
+    names = [name for name, _ in addressbook.similar_names(text, top)]
+    print_records(addressbook.get_contact(name) for name in names)
+    print(f"{len(names)} contacts were found based on your search criteria!")
+
+
+def migrate_contact_book(target: str) -> None:
+    """
+    The migrate_contact_book function copies all contacts from the current storage to the target storage.
+    The current storage is chosen by the PBOT_STORAGE environment variable, so the contacts of
+    address_book.bin are moved to SQLite with migrate -t sqlite and back with migrate -t journal.
+
+    :param target: str: Specify the storage to copy the contacts to, journal or sqlite
+    """
+    storage_backend_validation(target)
+    if target == STORAGE_BACKEND:
+        print(f"The contacts are already kept in the {target} storage.")
+        return
+
+    addressbook = load_contact_book()
+    get_storage(target).replace(addressbook)
+    print(f"{len(addressbook)} contacts have been migrated to the {target} storage.")
+
+
+def import_contact_book(
+    source: str, rejects: str | None = None, workers: int | None = None
+) -> None:
+    """
+    The import_contact_book function adds the contacts of a CSV or JSON Lines file to the
+    address book and saves it once at the end. The rows are validated in worker processes,
+    and the rows that can't be imported are written with their reasons to the reject file,
+    <source>.rejects.csv unless given.
+
+    :param source: str: Specify the path of the file with the contacts
+    :param rejects: str | None: Specify the path of the file for the rejected rows
+    :param workers: int | None: Specify the number of worker processes, all CPUs by default
+    """
+    base, extension = os.path.splitext(source)
+    file_format = IMPORT_FORMATS.get(extension.lower())
+    if file_format is None:
+        print(f"The file '{source}' must have one of the extensions {', '.join(IMPORT_FORMATS)}")
+        return
+    rejects = rejects or f"{base}.rejects.csv"
+
+    try:
+        from .importer import import_contacts
+    except ImportError:
+        from importer import import_contacts
+
+    addressbook = load_contact_book()
+    try:
+        with open(source, encoding="utf-8", newline="") as file, open(
+            rejects, "w", encoding="utf-8", newline=""
+        ) as reject_file:
+            imported, rejected = import_contacts(
+                addressbook, file, file_format, reject_file, workers or os.cpu_count() or 1
+            )
+    except OSError as error:
+        print(f"The file '{error.filename}' can't be opened: {error.strerror}")
+        return
+
+    save_contact_book(addressbook)
+    print(f"{imported} contacts have been imported, {rejected} rows rejected.")
+    if rejected:
+        print(f"The rejected rows are written to {rejects}")
+
+
+def export_contact_book(file_format: str, output: str | None = None) -> None:
+    """
+    The export_contact_book function writes all contacts to a file in the CSV, JSON Lines or
+    vCard format, or to the standard output without a file. The contacts are written one at
+    a time through a buffer, so the memory used does not grow with the address book. When the
+    standard output is a pipe closed by its reader, as in export -f jsonl | head, the export
+    stops without an error.
+
+    :param file_format: str: Specify the format, csv, jsonl or vcf
+    :param output: str | None: Specify the path of the file to write
+    """
+    export_format_validation(file_format)
+    try:
+        from .exporter import export_contacts
+    except ImportError:
+        from exporter import export_contacts
+
+    addressbook = load_contact_book()
+    if output is None:
+        try:
+            export_contacts(addressbook, sys.stdout, file_format)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader of the pipe, such as head, has exited. The standard output is pointed
+            # at os.devnull, so the flush at the exit of Python does not fail again.
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            sys.exit(1)
+        return
+
+    try:
+        with open(
+            output, "w", encoding="utf-8", newline="", buffering=EXPORT_BUFFER_SIZE
+        ) as file:
+            count = export_contacts(addressbook, file, file_format)
+    except OSError as error:
+        print(f"The file '{output}' can't be written: {error.strerror}")
+        return
+    print(f"{count} contacts have been exported to {output}")
+
+
 def print_contacts(addressbook: AB = None) -> None:
     """
     The print_all_contacts function prints all the contacts in the addressbook.
@@ -418,6 +713,16 @@ def print_contacts(addressbook: AB = None) -> None:
     """
     if not addressbook:
         addressbook = load_contact_book()
+    print_records(addressbook.values())
+
+
+@PROFILER.timed("render")
+def print_records(contacts: Iterable[Record]) -> None:
+    """
+    The print_records function prints the given contacts as a table in the order they are passed in.
+
+    :param contacts: Iterable[Record]: Pass the contact records to be printed
+    """
     field_names = [
         "Contact Name",
         "Phone Number",
@@ -425,16 +730,23 @@ def print_contacts(addressbook: AB = None) -> None:
         "Birthday",
         "Days to Birthday",
     ]
+    try:
+        from .birthday_columns import BirthdayColumns
+    except ImportError:
+        from birthday_columns import BirthdayColumns
+
     table = [field_names]
-    for contact in addressbook.values():
+    contacts = list(contacts)
+    days_to_birthday = BirthdayColumns(contacts).days_to_birthday(date.today())
+    for contact, days_left in zip(contacts, days_to_birthday):
         contact_name = contact.user.name
         phone_numbers: list | str = [
-            number.subrecord.phone for number in contact.phone_numbers
+            number.phone for number in contact.phone_numbers
         ]
         if not phone_numbers:
             phone_numbers = "-"
 
-        emails: list | str = [email.subrecord.email for email in contact.emails]
+        emails: list | str = [email.email for email in contact.emails]
         if not emails:
             emails = "-"
 
@@ -443,9 +755,7 @@ def print_contacts(addressbook: AB = None) -> None:
             if contact.user.birthday_date
             else "-"
         )
-        day_to_birthday = (
-            contact.days_to_birthday() if contact.user.birthday_date else "-"
-        )
+        day_to_birthday = days_left if days_left is not None else "-"
 
         table_row = [contact_name, phone_numbers, emails, birthday, day_to_birthday]
 
@@ -458,28 +768,22 @@ def birthday_in_next_days(days_interval: str) -> None:
     """
     The birthday_in_next_days function takes a string as an argument and returns None.
     The function checks if the input is valid, then loads the address book from file.
-    It iterates through each contact in the address book and checks if they have a birthday date set. If so,
-    it calculates how many days are left until their birthday using days_to_birthday() method of User class.
-    If this number is less than or equal to user's input (days interval), it adds that contact to
-    contacts_with_birthday dictionary which will be printed at the end.
+    The contacts with a birthday within the days interval are read from the birthday calendar
+    of the address book, which looks only at the days of the interval, and are printed
+    ordered by the number of days left to their birthday.
 
     :param days_interval: str: Specify the number of days from today to search for birthdays
     """
 
     check_birthday_in_next_days(days_interval)
 
-    contacts_with_birthday = AB()
     addressbook = load_contact_book()
+    contacts_with_birthday = addressbook.upcoming_birthdays(int(days_interval))
 
-    for contact in addressbook.values():
-        if contact.user.birthday_date:
-            days_to_birthday = contact.days_to_birthday()
-            if days_to_birthday <= int(days_interval):
-                contacts_with_birthday.add_record(contact)
     if len(contacts_with_birthday) == 0:
         print(f"No users have a birthday within the next {days_interval} days.")
     else:
-        print_contacts(contacts_with_birthday)
+        print_records(contacts_with_birthday)
 
 
 def run_sorting_files(address: str) -> None:
@@ -491,6 +795,13 @@ def run_sorting_files(address: str) -> None:
 
     :param address: str: Get the address of the directory that we want to sort
     """
+    from pathlib import Path
+
+    try:
+        from .sorting_files import SortingFiles
+    except ImportError:
+        from sorting_files import SortingFiles
+
     path = Path(address)
     check_path_address_to_sort_files_in_it(path)
 
@@ -500,73 +811,3 @@ def run_sorting_files(address: str) -> None:
     sorting_files.removing_files()
     sorting_files.del_empty_folders()
     print(f"Directory {address} has been sorted succesfully!")
-
-
-def add_note_to_data(tags: list, text: str = "") -> None:
-    """
-    The add_note_to_data function adds notes with tags. If no tag is specified, a default tag is assigned
-
-    :param tags: list: Specify the tags that will be assigned to the note
-    :param text: Specify the text of the note
-    """
-    note = Notes()
-    note.load()
-    note.add_note(tags, text)
-    note.save()
-
-
-def find_note(key_word: str = "") -> None:
-    """
-    The find_note function searches for a note by keyword/letter/symbol.
-    The search is conducted by tags and by the text of the notes at the same time.
-
-    :param key_word: str: Specify the keyword to search for
-    """
-    note = Notes()
-    note.load()
-    note.find(key_word)
-    print("The search is over!")
-
-
-def show_all_notes() -> None:
-    """
-    The show_all_notes function is used to display all the notes in the Notes.txt file.
-    The function first loads all of the notes from Notes.txt into a list, then sorts them by date and time,
-    and finally displays them on screen.
-    """
-
-    note = Notes()
-    note.load()
-    note.show_all_sorted_notes()
-    note.save()
-
-
-def delete_note(tag: str) -> None:
-    """
-    The delete_note function deletes a note from the notes.txt file.
-
-    :param tag: str: Specify which note to delete
-    """
-
-    note = Notes()
-    note.load()
-    note.del_notes(tag)
-    note.save()
-
-
-def edit_note(tag: str, new_tag: list, new_text: str) -> None:
-    """
-    The edit_note function allows the user to edit a note.
-    The function takes in three parameters: tag, new_tag, and new_text.
-    Tag is the name of the note that will be edited. New_tag is a list of tags that will replace old ones for this note.
-    New text is what replaces old text for this note.
-
-    :param tag: str: Find the note that is to be edited
-    :param new_tag: list: Allow the user to add multiple tags to a note
-    :param new_text: str: Change the text of a note
-    """
-
-    note = Notes()
-    note.load()
-    note.edit_notes(tag, new_tag, new_text)
-    note.save()
@@ -7,11 +7,33 @@ number of contacts per page, and ranges for name and phone number lengths.
 
 import os
 from string import ascii_letters
-from pathlib import Path
 
-current_dir = str(Path.home())
+current_dir = os.path.expanduser("~")
 FILE = os.path.join(current_dir, "address_book.bin")
 FILE_NOTES = os.path.join(current_dir, "data_notes.bin")
+FILE_SQLITE = os.path.join(current_dir, "address_book.sqlite3")
+SOCKET_FILE = os.path.join(current_dir, "pbot.sock")
+
+SERVER_FLUSH_INTERVAL = 1.0
+SERVER_WORKERS = 8
+
+STORAGE_BACKENDS = ["journal", "sqlite"]
+STORAGE_BACKEND = os.environ.get("PBOT_STORAGE", "journal")
+ADDRESS_BOOK_LAYOUTS = ["records", "columnar"]
+ADDRESS_BOOK_LAYOUT = os.environ.get("PBOT_LAYOUT", "records")
+
+JOURNAL_COMPACT_SIZE = 1024 * 1024
+JOURNAL_COMPACT_RATIO = 0.5
+STORAGE_RETRIES = 5
+
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+EXPORT_FORMATS = ["csv", "jsonl", "vcf"]
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Below this many contacts the birthday columns are computed without NumPy, which takes
+# about as long as importing NumPy only for the biggest address books.
+NUMPY_MIN_CONTACTS = 100_000
 
 NUMBER_OF_CONTACTS_PER_PAGE = 20
 
@@ -20,7 +42,8 @@ LETTERS = ascii_letters + CYRILLIC + CYRILLIC.upper()
 NAME_RANGE = range(1, 50)
 PHONE_RANGE = range(7, 20)
 
-ADDRESSBOOK_COMMANDS = ["add", "change", "del", "show", "search", "birth"]
-LIST_COMMANDS = ["add", "change", "del", "show", "search", "birth", "note", "sort"]
+ADDRESSBOOK_COMMANDS = ["add", "change", "del", "show", "search", "birth", "whois", "migrate", "import", "export"]
+READ_COMMANDS = ["show", "search", "birth", "whois", "export"]
+LIST_COMMANDS = ["add", "change", "del", "show", "search", "birth", "whois", "migrate", "import", "export", "note", "sort", "batch", "serve"]
 
-INFO_MESSAGE = "Use command:\nadd\nchange\ndel\nshow\nsearch\nbirth\nnote\nsort\n\nDetail about command:\n[command] -h"
+INFO_MESSAGE = "Use command:\nadd\nchange\ndel\nshow\nsearch\nbirth\nwhois\nmigrate\nimport\nexport\nnote\nsort\nbatch\nserve\n\nDetail about command:\n[command] -h"
@@ -3,18 +3,49 @@ entities module defines the entities used in the address book application.
 
 Classes:
     Email: Represents the email of a contact.
-        
+
     User: Represents a user.
-        
+
     Phone: Represents the phone number of a contact.
-    
+
+The entities use __slots__ and pickle their values as a tuple, so a contact takes no
+per-instance __dict__ in memory or in the files. The state of the earlier versions, a dict
+of the name-mangled attributes, is still accepted when an old file is unpickled.
+
+The entities are immutable: their attributes are set when they are created and can't be
+assigned afterwards, so an entity kept in a set or as a dict key keeps its hash. A new value
+is a new entity, as Record.add_birthday builds a new User.
 """
 
 
-from datetime import datetime, date
+from datetime import date
+from typing import Any
+
+
+def _old_state(state: dict, owner: str, attribute: str) -> Any:
+    """
+    Returns an attribute from the pickled __dict__ of an entity of the earlier versions,
+    where it was stored under its name-mangled name.
+    """
+    return state.get(f"_{owner}__{attribute}", state.get(attribute))
 
 
-class Email:
+class _Immutable:
+    """
+    The base of the entities that makes their attributes read-only once they are set by
+    __init__ or __setstate__ with object.__setattr__.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable, can't set '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable, can't delete '{name}'")
+
+
+class Email(_Immutable):
     """
     Represents the email of a contact.
 
@@ -25,37 +56,39 @@ class Email:
         __eq__(other: object) -> bool:
             Checks if the email address is equal to the email address of another Email object.
 
+        __hash__() -> int:
+            Returns the hash of the email address, so equal emails hash alike.
+
     """
 
+    __slots__ = ("email",)
+
+    email: str | None
+
     def __init__(self, email: str | None = None):
-        self.email: str = email
-
-    @property
-    def email(self) -> str | None:
-        """
-        Returns the phone number of the contact.
-        """
-        return self.__email
-
-    @email.setter
-    def email(self, new_email: str) -> None:
-        """
-        The email function takes in a string and checks to see if it is a valid email address.
-            If the email address is not valid, an error message will be returned.
-            If the email address is valid, then it will return True.
-        """
-        if new_email is None:
-            self.__email: str | None = None
-        else:
-            self.__email = new_email
+        object.__setattr__(self, "email", email)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Email):
-            return self.__email == other.email
+            return self.email == other.email
         return False
 
+    def __hash__(self) -> int:
+        return hash(self.email)
 
-class User:
+    def __repr__(self) -> str:
+        return f"Email({self.email!r})"
+
+    def __getstate__(self) -> tuple:
+        return (self.email,)
+
+    def __setstate__(self, state: tuple | dict) -> None:
+        if isinstance(state, dict):
+            state = (_old_state(state, "Email", "email"),)
+        object.__setattr__(self, "email", state[0])
+
+
+class User(_Immutable):
     """
     Represents a user.
 
@@ -63,43 +96,49 @@ class User:
         name (str): The name of the user.
         birthday_date (date | None): The birthday date of the user.
 
+    Methods:
+        __eq__(other: object) -> bool:
+            Checks if the name and the birthday date are equal to those of another User object.
+
+        __hash__() -> int:
+            Returns the hash of the name and the birthday date, which can't change.
+
     """
-    def __init__(self, name: str | None = None):
-        self.__birthday_date: date | None = None
-        self.name: str = name
-
-    @property
-    def name(self) -> str | None:
-        """
-        Returns the name of the contact.
-        """
-        return self.__name
-
-    @name.setter
-    def name(self, new_name: str) -> None:
-        """
-        Sets the name of the contact if it is valid, otherwise raises an error.
-        """
-        if new_name is None:
-            self.__name: str | None = None
-        else:
-            self.__name = new_name
-
-    @property
-    def birthday_date(self) -> date | None:
-        """
-        Returns the birthday date of the contact.
-        """
-        return self.__birthday_date
-
-    @birthday_date.setter
-    def birthday_date(self, new_birthday_date: datetime) -> None:
-        """
-        Sets the birthday date of the contact if it is valid, otherwise raises an error.
-        """
-        self.__birthday_date = new_birthday_date
-
-class Phone:
+
+    __slots__ = ("name", "birthday_date")
+
+    name: str | None
+    birthday_date: date | None
+
+    def __init__(self, name: str | None = None, birthday_date: date | None = None):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "birthday_date", birthday_date)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, User):
+            return (self.name, self.birthday_date) == (other.name, other.birthday_date)
+        return False
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.birthday_date))
+
+    def __repr__(self) -> str:
+        return f"User({self.name!r})"
+
+    def __getstate__(self) -> tuple:
+        return self.name, self.birthday_date
+
+    def __setstate__(self, state: tuple | dict) -> None:
+        if isinstance(state, dict):
+            state = (
+                _old_state(state, "User", "name"),
+                _old_state(state, "User", "birthday_date"),
+            )
+        object.__setattr__(self, "name", state[0])
+        object.__setattr__(self, "birthday_date", state[1])
+
+
+class Phone(_Immutable):
     """
     Represents the phone number of a contact.
 
@@ -110,29 +149,33 @@ class Phone:
         __eq__(other: object) -> bool:
             Checks if the phone number is equal to the phone number of another Phone object.
 
+        __hash__() -> int:
+            Returns the hash of the phone number, so equal phone numbers hash alike.
+
     """
-    
+
+    __slots__ = ("phone",)
+
+    phone: str | None
+
     def __init__(self, phone: str | None = None):
-        self.phone: str = phone
-        
-    @property
-    def phone(self) -> str | None:
-        """
-        Returns the phone number of the contact.
-        """
-        return self.__phone
-
-    @phone.setter
-    def phone(self, new_phone: str) -> None:
-        """
-        Sets the phone number of the contact if it is valid, otherwise raises an error.
-        """
-        if new_phone is None:
-            self.__phone: str | None = None
-        else:
-            self.__phone = new_phone
+        object.__setattr__(self, "phone", phone)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Phone):
             return self.phone == other.phone
         return False
+
+    def __hash__(self) -> int:
+        return hash(self.phone)
+
+    def __repr__(self) -> str:
+        return f"Phone({self.phone!r})"
+
+    def __getstate__(self) -> tuple:
+        return (self.phone,)
+
+    def __setstate__(self, state: tuple | dict) -> None:
+        if isinstance(state, dict):
+            state = (_old_state(state, "Phone", "phone"),)
+        object.__setattr__(self, "phone", state[0])
@@ -1,11 +1,16 @@
 """error"""
 
+from functools import wraps
 from typing import Callable
 import sys
 
 
 def input_error(func: Callable[..., None]) -> Callable[..., None]:
-    """Decorator for handling input errors"""
+    """
+    Decorator for handling input errors.
+    The undecorated function, which raises the errors, stays available as __wrapped__.
+    """
+    @wraps(func)
     def wrapper_input_error(*args: tuple, **kwargs: dict) -> None:
         """Wrapper function for handling input errors"""
         try:
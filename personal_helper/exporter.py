@@ -0,0 +1,121 @@
+"""
+The exporter module writes the address book to a CSV, JSON Lines or vCard file.
+
+This module defines the following functions:
+    - csv_lines: Yields the CSV lines of the records.
+    - jsonl_lines: Yields the JSON Lines of the records.
+    - vcf_lines: Yields the vCard lines of the records.
+    - export_contacts: Writes the records of the address book to a file in the given format.
+
+The records are taken one at a time from AddressBook.iter_records and turned into text by a
+generator, and the text is written to the file as it is produced, so the memory used does
+not depend on the size of the address book. The CSV and JSON Lines files have the same
+columns and keys as the files read by the import command.
+"""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator, TextIO
+
+try:
+    from .address_book import Record, AddressBook as AB
+except ImportError:
+    from address_book import Record, AddressBook as AB
+
+EXPORT_FIELDS = ["name", "phones", "emails", "birthday"]
+
+
+def _birthday(record: Record) -> str | None:
+    """
+    Returns the birthday of the record in the DD-MM-YYYY format, or None.
+    """
+    birthday = record.user.birthday_date
+    return birthday.strftime("%d-%m-%Y") if birthday else None
+
+
+def csv_lines(records: Iterable[Record]) -> Iterator[str]:
+    """
+    The csv_lines function yields the header and then one CSV line per record, with several
+    phone numbers or emails separated by ";".
+
+    :param records: Iterable[Record]: Pass the records to export
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for record in records:
+        writer.writerow([
+            record.user.name,
+            ";".join(record.phones()),
+            ";".join(record.email_addresses()),
+            _birthday(record) or "",
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_lines(records: Iterable[Record]) -> Iterator[str]:
+    """
+    The jsonl_lines function yields one JSON object per record and line.
+
+    :param records: Iterable[Record]: Pass the records to export
+    """
+    for record in records:
+        yield json.dumps({
+            "name": record.user.name,
+            "phones": record.phones(),
+            "emails": record.email_addresses(),
+            "birthday": _birthday(record),
+        }, ensure_ascii=False) + "\n"
+
+
+def _vcard_text(value: str) -> str:
+    """
+    Escapes the backslashes, commas, semicolons and line breaks of a vCard text value.
+    """
+    return (
+        value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;").replace("\n", "\\n")
+    )
+
+
+def vcf_lines(records: Iterable[Record]) -> Iterator[str]:
+    """
+    The vcf_lines function yields one vCard 3.0 per record, with the lines ended by CRLF.
+
+    :param records: Iterable[Record]: Pass the records to export
+    """
+    for record in records:
+        name = _vcard_text(record.user.name)
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{name}", f"N:{name};;;;"]
+        lines += [f"TEL;TYPE=CELL:{phone}" for phone in record.phones()]
+        lines += [f"EMAIL;TYPE=INTERNET:{_vcard_text(email)}" for email in record.email_addresses()]
+        if record.user.birthday_date:
+            lines.append(f"BDAY:{record.user.birthday_date.isoformat()}")
+        lines.append("END:VCARD")
+        yield "\r\n".join(lines) + "\r\n"
+
+
+EXPORT_WRITERS = {"csv": csv_lines, "jsonl": jsonl_lines, "vcf": vcf_lines}
+
+
+def export_contacts(address_book: AB, file: TextIO, file_format: str) -> int:
+    """
+    The export_contacts function writes all records of the address book to the file in the
+    given format and returns the number of the exported records.
+
+    :param address_book: AB: Pass the address book to export
+    :param file: TextIO: Pass the file to write to, opened with newline=""
+    :param file_format: str: Specify the format, csv, jsonl or vcf
+    """
+    count = 0
+
+    def counted(records: Iterable[Record]) -> Iterator[Record]:
+        nonlocal count
+        for count, record in enumerate(records, 1):
+            yield record
+
+    file.writelines(EXPORT_WRITERS[file_format](counted(address_book.iter_records())))
+    return count
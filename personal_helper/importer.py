@@ -0,0 +1,246 @@
+"""
+The importer module loads many contacts from a CSV or JSON Lines file.
+
+This module defines the following functions:
+    - read_rows: Reads the rows of a CSV or JSON Lines file one at a time.
+    - validate_row: Validates one row and returns its contact record.
+    - parse_birthday: Validates a birthday and returns its date.
+    - validate_chunk: Validates a chunk of rows in a worker process.
+    - import_contacts: Adds the valid rows of a file to the address book.
+
+A row holds the name of the contact and, optionally, its phone numbers, emails and birthday.
+The CSV files have the columns name, phones, emails and birthday, where several phone
+numbers or emails are separated by ";". The JSON Lines files have one object per line with
+the same keys, where phones and emails may also be lists. The phone numbers are sanitized
+and the values are checked with the rules of the validation module.
+
+The rows are read in chunks and validated in a pool of processes, with a bounded number of
+chunks in flight. The valid contacts are added to the address book chunk by chunk in the
+order of the file, and every rejected row is written to the reject file with its reason.
+"""
+
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable, Iterator, TextIO
+
+try:
+    from .constants import IMPORT_CHUNK_SIZE
+    from .address_book import Record, AddressBook as AB
+    from .entities import Phone, User, Email
+    from .utils import sanitize_phone_number
+    from .validation import (
+        name_validation,
+        phone_validation,
+        email_validation,
+        birthday_date_validation,
+    )
+except ImportError:
+    from constants import IMPORT_CHUNK_SIZE
+    from address_book import Record, AddressBook as AB
+    from entities import Phone, User, Email
+    from utils import sanitize_phone_number
+    from validation import (
+        name_validation,
+        phone_validation,
+        email_validation,
+        birthday_date_validation,
+    )
+
+IMPORT_FIELDS = ["name", "phones", "emails", "birthday"]
+REJECT_FIELDS = ["line", "reason", "row"]
+
+
+def read_rows(file: TextIO, file_format: str) -> Iterator[tuple[int, dict]]:
+    """
+    The read_rows function yields the line number and the row of every contact of a CSV or
+    JSON Lines file, one at a time. The empty lines of a JSON Lines file are skipped, and a
+    line that is not a JSON object is yielded as a row with the error.
+
+    :param file: TextIO: Pass the open file
+    :param file_format: str: Specify the format of the file, csv or jsonl
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            row = {"error": f"Invalid JSON: {error}"}
+        if not isinstance(row, dict):
+            row = {"error": "The line is not a JSON object"}
+        yield number, row
+
+
+def split_values(value: Any) -> list[str]:
+    """
+    The split_values function returns the phone numbers or emails of a row as a list:
+    a list is returned as it is and a string is split by ";".
+    """
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(";") if item.strip()]
+
+
+def validate_row(row: dict) -> Record:
+    """
+    The validate_row function checks the values of a row with the validation rules and returns
+    the record of the contact. It raises ValueError or TypeError with the reason otherwise.
+    The rules are called undecorated, so they raise the error instead of exiting.
+
+    :param row: dict: Pass the row read from the file
+    """
+    if "error" in row:
+        raise ValueError(row["error"])
+    name = str(row.get("name") or "").strip()
+    if not name:
+        raise ValueError("The name is missing")
+    name_validation.__wrapped__(name)
+    record = Record(User(name))
+
+    for phone in split_values(row.get("phones", row.get("phone"))):
+        phone = sanitize_phone_number(phone)
+        phone_validation.__wrapped__(phone)
+        record.phone_numbers.append(Phone(phone))
+
+    for email in split_values(row.get("emails", row.get("email"))):
+        email_validation.__wrapped__(email)
+        record.emails.append(Email(email))
+
+    birthday = str(row.get("birthday") or "").strip()
+    if birthday:
+        record.user = User(name, parse_birthday(birthday))
+    return record
+
+
+@lru_cache(maxsize=65536)
+def parse_birthday(birthday: str) -> date:
+    """
+    The parse_birthday function validates a birthday in the DD-MM-YYYY format and returns its
+    date. The dates repeat a lot in a large file, so every worker remembers the ones it parsed.
+    """
+    birthday_date_validation.__wrapped__(birthday)
+    return datetime.strptime(birthday, "%d-%m-%Y").date()
+
+
+def validate_chunk(chunk: list[tuple[int, dict]]) -> list[tuple[int, Record | None, str]]:
+    """
+    The validate_chunk function validates a chunk of rows and returns for every row its line
+    number and either its record or the reason it was rejected. It runs in the worker processes.
+
+    :param chunk: list[tuple[int, dict]]: Pass the line numbers and the rows
+    """
+    results: list[tuple[int, Record | None, str]] = []
+    for number, row in chunk:
+        try:
+            results.append((number, validate_row(row), ""))
+        except (TypeError, ValueError) as error:
+            results.append((number, None, str(error)))
+    return results
+
+
+class _SerialExecutor(Executor):
+    """
+    _SerialExecutor runs the chunks in the current process when no worker processes are used.
+    """
+
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def _validated_chunks(
+    rows: Iterable[tuple[int, dict]], workers: int, chunk_size: int
+) -> Iterator[tuple[list[tuple[int, dict]], list[tuple[int, Record | None, str]]]]:
+    """
+    Yields every chunk of rows with its validation results, in the order of the file.
+    At most two chunks per worker are read ahead, so the memory does not grow with the file.
+    """
+    rows = iter(rows)
+    executor = ProcessPoolExecutor(workers) if workers > 1 else _SerialExecutor()
+    with executor:
+        pending: deque = deque()
+        while True:
+            while len(pending) < 2 * max(workers, 1):
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                pending.append((chunk, executor.submit(validate_chunk, chunk)))
+            if not pending:
+                return
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def import_contacts(
+    address_book: AB,
+    file: TextIO,
+    file_format: str,
+    rejects: TextIO,
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> tuple[int, int]:
+    """
+    The import_contacts function adds the contacts of a CSV or JSON Lines file to the address
+    book and returns the numbers of the imported and of the rejected rows. A row is rejected
+    if it breaks a validation rule, if its contact is already in the address book or earlier
+    in the file, or if one of its phone numbers belongs to another contact. Every rejected row
+    is written to rejects as a CSV row with its line number, the reason and the row as JSON.
+
+    :param address_book: AB: Pass the address book to add the contacts to
+    :param file: TextIO: Pass the open file with the contacts
+    :param file_format: str: Specify the format of the file, csv or jsonl
+    :param rejects: TextIO: Pass the open file for the rejected rows
+    :param workers: int: Specify the number of worker processes, 1 to validate in this process
+    :param chunk_size: int: Specify the number of rows validated by a worker at a time
+    """
+    reject_writer = csv.writer(rejects)
+    reject_writer.writerow(REJECT_FIELDS)
+    imported = rejected = 0
+
+    for chunk, results in _validated_chunks(read_rows(file, file_format), workers, chunk_size):
+        records, names, phones = [], set(), set()
+        for (number, row), (_, record, reason) in zip(chunk, results):
+            if record is not None:
+                reason = _conflict(address_book, record, names, phones)
+            if reason:
+                reject_writer.writerow([number, reason, json.dumps(row, ensure_ascii=False)])
+                rejected += 1
+                continue
+            names.add(record.user.name)
+            phones.update(record.phones())
+            records.append(record)
+        address_book.add_records(records)
+        imported += len(records)
+
+    return imported, rejected
+
+
+def _conflict(address_book: AB, record: Record, names: set, phones: set) -> str:
+    """
+    Returns why a valid record can't be added to the address book, or an empty string.
+    The names and the phones are those of the records of the chunk not yet added.
+    """
+    name = record.user.name
+    if name in names or name in address_book:
+        return f"The contact '{name}' already exists"
+    for phone in record.phones():
+        owners = address_book.find_by_phone(phone)
+        if phone in phones or owners:
+            owner = owners[0] if owners else "another contact of the file"
+            return f"The phone number '{phone}' belongs to {owner}"
+    return ""
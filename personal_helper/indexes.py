@@ -0,0 +1,808 @@
+"""
+The indexes module provides the in-memory index structures used by the address book.
+
+This module defines the following classes:
+    - SortedList: A sorted container with logarithmic inserts and deletes.
+    - NgramIndex: An n-gram index for substring search over contact values.
+    - PhoneNgramIndex: An n-gram index for substring search over phone number digits.
+    - NameIndex: An index for exact, prefix and substring search over contact names.
+    - FuzzyIndex: A trigram index for the names within a few typos of a text or similar to it.
+    - ReverseIndex: A map from the values of the contacts back to the contact names.
+    - PhoneDirectory: A map from phone numbers to the contacts that own them.
+    - EmailDirectory: A map from email addresses to the contacts that own them.
+    - EmailDomainIndex: A map from email domains to the contacts with an address in them.
+    - BirthdayCalendar: A calendar of the contacts by the day of year of their birthday.
+
+This module defines the following functions:
+    - edit_distance: Returns the Damerau-Levenshtein distance between two texts.
+"""
+
+import re
+from collections import Counter
+from calendar import isleap
+from datetime import date, timedelta
+from bisect import bisect_left, bisect_right, insort
+from heapq import heappush, heappushpop
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator
+
+NON_DIGITS = re.compile(r"\D")
+
+
+def edit_distance(first: str, second: str) -> int:
+    """
+    Returns the restricted Damerau-Levenshtein distance between two texts: the number of
+    letters inserted, deleted or replaced and of swaps of two neighbouring letters that turn
+    one text into the other. The distance is computed with the bit-parallel algorithm of
+    Hyyrö, which keeps a whole column of the distance table in the bits of two integers,
+    so it takes one pass over the longer text.
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    length = len(second)
+    if not length:
+        return len(first)
+
+    masks: dict[str, int] = {}
+    for i, char in enumerate(second):
+        masks[char] = masks.get(char, 0) | 1 << i
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive, negative, distance = full, 0, length
+    diagonal = previous = 0
+    for char in first:
+        mask = masks.get(char, 0)
+        swap = ((~diagonal & mask) << 1) & previous
+        diagonal = (((mask & positive) + positive) ^ positive) | mask | negative | swap
+        horizontal_positive = negative | ~(diagonal | positive)
+        horizontal_negative = positive & diagonal
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        positive = ((horizontal_negative << 1) | ~(diagonal | horizontal_positive)) & full
+        negative = horizontal_positive & diagonal
+        previous = mask
+    return distance
+
+
+class SortedList:
+    """
+    SortedList keeps its values in ascending order.
+
+    The values are split into sublists of at most 2 * LOAD items, and the maximum of each
+    sublist is kept in a separate list. An insert or delete bisects the maxes and then works
+    on a single short sublist, so it does not have to move the whole list in memory.
+
+    Methods:
+        add: Inserts a value keeping the order.
+
+        update: Inserts many values keeping the order.
+
+        remove: Removes a value, raises ValueError if it is missing.
+
+        discard: Removes a value if it is present.
+
+        irange: Iterates over the values starting from a minimum.
+    """
+
+    LOAD = 1000
+
+    def __init__(self, iterable: Iterable[Any] = ()) -> None:
+        values = sorted(iterable)
+        self._lists: list[list] = [
+            values[i : i + self.LOAD] for i in range(0, len(values), self.LOAD)
+        ]
+        self._maxes: list = [sublist[-1] for sublist in self._lists]
+        self._len = len(values)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._lists)
+
+    def __contains__(self, value: Any) -> bool:
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sublist = self._lists[pos]
+        return sublist[bisect_left(sublist, value)] == value
+
+    def add(self, value: Any) -> None:
+        """
+        Inserts a value into the list keeping the order.
+        """
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+        else:
+            pos = bisect_right(self._maxes, value)
+            if pos == len(self._maxes):
+                pos -= 1
+                self._lists[pos].append(value)
+                self._maxes[pos] = value
+            else:
+                insort(self._lists[pos], value)
+            self._split(pos)
+        self._len += 1
+
+    def update(self, values: Iterable[Any]) -> None:
+        """
+        Inserts many values keeping the order. When the values are many compared to the list,
+        the list is sorted anew in one go instead of inserting them one by one.
+        """
+        values = list(values)
+        if len(values) * 8 > self._len:
+            self.__init__(chain(self, values))
+        else:
+            for value in values:
+                self.add(value)
+
+    def remove(self, value: Any) -> None:
+        """
+        Removes a value from the list, raises ValueError if the value is missing.
+        """
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            raise ValueError(f"{value!r} not in list")
+        sublist = self._lists[pos]
+        idx = bisect_left(sublist, value)
+        if sublist[idx] != value:
+            raise ValueError(f"{value!r} not in list")
+
+        del sublist[idx]
+        self._len -= 1
+        if sublist:
+            self._maxes[pos] = sublist[-1]
+        else:
+            del self._lists[pos]
+            del self._maxes[pos]
+
+    def discard(self, value: Any) -> None:
+        """
+        Removes a value from the list if it is present.
+        """
+        if value in self:
+            self.remove(value)
+
+    def irange(self, minimum: Any) -> Iterator[Any]:
+        """
+        Returns an iterator over the values greater than or equal to the minimum.
+        """
+        pos = bisect_left(self._maxes, minimum)
+        if pos == len(self._maxes):
+            return iter(())
+        sublist = self._lists[pos]
+        return chain(
+            islice(sublist, bisect_left(sublist, minimum), None),
+            chain.from_iterable(self._lists[pos + 1 :]),
+        )
+
+    def _split(self, pos: int) -> None:
+        """
+        Splits the sublist at the given position in two halves when it grows too long.
+        """
+        sublist = self._lists[pos]
+        if len(sublist) > 2 * self.LOAD:
+            half = sublist[self.LOAD :]
+            del sublist[self.LOAD :]
+            self._maxes[pos] = sublist[-1]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos + 1, half[-1])
+
+
+class NgramIndex:
+    """
+    NgramIndex is an n-gram index for substring search over the values of the contacts.
+
+    Every value is normalized and split into overlapping n-grams. Each n-gram points to the
+    set of contact names that have it (a posting list). A substring query intersects the
+    posting lists of its own n-grams, starting from the shortest one, and then checks the
+    few remaining candidates directly. The field attribute of a subclass names the Record
+    method that returns the indexed values.
+
+    Methods:
+        normalize: Returns the form of a value that is indexed and searched.
+
+        build: Indexes the values of many contacts at once.
+
+        update: Replaces the indexed values of a contact.
+
+        remove: Removes a contact from the index.
+
+        search: Returns the names of the contacts with a value containing the criteria.
+    """
+
+    N = 3
+    field = ""
+
+    def __init__(self) -> None:
+        self._values: dict[str, tuple[str, ...]] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        Returns the form of the value that is indexed and searched.
+        """
+        return value
+
+    def ngrams(self, value: str) -> set[str]:
+        """
+        Returns the set of n-grams of a normalized value.
+        """
+        return {value[i : i + self.N] for i in range(len(value) - self.N + 1)}
+
+    def build(self, contacts: Iterable[tuple[str, Iterable[str]]]) -> None:
+        """
+        Indexes the values of contacts that are not in the index yet.
+        This is the fast path used to build the index for a whole address book.
+        """
+        postings = self._postings
+        n = self.N
+        for name, values in contacts:
+            normalized = tuple(self.normalize(value) for value in values if value)
+            self._values[name] = normalized
+            for value in normalized:
+                for i in range(len(value) - n + 1):
+                    gram = value[i : i + n]
+                    names = postings.get(gram)
+                    if names is None:
+                        postings[gram] = {name}
+                    else:
+                        names.add(name)
+
+    def update(self, name: str, values: Iterable[str]) -> None:
+        """
+        Replaces the indexed values of the contact with the given ones.
+        Only the posting lists of the n-grams that were added or removed are touched.
+        """
+        new_values = tuple(self.normalize(value) for value in values if value)
+        old_values = self._values.get(name, ())
+        if new_values == old_values and name in self._values:
+            return
+
+        old_grams = set().union(*(self.ngrams(value) for value in old_values))
+        new_grams = set().union(*(self.ngrams(value) for value in new_values))
+
+        for gram in old_grams - new_grams:
+            self._discard_posting(gram, name)
+        for gram in new_grams - old_grams:
+            self._postings.setdefault(gram, set()).add(name)
+
+        self._values[name] = new_values
+
+    def remove(self, name: str) -> None:
+        """
+        Removes the contact and all its values from the index.
+        """
+        for value in self._values.pop(name, ()):
+            for gram in self.ngrams(value):
+                self._discard_posting(gram, name)
+
+    def search(self, criteria: str) -> list[str]:
+        """
+        Returns the names of the contacts that have a value containing the given criteria.
+        Criteria shorter than an n-gram are checked against every indexed value.
+        """
+        criteria = self.normalize(criteria)
+        if len(criteria) < self.N:
+            candidates: Iterable[str] = self._values
+        else:
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in self.ngrams(criteria)),
+                key=len,
+            )
+            candidates = postings[0].intersection(*postings[1:])
+
+        return [
+            name
+            for name in candidates
+            if any(criteria in value for value in self._values[name])
+        ]
+
+    def _discard_posting(self, gram: str, name: str) -> None:
+        """
+        Removes the name from the posting list of the n-gram, dropping the list when it gets empty.
+        """
+        names = self._postings.get(gram)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self._postings[gram]
+
+
+class PhoneNgramIndex(NgramIndex):
+    """
+    PhoneNgramIndex is an n-gram index over the digits of the contacts' phone numbers.
+    """
+
+    field = "phones"
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        Returns only the digits of the phone number.
+        """
+        return NON_DIGITS.sub("", value)
+
+
+class NameIndex:
+    """
+    NameIndex is an index over the casefolded contact names.
+
+    The casefolded key of every name is computed once, when the name is added. The keys are
+    kept in a SortedList for prefix lookups, in a dict for exact lookups and in an
+    NgramIndex for substring lookups, so a query does not lowercase or scan every name.
+    Casefolding covers the Cyrillic letters of constants.LETTERS as well.
+
+    Methods:
+        build: Indexes many names at once.
+
+        add: Adds a name to the index.
+
+        remove: Removes a name from the index.
+
+        exact: Returns the names equal to the text, ignoring case.
+
+        prefix: Returns the names starting with the text, in key order.
+
+        search: Returns the names containing the text.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[str, str] = {}
+        self._exact: dict[str, set[str]] = {}
+        self._sorted = SortedList()
+        self._ngrams = NgramIndex()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def key(name: str) -> str:
+        """
+        Returns the casefolded key of a name.
+        """
+        return name.casefold()
+
+    def build(self, names: Iterable[str]) -> None:
+        """
+        Indexes names that are not in the index yet.
+        """
+        pairs = []
+        for name in names:
+            key = self.key(name)
+            self._keys[name] = key
+            self._exact.setdefault(key, set()).add(name)
+            pairs.append((key, name))
+        self._sorted = SortedList(chain(self._sorted, pairs))
+        self._ngrams.build((name, (key,)) for key, name in pairs)
+
+    def add(self, name: str) -> None:
+        """
+        Adds a name to the index.
+        """
+        if name in self._keys:
+            return
+        key = self.key(name)
+        self._keys[name] = key
+        self._exact.setdefault(key, set()).add(name)
+        self._sorted.add((key, name))
+        self._ngrams.update(name, (key,))
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a name from the index.
+        """
+        key = self._keys.pop(name, None)
+        if key is None:
+            return
+        names = self._exact[key]
+        names.discard(name)
+        if not names:
+            del self._exact[key]
+        self._sorted.remove((key, name))
+        self._ngrams.remove(name)
+
+    def exact(self, text: str) -> list[str]:
+        """
+        Returns the names that are equal to the text, ignoring case.
+        """
+        return sorted(self._exact.get(self.key(text), ()))
+
+    def prefix(self, text: str, limit: int | None = None) -> list[str]:
+        """
+        Returns up to limit names starting with the text, ignoring case, in key order.
+        """
+        text = self.key(text)
+        result = []
+        for key, name in self._sorted.irange((text,)):
+            if not key.startswith(text) or len(result) == limit:
+                break
+            result.append(name)
+        return result
+
+    def search(self, text: str) -> list[str]:
+        """
+        Returns the names that contain the text, ignoring case.
+        """
+        return self._ngrams.search(self.key(text))
+
+
+class FuzzyIndex:
+    """
+    FuzzyIndex is a trigram index over the casefolded names, for the names within a few typos
+    of a text, as measured by edit_distance.
+
+    Every key is padded with two spaces on both sides and split into trigrams, and each
+    trigram points to the set of the keys that have it. A typo changes at most three of the
+    trigrams of a key, and a swap of two letters four, so a key within k typos of the text
+    has all but at most 4 * k of the trigrams of the text. Such a key is then in one of the
+    4 * k + 1 shortest posting lists of these trigrams: only the keys of those lists that
+    have enough of the trigrams and a length close enough are compared with the text. The
+    search looks for one typo first and for more only when there are not enough names, so
+    the usual typo is found from the shortest lists. A text too short for the count of its
+    trigrams to tell anything is compared with every key of a close enough length.
+
+    The similarity of a key to a text is the Jaccard index of their sets of trigrams, the
+    trigrams they share over all the trigrams of both. The keys sharing a trigram with the
+    text are counted from its posting lists and scored from the most shared trigrams down,
+    until the share of the trigrams of the text left is below the scores already found.
+
+    Methods:
+        build: Indexes many names at once.
+
+        add: Adds a name to the index.
+
+        remove: Removes a name from the index.
+
+        suggest: Returns the names closest to a text, within a few typos.
+
+        similar: Returns the names most similar to a text by their trigrams.
+    """
+
+    N = 3
+    PAD = "  "
+    MAX_TYPOS = 2
+    SHORT = 4
+    MIN_SIMILARITY = 0.3
+
+    def __init__(self) -> None:
+        self._keys: dict[str, str] = {}
+        self._names: dict[str, set[str]] = {}
+        self._sizes: dict[str, int] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def key(name: str) -> str:
+        """
+        Returns the casefolded key of a name.
+        """
+        return name.casefold()
+
+    def ngrams(self, key: str) -> set[str]:
+        """
+        Returns the set of trigrams of a key padded with spaces.
+        """
+        value = self.PAD + key + self.PAD
+        return {value[i : i + self.N] for i in range(len(value) - self.N + 1)}
+
+    @classmethod
+    def typos(cls, key: str) -> int:
+        """
+        Returns the number of typos allowed in the key: one in a short key, MAX_TYPOS otherwise.
+        """
+        return 1 if len(key) <= cls.SHORT else cls.MAX_TYPOS
+
+    def build(self, names: Iterable[str]) -> None:
+        """
+        Indexes many names.
+        """
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        """
+        Adds a name to the index. Only a key new to the index is split into trigrams.
+        """
+        if name in self._keys:
+            return
+        key = self.key(name)
+        self._keys[name] = key
+        names = self._names.get(key)
+        if names is not None:
+            names.add(name)
+            return
+        self._names[key] = {name}
+        grams = self.ngrams(key)
+        self._sizes[key] = len(grams)
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is None:
+                self._postings[gram] = {key}
+            else:
+                keys.add(key)
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a name from the index, and its key when no other name has it.
+        """
+        key = self._keys.pop(name, None)
+        if key is None:
+            return
+        names = self._names[key]
+        names.discard(name)
+        if names:
+            return
+        del self._names[key]
+        del self._sizes[key]
+        for gram in self.ngrams(key):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def suggest(self, text: str, limit: int = 3, max_typos: int | None = None) -> list[str]:
+        """
+        Returns up to limit names within max_typos typos of the text, ignoring case, ordered
+        by the number of typos and then by name. The number of typos allowed depends on the
+        length of the text when max_typos is not given.
+        """
+        key = self.key(text)
+        max_typos = self.typos(key) if max_typos is None else max_typos
+        grams = self.ngrams(key)
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        found = [(0, key)] if key in self._names else []
+        count = len(self._names[key]) if found else 0
+
+        for typos in range(1, max_typos + 1):
+            if count >= limit:
+                break
+            shared = len(grams) - (self.N + 1) * typos
+            if shared > 0:
+                candidates: Iterable[str] = set().union(*postings[: len(grams) - shared + 1])
+            else:
+                candidates = self._names
+            for candidate in candidates:
+                if abs(len(candidate) - len(key)) > typos:
+                    continue
+                if shared > 0 and sum(candidate in keys for keys in postings) < shared:
+                    continue
+                if edit_distance(key, candidate) == typos:
+                    found.append((typos, candidate))
+                    count += len(self._names[candidate])
+
+        result = []
+        for _, candidate in sorted(found):
+            result.extend(sorted(self._names[candidate]))
+        return result[:limit]
+
+    def similar(self, text: str, limit: int = 10, threshold: float | None = None) -> list[tuple[str, float]]:
+        """
+        Returns up to limit names with their similarity to the text, ignoring case, from the
+        most similar, and by name for the same similarity. The names less similar than the
+        threshold, MIN_SIMILARITY when it is not given, are left out.
+        """
+        threshold = self.MIN_SIMILARITY if threshold is None else threshold
+        grams = self.ngrams(self.key(text))
+        counts = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+        best: list[float] = []
+        scored = []
+        for candidate, shared in counts.most_common():
+            # A key sharing fewer trigrams is at most shared / len(grams) similar.
+            bound = shared / len(grams)
+            if bound < threshold or len(best) == limit and bound < best[0]:
+                break
+            score = shared / (len(grams) + self._sizes[candidate] - shared)
+            if score < threshold:
+                continue
+            scored.append((-score, candidate))
+            if len(best) < limit:
+                heappush(best, score)
+            elif score > best[0]:
+                heappushpop(best, score)
+
+        result = []
+        for score, candidate in sorted(scored):
+            result.extend((name, -score) for name in sorted(self._names[candidate]))
+        return result[:limit]
+
+
+class ReverseIndex:
+    """
+    ReverseIndex maps the normalized values of the contacts back to the contact names.
+
+    A lookup by value is a single dict access. The index keeps the values it has seen for
+    every contact, so an update only touches the values that were added or removed. The
+    field attribute of a subclass names the Record method that returns the indexed values.
+
+    Methods:
+        normalize: Returns the form of a value that is indexed and looked up.
+
+        build: Indexes the values of many contacts at once.
+
+        update: Replaces the indexed values of a contact.
+
+        remove: Removes a contact from the index.
+
+        get: Returns the names of the contacts that have the value.
+    """
+
+    field = ""
+
+    def __init__(self) -> None:
+        self._values: dict[str, tuple[str, ...]] = {}
+        self._names: dict[str, set[str]] = {}
+
+    def __contains__(self, value: str) -> bool:
+        return self.normalize(value) in self._names
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        Returns the form of the value that is indexed and looked up.
+        """
+        return value
+
+    def build(self, contacts: Iterable[tuple[str, Iterable[str]]]) -> None:
+        """
+        Indexes the values of contacts that are not in the index yet.
+        """
+        index = self._names
+        for name, values in contacts:
+            normalized = tuple({self.normalize(value) for value in values if value})
+            self._values[name] = normalized
+            for value in normalized:
+                names = index.get(value)
+                if names is None:
+                    index[value] = {name}
+                else:
+                    names.add(name)
+
+    def update(self, name: str, values: Iterable[str]) -> None:
+        """
+        Replaces the indexed values of the contact with the given ones.
+        """
+        new_values = {self.normalize(value) for value in values if value}
+        old_values = set(self._values.get(name, ()))
+
+        for value in old_values - new_values:
+            self._discard(value, name)
+        for value in new_values - old_values:
+            self._names.setdefault(value, set()).add(name)
+
+        self._values[name] = tuple(new_values)
+
+    def remove(self, name: str) -> None:
+        """
+        Removes the contact and all its values from the index.
+        """
+        for value in self._values.pop(name, ()):
+            self._discard(value, name)
+
+    def get(self, value: str) -> set[str]:
+        """
+        Returns the names of the contacts that have the value.
+        """
+        return set(self._names.get(self.normalize(value), ()))
+
+    def _discard(self, value: str, name: str) -> None:
+        """
+        Removes the name from the set of the value, dropping the set when it gets empty.
+        """
+        names = self._names.get(value)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self._names[value]
+
+
+class PhoneDirectory(ReverseIndex):
+    """
+    PhoneDirectory maps the digits of every phone number in the book to its owners.
+    """
+
+    field = "phones"
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        Returns only the digits of the phone number.
+        """
+        return NON_DIGITS.sub("", value)
+
+
+class EmailDirectory(ReverseIndex):
+    """
+    EmailDirectory maps every email address in the book to its owners.
+    """
+
+    field = "email_addresses"
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        Returns the email address in lower case.
+        """
+        return value.lower()
+
+
+class EmailDomainIndex(ReverseIndex):
+    """
+    EmailDomainIndex maps every email domain in the book to the contacts with an address in it.
+    """
+
+    field = "email_addresses"
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        Returns the domain of the email address in lower case.
+        """
+        return value.rpartition("@")[2].lower()
+
+
+class BirthdayCalendar(ReverseIndex):
+    """
+    BirthdayCalendar puts the contacts into 366 buckets by the day of year of their birthday.
+
+    The buckets follow the days of a leap year, so the 29th of February has its own bucket.
+    A query for the next days walks the calendar from the current date and reads only the
+    buckets of those days. In a year that is not a leap year the bucket of the 29th of
+    February is read together with the 28th of February, as Record.days_to_birthday does.
+
+    Methods:
+        window: Returns the buckets of the next days, ordered by days left.
+
+        upcoming: Returns the contacts with a birthday in the next days, ordered by days left.
+    """
+
+    field = "birthday_dates"
+    FEBRUARY_29 = date(2000, 2, 29).timetuple().tm_yday - 1
+
+    @staticmethod
+    def normalize(value: date) -> int:
+        """
+        Returns the bucket of the birthday: its zero based day of a leap year.
+        """
+        return date(2000, value.month, value.day).timetuple().tm_yday - 1
+
+    @classmethod
+    def window(cls, days: int, current_date: date) -> list[tuple[int, int]]:
+        """
+        Returns the (days left, bucket) pairs of the days within the given number of days from
+        the current date, the current date included, in the order of the days.
+        """
+        result = []
+        for offset in range(min(days, 365) + 1):
+            day = current_date + timedelta(days=offset)
+            result.append((offset, cls.normalize(day)))
+            if day.month == 2 and day.day == 28 and not isleap(day.year):
+                result.append((offset, cls.FEBRUARY_29))
+        return result
+
+    def upcoming(self, days: int, current_date: date) -> list[tuple[int, str]]:
+        """
+        Returns the (days left, name) pairs of the contacts with a birthday within the given
+        number of days from the current date, the birthday today included, ordered by days left
+        and then by name. The pairs are sorted together, as the 28th and the 29th of February
+        share the days left in a year that is not a leap year.
+        """
+        result = []
+        seen: set[str] = set()
+        for offset, bucket in self.window(days, current_date):
+            for name in self._names.get(bucket, ()):
+                if name not in seen:
+                    seen.add(name)
+                    result.append((offset, name))
+        result.sort()
+        return result
@@ -0,0 +1,126 @@
+"""
+The note_commands module runs the note commands.
+
+This module defines the following functions:
+
+load_notes() and save_notes(note: Notes): These functions load and save the notes.
+In a session the notes are loaded once and saved when the session is flushed.
+
+add_note_to_data(tags: list, text: str): This function adds a note with tags.
+
+find_note(key_word: str): This function prints the notes with the keyword in their tags or text.
+
+show_all_notes(): This function prints all notes sorted by their tags.
+
+delete_note(tag: str): This function deletes the note with the tag.
+
+edit_note(tag: str, new_tag: list, new_text: str): This function changes the tags and the text of a note.
+
+The module imports only the notes and the session, so a note command does not load the
+modules of the address book.
+"""
+
+try:
+    from .notes import Notes
+    from .session import SESSION
+    from .profiling import PROFILER
+except ImportError:
+    from notes import Notes
+    from session import SESSION
+    from profiling import PROFILER
+
+
+@PROFILER.timed("load")
+def load_notes() -> Notes:
+    """
+    The load_notes function loads the notes from a file.
+    In a session the notes are loaded once and then reused.
+    """
+
+    if SESSION.active and SESSION.notes is not None:
+        return SESSION.notes
+    note = Notes()
+    note.load()
+    if SESSION.active:
+        SESSION.notes = note
+    return note
+
+
+@PROFILER.timed("persist")
+def save_notes(note: Notes) -> None:
+    """
+    The save_notes function saves the notes to a file.
+    In a session the notes are written when the session is flushed.
+
+    :param note: Notes: Pass the notes object to the function
+    """
+
+    if SESSION.active and note is SESSION.notes:
+        SESSION.notes_changed = True
+        return
+    note.save()
+
+
+def add_note_to_data(tags: list, text: str = "") -> None:
+    """
+    The add_note_to_data function adds notes with tags. If no tag is specified, a default tag is assigned
+
+    :param tags: list: Specify the tags that will be assigned to the note
+    :param text: Specify the text of the note
+    """
+    note = load_notes()
+    note.add_note(tags, text)
+    save_notes(note)
+
+
+def find_note(key_word: str = "") -> None:
+    """
+    The find_note function searches for a note by keyword/letter/symbol.
+    The search is conducted by tags and by the text of the notes at the same time.
+
+    :param key_word: str: Specify the keyword to search for
+    """
+    note = load_notes()
+    note.find(key_word)
+    print("The search is over!")
+
+
+def show_all_notes() -> None:
+    """
+    The show_all_notes function is used to display all the notes in the Notes.txt file.
+    The function first loads all of the notes from Notes.txt into a list, then sorts them by date and time,
+    and finally displays them on screen.
+    """
+
+    note = load_notes()
+    note.show_all_sorted_notes()
+    save_notes(note)
+
+
+def delete_note(tag: str) -> None:
+    """
+    The delete_note function deletes a note from the notes.txt file.
+
+    :param tag: str: Specify which note to delete
+    """
+
+    note = load_notes()
+    note.del_notes(tag)
+    save_notes(note)
+
+
+def edit_note(tag: str, new_tag: list, new_text: str) -> None:
+    """
+    The edit_note function allows the user to edit a note.
+    The function takes in three parameters: tag, new_tag, and new_text.
+    Tag is the name of the note that will be edited. New_tag is a list of tags that will replace old ones for this note.
+    New text is what replaces old text for this note.
+
+    :param tag: str: Find the note that is to be edited
+    :param new_tag: list: Allow the user to add multiple tags to a note
+    :param new_text: str: Change the text of a note
+    """
+
+    note = load_notes()
+    note.edit_notes(tag, new_tag, new_text)
+    save_notes(note)
@@ -1,6 +1,6 @@
 """..."""
 from collections import UserDict
-from pathlib import Path
+import os
 import pickle
 
 try:
@@ -189,7 +189,7 @@ class Notes(UserDict):
         The load function is used to load the data from a file.
         If the file does not exist, it will create one and return an empty dictionary.
         """
-        if Path(FILE_NOTES).exists():
+        if os.path.exists(FILE_NOTES):
             with open(FILE_NOTES, "rb") as fh:
                 self.data = pickle.load(fh)
                 return self.data
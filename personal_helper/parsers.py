@@ -0,0 +1,265 @@
+"""
+The parsers module defines the arguments of every command of pbot once and parses the
+command lines with them.
+
+This module defines the following functions:
+    - argument: Describes one argument of a command as for ArgumentParser.add_argument.
+    - get_parser: Returns the parser of a command, built at its first use.
+    - build_parsers: Builds the parsers of all commands.
+    - fast_parse: Parses the arguments of a simple command without argparse.
+    - parse_arguments: Parses the arguments of a command.
+
+COMMANDS holds the description, the usage and the arguments of every command. The parsers
+are built from it when a command is first parsed and kept, so a batch or the server builds
+every parser once, however many commands it runs. The lookups run most often, show, search,
+whois and birth, are parsed by fast_parse, without importing argparse or building a parser,
+when their arguments are plain options and values; anything else, such as -h, an unknown
+option or a value that is not valid, is left to argparse, which reports the error.
+"""
+
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+try:
+    from .constants import SOCKET_FILE, SERVER_FLUSH_INTERVAL
+except ImportError:
+    from constants import SOCKET_FILE, SERVER_FLUSH_INTERVAL
+
+if TYPE_CHECKING:
+    import argparse
+
+
+def argument(*flags: str, **options: Any) -> tuple[tuple[str, ...], dict[str, Any]]:
+    """
+    The argument function describes one argument of a command with the flags and the options
+    of ArgumentParser.add_argument.
+    """
+    return flags, options
+
+
+COMMANDS: dict[str, dict[str, Any]] = {
+    "add": {
+        "description": "Create new contact",
+        "usage": "\nadd -h\nadd -n <name> -p <phone>",
+        "arguments": [
+            argument("-n", dest="name", help="Contact name"),
+            argument("-p", dest="phone", help="Number of phone"),
+        ],
+    },
+    "change": {
+        "description": "change contact or contact data",
+        "usage": "\nchange -h\nchange -n <name> -p <phone> -e\nchange -n <name> -p <phone> -r <phone>\nchange -n <name> -e <email>\nchange -n <name> -e <emeil> -r <emeil>\nchange -n <name> -b <birthday>",
+        "arguments": [
+            argument("-n", dest="name", help="Contact name"),
+            argument("-p", dest="phone", help="Phone Number"),
+            argument("-e", dest="email", help="User Email"),
+            argument("-b", dest="birthday", help="Date of birth in format dd-mm-yyyy"),
+            argument("-r", dest="replace", help="This argument use only after -p or -e"),
+        ],
+    },
+    "del": {
+        "description": "delete contact or contact data",
+        "usage": "\ndel -h\ndel -n <name>\ndel -n <name> -p <phone>\ndel -n <name> -e <emeil>\ndel-n <name> -b <birthday>",
+        "arguments": [
+            argument("-n", dest="name", help="Contact name"),
+            argument("-p", dest="phone", help="Phone Number"),
+            argument("-e", dest="email", help="User Email"),
+            argument("-b", dest="birthday", help="Date of birth in format dd-mm-yyyy"),
+        ],
+    },
+    "show": {
+        "description": "display contact data",
+        "usage": "\nshow -h\nshow -a all\nshow -a <name>",
+        "fast": True,
+        "arguments": [
+            argument("-a", dest="show", help="Use show -a <all> or show -a <name>"),
+        ],
+    },
+    "search": {
+        "description": "search",
+        "usage": "\nsearch -h\nsearch -s <key_word>\nsearch -s <beginning of name> --prefix -k <number>\nsearch -s <name> --fuzzy -k <number>",
+        "fast": True,
+        "arguments": [
+            argument("-s", dest="search", help="Search by keywords -s <key word>"),
+            argument("--prefix", dest="prefix", action="store_true", help="Print names starting with the key word"),
+            argument("--fuzzy", dest="fuzzy", action="store_true", help="Print the contacts with the most similar names"),
+            argument("-k", dest="top", type=int, default=10, help="Number of names printed with --prefix or --fuzzy"),
+        ],
+    },
+    "birth": {
+        "description": "birth",
+        "usage": "\nbirth -h\nbirth -d <days>",
+        "fast": True,
+        "arguments": [
+            argument("-d", dest="days", help="Range of days"),
+        ],
+    },
+    "whois": {
+        "description": "find the owner of a phone number or email",
+        "usage": "\nwhois -h\nwhois -p <phone>\nwhois -e <email>\nwhois -d <domain>",
+        "fast": True,
+        "arguments": [
+            argument("-p", dest="phone", help="Number of phone"),
+            argument("-e", dest="email", help="User Email"),
+            argument("-d", dest="domain", help="Email domain"),
+        ],
+    },
+    "migrate": {
+        "description": "copy the contacts to another storage",
+        "usage": "\nmigrate -h\nmigrate -t sqlite\nmigrate -t journal",
+        "arguments": [
+            argument("-t", dest="target", help="Target storage: sqlite or journal"),
+        ],
+    },
+    "import": {
+        "description": "add the contacts of a CSV or JSON Lines file",
+        "usage": "\nimport -h\nimport <file>\nimport <file> -r <reject_file> -w <workers>",
+        "arguments": [
+            argument("source", help="Path to the .csv or .jsonl file with the contacts"),
+            argument("-r", dest="rejects", help="Path to the file for the rejected rows"),
+            argument("-w", dest="workers", type=int, help="Number of worker processes"),
+        ],
+    },
+    "export": {
+        "description": "write all contacts to a file",
+        "usage": "\nexport -h\nexport -f <csv|jsonl|vcf>\nexport -f <csv|jsonl|vcf> -o <file>",
+        "arguments": [
+            argument("-f", "--format", dest="format", help="Format: csv, jsonl or vcf"),
+            argument("-o", "--output", dest="output", help="Path to the file, stdout if omitted"),
+        ],
+    },
+    "note": {
+        "description": "note",
+        "usage": "\nnote -h\note -a <tag> -n <text note>\nnote -f <tag>\nnote -t <old_tag> -r <new_tag> -n\nnote -s all\nnote -d <tag>\nnote -n <note>\nnote -r <replace>",
+        "join": ["note"],
+        "arguments": [
+            argument("-a", dest="add", nargs="+", help="Add new note"),
+            argument("-f", dest="find", help="Find note"),
+            argument("-t", dest="tag", help="Tag"),
+            argument("-s", dest="show", help="Show all note"),
+            argument("-d", dest="delete", help="Delete notes"),
+            argument("-n", dest="note", type=str, nargs="+", help="Note text"),
+            argument("-r", dest="replace", nargs="+", help="New tag"),
+        ],
+    },
+    "sort": {
+        "description": "sort",
+        "usage": '\nsort -h\nsort -d sort -d <"Path">',
+        "arguments": [
+            argument("-d", dest="directory", help="Path to directory"),
+        ],
+    },
+    "batch": {
+        "description": "run the commands of a file, one per line",
+        "usage": "\nbatch -h\nbatch <file>\nbatch -\nbatch <file> -n <number>",
+        "arguments": [
+            argument("source", help="Path to the file with commands, - for the standard input"),
+            argument("-n", dest="every", type=int, default=0, help="Save the changes every <number> commands"),
+        ],
+    },
+    "serve": {
+        "description": "run the commands sent over a Unix socket",
+        "usage": "\nserve -h\nserve\nserve -s <socket> -i <seconds>",
+        "arguments": [
+            argument("-s", dest="socket", default=SOCKET_FILE, help="Path to the socket"),
+            argument("-i", dest="interval", type=float, default=SERVER_FLUSH_INTERVAL,
+                     help="Save the changes every <seconds>"),
+        ],
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def get_parser(command: str) -> "argparse.ArgumentParser":
+    """
+    The get_parser function returns the parser of the command. It is built from COMMANDS
+    at the first call and the same parser is returned by the next ones.
+
+    :param command: str: Specify the name of the command
+    """
+    import argparse
+
+    spec = COMMANDS[command]
+    parser = argparse.ArgumentParser(prog=command, description=spec["description"], usage=spec["usage"])
+    for flags, options in spec["arguments"]:
+        parser.add_argument(*flags, **options)
+    return parser
+
+
+def build_parsers() -> None:
+    """
+    The build_parsers function builds the parsers of all commands, so that a long running
+    process, such as the server, does not build them while it answers the commands.
+    """
+    for command in COMMANDS:
+        get_parser(command)
+
+
+@lru_cache(maxsize=None)
+def _fast_options(command: str) -> tuple[dict[str, tuple[str, Any, bool]], dict[str, Any]]:
+    """
+    Returns the options of the command by flag, as the destination, the type and whether it
+    is a flag without a value, and the default values by destination.
+    """
+    options = {}
+    defaults = {}
+    for flags, spec in COMMANDS[command]["arguments"]:
+        store_true = spec.get("action") == "store_true"
+        for flag in flags:
+            options[flag] = (spec["dest"], spec.get("type", str), store_true)
+        defaults[spec["dest"]] = spec.get("default", False if store_true else None)
+    return options, defaults
+
+
+def fast_parse(command: str, args: list[str]) -> SimpleNamespace | None:
+    """
+    The fast_parse function parses the arguments of a command whose arguments are all options
+    with one value or flags, without argparse. It returns None when an argument is not one of
+    the options of the command, a value is missing or starts with -, or a value is not of the
+    type of its option, so that argparse parses the arguments and reports the error.
+
+    :param command: str: Specify the name of the command
+    :param args: list[str]: Pass the arguments split on whitespace
+    """
+    options, defaults = _fast_options(command)
+    values = dict(defaults)
+    index = 0
+    while index < len(args):
+        option = options.get(args[index])
+        if option is None:
+            return None
+        dest, convert, store_true = option
+        if store_true:
+            values[dest] = True
+            index += 1
+            continue
+        if index + 1 == len(args) or args[index + 1].startswith("-"):
+            return None
+        try:
+            values[dest] = convert(args[index + 1])
+        except ValueError:
+            return None
+        index += 2
+    return SimpleNamespace(**values)
+
+
+def parse_arguments(command: str, arguments: str) -> "argparse.Namespace | SimpleNamespace":
+    """
+    The parse_arguments function parses the arguments of the command, with fast_parse for
+    the commands marked as fast and with the parser of the command otherwise. The words of
+    the options listed in join are joined into one text, each followed by a space.
+
+    :param command: str: Specify the name of the command
+    :param arguments: str: Pass the arguments of the command line
+    """
+    spec = COMMANDS[command]
+    args = arguments.split()
+    parsed = fast_parse(command, args) if spec.get("fast") else None
+    if parsed is None:
+        parsed = get_parser(command).parse_args(args)
+    for dest in spec.get("join", []):
+        words = getattr(parsed, dest)
+        if words:
+            setattr(parsed, dest, "".join(word + " " for word in words))
+    return parsed
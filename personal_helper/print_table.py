@@ -2,6 +2,12 @@
 The TablePrinter module provides a utility class for printing tabular data to the console.
 """
 
+try:
+    from .profiling import PROFILER
+except ImportError:
+    from profiling import PROFILER
+
+
 class TablePrinter:
     """
     A utility class for printing tabular data to the console.
@@ -42,6 +48,7 @@ class TablePrinter:
         formatted_row = [f"{str(column):<{width}}" for column, width in zip(row, column_widths)]
         return "| " + " | ".join(formatted_row) + "|"
 
+    @PROFILER.timed("render")
     def print_table(self) -> None:
         """
         The print_table function prints a table of data to the console.
@@ -0,0 +1,230 @@
+"""
+The profiling module measures where the time of a pbot call goes.
+
+This module defines the following classes:
+    - Profiler: Adds up the time and the peak memory of the phases of a call.
+
+This module defines the following functions:
+    - split_profile_options: Separates the profiling options from the command line.
+    - profiled: Profiles the command run in its block and reports the phases.
+    - format_report: Formats the phases of a report as a table.
+
+The phases are startup, import, parse, load, execute, render and persist. The functions that
+load, save and print are marked with Profiler.timed, and the time of a phase started inside
+another one is taken off the outer phase, so the phases add up to the total. Startup is the
+time of the imports of pbot before main is called, and import is the time of the subsystems,
+such as the address book, imported by the command when it needs them. The profiler does nothing until it is started by
+the --profile option, and it only measures the thread that started it. The modules used
+only by the options are imported when the options are given, so that the profiler does not
+slow down the startup of the calls without them.
+"""
+
+import sys
+from _thread import get_ident
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    import argparse
+
+STARTED = perf_counter()
+PHASES = ["startup", "import", "parse", "load", "execute", "render", "persist"]
+PROFILE_OPTIONS = {
+    "--profile": False,
+    "--profile-memory": False,
+    "--profile-cprofile": True,
+    "--profile-metrics": True,
+}
+
+
+class Profiler:
+    """
+    Profiler adds up the time spent in every phase, and with memory the peak of the memory
+    allocated in it, as measured by tracemalloc.
+
+    Methods:
+        start: Starts measuring the phases.
+
+        stop: Stops measuring and returns the report.
+
+        add: Adds time to a phase.
+
+        phase: Measures the block as a phase.
+
+        timed: Decorates a function to measure its calls as a phase.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.memory = False
+        self.seconds: dict[str, float] = {}
+        self.peaks: dict[str, int] = {}
+        self._stack: list[str] = []
+        self._mark = 0.0
+        self._thread = 0
+
+    def start(self, memory: bool = False) -> None:
+        """
+        Starts measuring the phases of the current thread, and their memory with memory.
+        """
+        self.__init__()
+        self.enabled = True
+        self.memory = memory
+        self._thread = get_ident()
+        if memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        self._mark = perf_counter()
+
+    def stop(self) -> dict[str, Any]:
+        """
+        Stops measuring and returns the seconds of every phase, their total and the peaks
+        of the memory of the phases in bytes.
+        """
+        if self.memory:
+            import tracemalloc
+
+            tracemalloc.stop()
+        self.enabled = False
+        return {
+            "seconds": dict(self.seconds),
+            "total": sum(self.seconds.values()),
+            "peaks": dict(self.peaks),
+        }
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Adds the seconds to the phase.
+        """
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def _switch(self) -> None:
+        """
+        Charges the time and the memory since the last switch to the innermost phase.
+        """
+        now = perf_counter()
+        if self._stack:
+            name = self._stack[-1]
+            self.add(name, now - self._mark)
+            if self.memory:
+                import tracemalloc
+
+                peak = tracemalloc.get_traced_memory()[1]
+                self.peaks[name] = max(self.peaks.get(name, 0), peak)
+                tracemalloc.reset_peak()
+        self._mark = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measures the block as the phase. The phases started inside the block are taken off it.
+        """
+        if not self.enabled or get_ident() != self._thread:
+            yield
+            return
+        self._switch()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """
+        Returns a decorator that measures the calls of a function as the phase.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.phase(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+PROFILER = Profiler()
+
+
+def split_profile_options(args: list[str]) -> tuple["argparse.Namespace | None", list[str]]:
+    """
+    The split_profile_options function takes the profiling options from the start of the
+    command line and returns them with the rest of the command line. The options are None
+    when the command line starts with none of them.
+
+    :param args: list[str]: Pass the arguments of the command line
+    """
+    count = 0
+    while count < len(args) and args[count] in PROFILE_OPTIONS:
+        count += 1 + PROFILE_OPTIONS[args[count]]
+    if not count:
+        return None, args
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="pbot", usage="pbot --profile [options] <command>")
+    parser.add_argument("--profile", action="store_true", help="print the time of every phase")
+    parser.add_argument("--profile-memory", action="store_true", help="measure the peak memory of every phase")
+    parser.add_argument("--profile-cprofile", metavar="FILE", help="write the cProfile stats to the file")
+    parser.add_argument("--profile-metrics", metavar="FILE", help="append the phases to the file as a JSON line")
+    return parser.parse_args(args[:count]), args[count:]
+
+
+@contextmanager
+def profiled(options: "argparse.Namespace", command: str) -> Iterator[None]:
+    """
+    The profiled function profiles the command run in the block as the execute phase.
+    At the end it prints the phases to the standard error, writes the cProfile stats and
+    appends the report to the metrics file if these options are given.
+
+    :param options: argparse.Namespace: Pass the profiling options
+    :param command: str: Pass the name of the command, written to the metrics file
+    """
+    import cProfile
+    import json
+    from datetime import datetime
+
+    PROFILER.start(options.profile_memory)
+    PROFILER.add("startup", PROFILER._mark - STARTED)
+    profile = cProfile.Profile() if options.profile_cprofile else None
+    if profile:
+        profile.enable()
+    try:
+        with PROFILER.phase("execute"):
+            yield
+    finally:
+        if profile:
+            profile.disable()
+            profile.dump_stats(options.profile_cprofile)
+        report = PROFILER.stop()
+        print(format_report(report), file=sys.stderr)
+        if options.profile_metrics:
+            metrics = {"time": datetime.now().isoformat(timespec="seconds"), "command": command, **report}
+            with open(options.profile_metrics, "a", encoding="utf-8") as file:
+                file.write(json.dumps(metrics) + "\n")
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """
+    The format_report function formats the phases of a report as a table with the
+    milliseconds, the share of the total and the peak memory of every phase.
+
+    :param report: dict[str, Any]: Pass the report returned by Profiler.stop
+    """
+    total = report["total"] or 1.0
+    lines = [f"{'phase':<10} {'ms':>10} {'%':>6} {'peak, KiB':>10}"]
+    for name in PHASES + sorted(set(report["seconds"]) - set(PHASES)):
+        seconds = report["seconds"].get(name, 0.0)
+        peak = report["peaks"].get(name)
+        peak_text = f"{peak / 1024:>10.1f}" if peak is not None else f"{'-':>10}"
+        lines.append(f"{name:<10} {seconds * 1000:>10.2f} {seconds / total:>6.1%} {peak_text}")
+    lines.append(f"{'total':<10} {report['total'] * 1000:>10.2f}")
+    return "\n".join(lines)
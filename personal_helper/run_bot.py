@@ -6,327 +6,224 @@ Available commands:
 - change: Change contact or contact data. Usage: change -n <name> -p <phone> | -e <email> | -b <birthday>
 - del: Delete contact or contact data. Usage: del -n <name> -p <phone> | -e <email> | -b <birthday>
 - show: Display contact data. Usage: show -a all | show -a <name>
-- search: Search contacts by keywords. Usage: search -s <keyword>
+- search: Search contacts by keywords. Usage: search -s <keyword> | search -s <prefix> --prefix -k <number>
 - birth: Get contacts with birthdays in the next few days. Usage: birth -d <days>
+- whois: Find the contacts that own a phone number or email. Usage: whois -p <phone> | -e <email> | -d <domain>
+- migrate: Copy the contacts to another storage. Usage: migrate -t sqlite | migrate -t journal
 - sort: Sort files in a directory. Usage: sort -d <directory_path>
 - note: Perform operations on notes. 
     Usage: note -a <tag> -n <text_note> | note -f <tag> | note -t <old_tag> -r <new_tag> -n | note -s all | note -d <tag> | note -n <note> | note -r <replace>
+- serve: Keep the address book in memory and run the commands sent by pbotc. Usage: serve | serve -s <socket> -i <seconds>
+- batch: Run the commands of a file, one per line, with one load and one save. Usage: batch <file> | batch - -n <number>
 
 For more information about each command, use the -h option after the command name. Example: add -h
+To see where the time of a command goes, use --profile before it. Example: pbot --profile show -a all
 """
 
-import argparse
-from sys import argv
+from sys import argv, stdin
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable
+
+SESSION_COMMANDS = ["batch", "serve"]
 
 try:
-    from .constants import ADDRESSBOOK_COMMANDS, LIST_COMMANDS, INFO_MESSAGE
-    from .commands import (
-        add_contact,
-        add_phone_number_to_contact,
-        change_phone_number_contact,
-        add_email_to_contact,
-        change_email_contact,
-        add_birthday_to_contact,
-        delete_phone_number_contact,
-        delete_email_contact,
-        delete_contact,
-        print_contacts,
-        print_contact,
-        serch_contact,
-        run_sorting_files,
-        edit_note,
-        delete_note,
-        show_all_notes,
-        find_note,
-        add_note_to_data,
-        birthday_in_next_days,
+    from .parsers import COMMANDS, build_parsers, parse_arguments
+    from .profiling import PROFILER, split_profile_options, profiled
+    from .constants import (
+        ADDRESSBOOK_COMMANDS,
+        LIST_COMMANDS,
+        INFO_MESSAGE,
+        READ_COMMANDS,
+        SOCKET_FILE,
+        SERVER_FLUSH_INTERVAL,
+        STORAGE_RETRIES,
     )
-    from .utils import transformation_commands, get_close_command
+    from .utils import get_close_command
 
 except ImportError:
-    from constants import ADDRESSBOOK_COMMANDS, LIST_COMMANDS, INFO_MESSAGE
-    from commands import (
-        add_contact,
-        add_phone_number_to_contact,
-        change_phone_number_contact,
-        add_email_to_contact,
-        change_email_contact,
-        add_birthday_to_contact,
-        delete_phone_number_contact,
-        delete_email_contact,
-        delete_contact,
-        print_contacts,
-        print_contact,
-        serch_contact,
-        run_sorting_files,
-        edit_note,
-        delete_note,
-        show_all_notes,
-        find_note,
-        add_note_to_data,
-        birthday_in_next_days,
+    from parsers import COMMANDS, build_parsers, parse_arguments
+    from profiling import PROFILER, split_profile_options, profiled
+    from constants import (
+        ADDRESSBOOK_COMMANDS,
+        LIST_COMMANDS,
+        INFO_MESSAGE,
+        READ_COMMANDS,
+        SOCKET_FILE,
+        SERVER_FLUSH_INTERVAL,
+        STORAGE_RETRIES,
     )
-    from utils import transformation_commands, get_close_command
+    from utils import get_close_command
 
+if TYPE_CHECKING:
+    import argparse
 
-def add_parser(arguments: str) -> argparse.Namespace:
-    """
-    The add_parser function takes a string of arguments and returns an argparse.Namespace object.
-    The function uses the argparse module to create a parser for the add command, which is used
-    to create new contacts in the phonebook.
 
-    :param arguments: str: Pass the arguments to the function
+@PROFILER.timed("import")
+def import_subsystem(name: str) -> ModuleType:
     """
+    The import_subsystem function imports a module of the package when a command needs it.
+    The commands module, with the address book and its storage, the note commands and the
+    server are imported only by the commands that use them, so pbot -h or a note command
+    starts without loading the address book.
 
-    usage_info = "\nadd -h\nadd -n <name> -p <phone>"
-    parser = argparse.ArgumentParser(
-        prog="add", description="Create new contact", usage=usage_info
-    )
-    parser.add_argument("-n", dest="name", help="Contact name")
-    parser.add_argument("-p", dest="phone", help="Number of phone")
-    args = parser.parse_args(arguments.split())
-    return args
-
+    The module is imported with __import__, as by an import statement, so that it is listed
+    by python -X importtime. With --profile the import is measured as the import phase, so
+    the time of loading a subsystem is not counted in the execute phase of the command.
 
-def change_parser(arguments: str) -> argparse.Namespace:
+    :param name: str: Specify the name of the module, such as commands or server
     """
-    The change_parser function takes a string of arguments and returns an argparse.Namespace object with the following attributes:
-        - name: The contact's name (str)
-        - phone: A phone number (str)
-        - email: An email address (str)
-        - birthday: A date of birth in format dd-mm-yyyy (str)
+    if __package__:
+        return getattr(__import__(__package__, fromlist=[name]), name)
+    return __import__(name)
 
-    :param arguments: str: Pass the command line arguments to the function
-    """
-    usage_info = "\nchange -h\nchange -n <name> -p <phone> -e\nchange -n <name> -p <phone> -r <phone>\nchange -n <name> -e <email>\nchange -n <name> -e <emeil> -r <emeil>\nchange -n <name> -b <birthday>"
-    parser = argparse.ArgumentParser(
-        prog="change", description="change contact or contact data", usage=usage_info
-    )
-    parser.add_argument("-n", dest="name", help="Contact name")
-    parser.add_argument("-p", dest="phone", help="Phone Number")
-    parser.add_argument("-e", dest="email", help="User Email")
-    parser.add_argument(
-        "-b", dest="birthday", help="Date of birth in format dd-mm-yyyy"
-    )
-    parser.add_argument(
-        "-r", dest="replace", help="This argument use only after -p or -e"
-    )
-    args = parser.parse_args(arguments.split())
-    return args
 
-
-def del_parser(arguments: str) -> argparse.Namespace:
+def command_parser(
+    user_command: str,
+) -> tuple[list[str] | str, "argparse.Namespace | None"]:
     """
-    The del_parser function takes a string of arguments and returns an argparse.Namespace object.
-    The function is used to parse the command line arguments for the del command.
+    The command_parser function takes a user command as an argument and returns the parsed arguments.
+    The arguments are parsed with the arguments of the command defined in parsers.COMMANDS.
 
-    :param arguments: str: Pass the command line arguments to the function
+    :param user_command: str: Store the user input
     """
 
-    usage_info = "\ndel -h\ndel -n <name>\ndel -n <name> -p <phone>\ndel -n <name> -e <emeil>\ndel-n <name> -b <birthday>"
-    parser = argparse.ArgumentParser(
-        prog="del", description="delete contact or contact data", usage=usage_info
-    )
-    parser.add_argument("-n", dest="name", help="Contact name")
-    parser.add_argument("-p", dest="phone", help="Phone Number")
-    parser.add_argument("-e", dest="email", help="User Email")
-    parser.add_argument(
-        "-b", dest="birthday", help="Date of birth in format dd-mm-yyyy"
-    )
-    args = parser.parse_args(arguments.split())
-    return args
+    command_elements = user_command.split(" ")
+    if len(command_elements) < 2:
+        arguments = None
+        return command_elements[0], arguments
 
+    arguments = user_command.split(" ", 1)[1]
+    if command_elements[0] not in LIST_COMMANDS:
+        temp_command: str | None = get_close_command(LIST_COMMANDS, command_elements[0])
+        if temp_command:
+            user_input = input(f"Did you mean command [{temp_command}]? y/n -> ")
+            if user_input == "y":
+                command_elements[0] = temp_command
+            else:
+                print(INFO_MESSAGE)
+                parsed_args = None
+                return command_elements[0], parsed_args
 
-def show_parser(arguments: str) -> argparse.Namespace:
-    """
-    The show_parser function takes a string of arguments and returns an argparse.Namespace object.
-    The function uses the argparse module to create a parser that can be used to parse the command line arguments for show.
-    The parser is created with prog='show', description='display contact data', and usage=usage_info, where usage_info is set to '\nshow -h\nshow -a all\nshow -a &lt;name&gt;'.  The add_argument method adds an argument named &quot;-a&quot; which has dest=&quot;show&quot;, help='Use show -a &lt;all&gt; or show -a &lt;name&gt;'
+    if command_elements[0] not in COMMANDS:
+        print(f"Command [{command_elements[0]}] is not found!")
+        return command_elements[0], None
+    return command_elements[0], parse_arguments(command_elements[0], arguments)
 
-    :param arguments: str: Pass the arguments that are entered by the user
-    """
 
-    usage_info = "\nshow -h\nshow -a all\nshow -a <name>"
-    parser = argparse.ArgumentParser(
-        prog="show", description="display contact data", usage=usage_info
-    )
-    parser.add_argument("-a", dest="show", help="Use show -a <all> or show -a <name>")
-    args = parser.parse_args(arguments.split())
-    return args
+def change_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
+    """
+    The change_handler function adds or replaces a phone number or an email of a contact,
+    or sets its birthday.
+    """
+    if arguments.phone and not arguments.replace:
+        commands.add_phone_number_to_contact(arguments.name, arguments.phone)
+    elif arguments.phone and arguments.replace:
+        commands.change_phone_number_contact(
+            arguments.name, arguments.replace, arguments.phone
+        )
+    elif arguments.email and not arguments.replace:
+        commands.add_email_to_contact(arguments.name, arguments.email)
+    elif arguments.email and arguments.replace:
+        commands.change_email_contact(arguments.name, arguments.replace, arguments.email)
+    elif arguments.birthday:
+        commands.add_birthday_to_contact(arguments.name, arguments.birthday)
 
 
-def search_parser(arguments: str) -> argparse.Namespace:
+def del_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
     """
-    The search_parser function takes in a string of arguments and parses them using the argparse module.
-    It returns an object containing the parsed arguments.
-
-    :param arguments: str: Pass the command line arguments to the function
+    The del_handler function deletes a phone number or an email of a contact, or the contact.
     """
+    if arguments.name and arguments.phone:
+        commands.delete_phone_number_contact(arguments.name, arguments.phone)
+    elif arguments.name and arguments.email:
+        commands.delete_email_contact(arguments.name, arguments.email)
+    elif arguments.name and not arguments.email and not arguments.phone:
+        commands.delete_contact(arguments.name)
 
-    usage_info = "\nsearch -h\nsearch -s <key_word>"
-    parser = argparse.ArgumentParser(
-        prog="search", description="search", usage=usage_info
-    )
-    parser.add_argument("-s", dest="search", help="Search by keywords -s <key word>")
-    args = parser.parse_args(arguments.split())
-    return args
 
-
-def birth_parser(arguments: str) -> argparse.Namespace:
+def show_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
     """
-    The birth_parser function takes a string of arguments and parses them using the argparse module.
-    The function returns an object containing the parsed arguments.
-
-    :param arguments: str: Pass in the command line arguments
+    The show_handler function prints all contacts or one contact.
     """
-
-    usage_info = "\nbirth -h\nbirth -d <days>"
-    parser = argparse.ArgumentParser(
-        prog="birth", description="birth", usage=usage_info
-    )
-    parser.add_argument("-d", dest="days", help="Range of days")
-    args = parser.parse_args(arguments.split())
-    return args
+    if arguments.show == "all":
+        commands.print_contacts()
+    elif arguments.show:
+        commands.print_contact(arguments.show)
 
 
-def sort_parser(arguments: str) -> argparse.Namespace:
+def search_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
     """
-    The sort_parser function takes in a string of arguments and returns an argparse.Namespace object.
-    The function uses the argparse module to parse the arguments, which are then returned as an object.
-
-    :param arguments: str: Pass in the arguments from the command line
+    The search_handler function prints the contacts found by a key word, the names
+    starting with it with --prefix, or the contacts with the most similar names with --fuzzy.
     """
-
-    usage_info = '\nsort -h\nsort -d sort -d <"Path">'
-    parser = argparse.ArgumentParser(prog="sort", description="sort", usage=usage_info)
-    parser.add_argument("-d", dest="directory", help="Path to directory")
-    args = parser.parse_args(arguments.split())
-    return args
+    if arguments.prefix:
+        commands.complete_contact_name(arguments.search, arguments.top)
+    elif arguments.fuzzy:
+        commands.fuzzy_search_contact(arguments.search, arguments.top)
+    else:
+        commands.serch_contact(arguments.search)
 
 
-def note_parser(arguments: str) -> argparse.Namespace:
+def whois_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
     """
-    The note_parser function takes a string of arguments and parses them into an argparse.Namespace object.
-    The function returns the Namespace object, which contains all the parsed arguments as attributes.
-
-    :param arguments: str: Pass in the arguments from the command line
+    The whois_handler function prints the owners of a phone number, an email or an email domain.
     """
-
-    usage_info = "\nnote -h\note -a <tag> -n <text note>\nnote -f <tag>\nnote -t <old_tag> -r <new_tag> -n\nnote -s all\nnote -d <tag>\nnote -n <note>\nnote -r <replace>"
-    parser = argparse.ArgumentParser(prog="note", description="note", usage=usage_info)
-    parser.add_argument("-a", dest="add", nargs="+", help="Add new note")
-    parser.add_argument("-f", dest="find", help="Find note")
-    parser.add_argument("-t", dest="tag", help="Tag")
-    parser.add_argument("-s", dest="show", help="Show all note")
-    parser.add_argument("-d", dest="delete", help="Delete notes")
-    parser.add_argument("-n", dest="note", type=str, nargs="+", help="Note text")
-    parser.add_argument("-r", dest="replace", nargs="+", help="New tag")
-    args = parser.parse_args(arguments.split())
-    if args.note:
-        string = ""
-        for element in args.note:
-            string += element + " "
-        args.note = string
-    return args
+    if arguments.phone:
+        commands.whois_phone_number(arguments.phone)
+    elif arguments.email:
+        commands.whois_email(arguments.email)
+    elif arguments.domain:
+        commands.whois_domain(arguments.domain)
 
 
-def command_parser(
-    user_command: str,
-) -> tuple[list[str] | str, argparse.Namespace | None]:
+def migrate_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
     """
-    The command_parser function takes a user command as an argument and returns the parsed arguments.
+    The migrate_handler function copies the contacts to the target storage.
+    """
+    if arguments.target:
+        commands.migrate_contact_book(arguments.target)
 
-    :param user_command: str: Store the user input
+
+def import_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
     """
+    The import_handler function adds the contacts of a CSV or JSON Lines file.
+    """
+    commands.import_contact_book(arguments.source, arguments.rejects, arguments.workers)
 
-    command_elements = user_command.split(" ")
-    if len(command_elements) < 2:
-        arguments = None
-        return command_elements[0], arguments
 
-    arguments = user_command.split(" ", 1)[1]
-    if command_elements[0] not in LIST_COMMANDS:
-        temp_command: str | None = get_close_command(
-            transformation_commands(LIST_COMMANDS, command_elements[0])
-        )
-        if temp_command:
-            user_input = input(f"Did you mean command [{temp_command}]? y/n -> ")
-            if user_input == "y":
-                command_elements[0] = temp_command
-            else:
-                print(INFO_MESSAGE)
-                parsed_args = None
-                return command_elements[0], parsed_args
+def export_handler(commands: ModuleType, arguments: "argparse.Namespace") -> None:
+    """
+    The export_handler function writes the contacts to a file in the format.
+    """
+    if arguments.format:
+        commands.export_contact_book(arguments.format, arguments.output)
 
-    if command_elements[0] == "add":
-        parsed_args = add_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "change":
-        parsed_args = change_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "del":
-        parsed_args = del_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "show":
-        parsed_args = show_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "search":
-        parsed_args = search_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "birth":
-        parsed_args = birth_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "sort":
-        parsed_args = sort_parser(arguments)
-        return command_elements[0], parsed_args
-    elif command_elements[0] == "note":
-        parsed_args = note_parser(arguments)
-        return command_elements[0], parsed_args
-    else:
-        print(f"Command [{command_elements[0]}] is not found!")
+
+ADDRESSBOOK_HANDLERS: dict[str, Callable[[ModuleType, Any], None]] = {
+    "add": lambda commands, arguments: commands.add_contact(arguments.name, arguments.phone),
+    "change": change_handler,
+    "del": del_handler,
+    "show": show_handler,
+    "search": search_handler,
+    "birth": lambda commands, arguments: commands.birthday_in_next_days(arguments.days),
+    "whois": whois_handler,
+    "migrate": migrate_handler,
+    "import": import_handler,
+    "export": export_handler,
+}
 
 
-def addressbook_controller(command: str | list, arguments: argparse.Namespace) -> None:
+def addressbook_controller(command: str | list, arguments: "argparse.Namespace") -> None:
     """
     The addressbook_controller function is the main function of this program.
-    It takes a command and arguments as input, and then calls the appropriate functions to perform that command.
+    It takes a command and arguments as input, and then calls the handler of the command
+    from ADDRESSBOOK_HANDLERS to perform it.
 
     :param command: str | list: Determine which command was used
     :param arguments: argparse.Namespace: Get the arguments from the command line
     """
-
-    if command == "add":
-        add_contact(arguments.name, arguments.phone)
-    elif command == "change":
-        if arguments.phone and not arguments.replace:
-            add_phone_number_to_contact(arguments.name, arguments.phone)
-        elif arguments.phone and arguments.replace:
-            change_phone_number_contact(
-                arguments.name, arguments.replace, arguments.phone
-            )
-        elif arguments.email and not arguments.replace:
-            add_email_to_contact(arguments.name, arguments.email)
-        elif arguments.email and arguments.replace:
-            change_email_contact(arguments.name, arguments.replace, arguments.email)
-        elif arguments.birthday:
-            add_birthday_to_contact(arguments.name, arguments.birthday)
-    elif command == "del":
-        if arguments.name and arguments.phone:
-            delete_phone_number_contact(arguments.name, arguments.phone)
-        elif arguments.name and arguments.email:
-            delete_email_contact(arguments.name, arguments.email)
-        elif arguments.name and not arguments.email and not arguments.phone:
-            delete_contact(arguments.name)
-    elif command == "show":
-        if arguments.show == "all":
-            print_contacts()
-        elif arguments.show:
-            print_contact(arguments.show)
-    elif command == "search":
-        serch_contact(arguments.search)
-
-    elif command == "birth":
-        birthday_in_next_days(arguments.days)
+    commands = import_subsystem("commands")
+    ADDRESSBOOK_HANDLERS[command](commands, arguments)
 
 
 def sort_controller(arguments: str) -> None:
@@ -337,10 +234,11 @@ def sort_controller(arguments: str) -> None:
 
     :param arguments: str: Get the arguments from the command line
     """
-    run_sorting_files(arguments)
+    commands = import_subsystem("commands")
+    commands.run_sorting_files(arguments)
 
 
-def note_controller(arguments: argparse.Namespace) -> None:
+def note_controller(arguments: "argparse.Namespace") -> None:
     """
     The note_controller function is the main function that controls all of the note-related commands.
     It takes in a Namespace object from argparse, which contains all of the arguments passed into it.
@@ -349,41 +247,188 @@ def note_controller(arguments: argparse.Namespace) -> None:
 
     :param arguments: argparse.Namespace: Pass the arguments from the command line to this function
     """
+    note_commands = import_subsystem("note_commands")
     if arguments.tag and arguments.replace and arguments.note:
-        edit_note(arguments.tag, arguments.replace, arguments.note)
+        note_commands.edit_note(arguments.tag, arguments.replace, arguments.note)
     elif arguments.add and arguments.note:
         print(arguments.add)
-        add_note_to_data(arguments.add, arguments.note)
+        note_commands.add_note_to_data(arguments.add, arguments.note)
     elif arguments.show == "all":
-        show_all_notes()
+        note_commands.show_all_notes()
     elif arguments.delete:
-        delete_note(arguments.delete)
+        note_commands.delete_note(arguments.delete)
     elif arguments.find:
-        find_note(arguments.find)
+        note_commands.find_note(arguments.find)
 
 
-def main() -> None:
+def batch_controller(arguments: "argparse.Namespace") -> None:
     """
-    The main function of the program.
+    The batch_controller function runs the commands of a file, or of the standard input for -,
+    one command per line in the usual syntax. Empty lines and lines starting with # are skipped.
+    The address book and the notes are loaded once and saved at the end, or every
+    arguments.every commands. A command that fails is reported and the run goes on.
+
+    :param arguments: argparse.Namespace: Get the source of the commands and how often to save
     """
-    user_command = " ".join(argv[1:])
-    if not user_command or user_command == "-h":
-        print(INFO_MESSAGE)
-        return
+    session = import_subsystem("session")
+
+    if arguments.source == "-":
+        lines = stdin
+    else:
+        try:
+            lines = open(arguments.source, encoding="utf-8")
+        except OSError as error:
+            print(f"The file '{arguments.source}' can't be read: {error.strerror}")
+            return
+
+    executed = failed = 0
+    session.SESSION.open(run_batch_command)
+    try:
+        for number, line in enumerate(lines, 1):
+            user_command = line.strip()
+            if not user_command or user_command.startswith("#"):
+                continue
+
+            executed += 1
+            if not run_batch_command(user_command):
+                failed += 1
+                print(f"Line {number} failed: {user_command}")
+            if arguments.every and executed % arguments.every == 0:
+                session.SESSION.flush()
+    finally:
+        session.SESSION.close()
+        if lines is not stdin:
+            lines.close()
+
+    print(f"{executed} commands executed, {failed} failed.")
+
+
+def run_batch_command(user_command: str) -> bool:
+    """
+    The run_batch_command function runs one command of a batch and returns whether it succeeded.
+    The errors that end a single command, such as the exit of the validators, are caught here.
+
+    :param user_command: str: Pass the command line to run
+    """
+    session = import_subsystem("session")
+    command = user_command.split(" ")[0]
+    if command not in LIST_COMMANDS or command in SESSION_COMMANDS:
+        print(f"Command [{command}] can't be used in a batch!")
+        return False
+
+    if session.SESSION.active and command in ADDRESSBOOK_COMMANDS and command not in READ_COMMANDS:
+        session.SESSION.commands.append(user_command)
+    try:
+        return run_command(user_command)
+    except SystemExit as error:
+        return not error.code
+    except Exception as error:
+        print(f"{type(error).__name__}: {error}")
+        return False
+
+
+def is_read_command(user_command: str) -> bool:
+    """
+    The is_read_command function checks if a command only reads the address book and the notes,
+    so the server can run it at the same time as other reads.
+
+    :param user_command: str: Pass the command line to check
+    """
+    return user_command.split(" ")[0] in READ_COMMANDS
+
 
-    command, arguments = command_parser(user_command)
+def serve_controller(arguments: "argparse.Namespace | None") -> None:
+    """
+    The serve_controller function builds the parsers of all commands and runs the server,
+    which then parses every command sent to it with the same parsers.
+
+    :param arguments: argparse.Namespace | None: Get the arguments from the command line
+    """
+    server = import_subsystem("server")
+    build_parsers()
+    server.serve(run_batch_command, is_read_command, *serve_arguments(arguments))
+
+
+CONTROLLERS: dict[str, Callable[[Any], None]] = {
+    "sort": lambda arguments: sort_controller(arguments.directory),
+    "note": note_controller,
+    "batch": batch_controller,
+    "serve": serve_controller,
+}
+
+
+def run_command(user_command: str) -> bool:
+    """
+    The run_command function parses one command and calls its controller from CONTROLLERS.
+    It returns False if the command is invalid or used without arguments.
+
+    :param user_command: str: Pass the command line to run
+    """
+    with PROFILER.phase("parse"):
+        command, arguments = command_parser(user_command)
 
     if command in ADDRESSBOOK_COMMANDS and arguments:
-        addressbook_controller(command, arguments)
-    elif command == "sort" and arguments:
-        sort_controller(arguments.directory)
-    elif command == "note" and arguments:
-        note_controller(arguments)
-    else:
+        return retry_on_conflict(addressbook_controller, command, arguments)
+    controller = CONTROLLERS.get(command)
+    if controller is None or not (arguments or command == "serve"):
         print(
             f"Command *{command}* invalid or used without arguments! Try again or use help."
         )
         print(INFO_MESSAGE)
+        return False
+    controller(arguments)
+    return True
+
+
+def retry_on_conflict(controller: Callable[..., None], *args: Any) -> bool:
+    """
+    The retry_on_conflict function calls a controller of the address book and calls it again
+    with a freshly loaded address book when another process saved changes to the same contacts
+    in the meantime. It returns False if the changes could not be saved after STORAGE_RETRIES tries.
+
+    :param controller: Callable[..., None]: Pass the controller to call
+    :param *args: Any: Pass the arguments of the controller
+    """
+    storage = import_subsystem("storage")
+    for _ in range(STORAGE_RETRIES):
+        try:
+            controller(*args)
+            return True
+        except storage.ConflictError as error:
+            conflict = error
+    print(f"{conflict} Try again.")
+    return False
+
+
+def serve_arguments(arguments: "argparse.Namespace | None") -> tuple[str, float]:
+    """
+    The serve_arguments function returns the socket path and the flush interval of the serve
+    command, with the defaults when serve is used without arguments.
+
+    :param arguments: argparse.Namespace | None: Get the arguments from the command line
+    """
+    if arguments is None:
+        return SOCKET_FILE, SERVER_FLUSH_INTERVAL
+    return arguments.socket, arguments.interval
+
+
+def main() -> None:
+    """
+    The main function of the program.
+    With the profiling options before the command, such as pbot --profile show -a all,
+    the time of every phase of the command is printed to the standard error.
+    """
+    options, args = split_profile_options(argv[1:])
+    user_command = " ".join(args)
+    if not user_command or user_command == "-h":
+        print(INFO_MESSAGE)
+        return
+
+    if options is None:
+        run_command(user_command)
+        return
+    with profiled(options, args[0]):
+        run_command(user_command)
 
 
 if __name__ == "__main__":
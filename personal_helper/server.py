@@ -0,0 +1,303 @@
+"""
+The server module keeps the address book and the notes in memory between commands.
+
+This module defines the following classes:
+    - ReadWriteLock: An asyncio lock that admits many readers or one writer.
+    - ThreadLocalStdout: A stdout that sends the output of every thread to its own buffer.
+    - Server: Runs the commands received over a Unix domain socket.
+
+This module defines the following functions:
+    - serve: Runs the server on a Unix domain socket until it is stopped.
+    - capture_output: Runs a command and returns whether it succeeded and what it printed.
+
+The protocol is one JSON object per line in both directions. A request is
+{"command": "<command line>"} in the usual syntax, and the response is
+{"ok": <bool>, "output": "<printed text>"}. The connections are served by an asyncio event
+loop and the commands run in a thread pool: the commands that only read the address book and
+the notes run at the same time, the others run alone. The changes are written to the files
+every SERVER_FLUSH_INTERVAL seconds and when the server stops.
+"""
+
+import asyncio
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, TextIO
+
+try:
+    from .constants import SOCKET_FILE, SERVER_FLUSH_INTERVAL, SERVER_WORKERS
+    from .commands import SESSION, load_contact_book, load_notes
+except ImportError:
+    from constants import SOCKET_FILE, SERVER_FLUSH_INTERVAL, SERVER_WORKERS
+    from commands import SESSION, load_contact_book, load_notes
+
+
+class ReadWriteLock:
+    """
+    ReadWriteLock lets any number of readers or a single writer in at a time.
+
+    A waiting writer keeps new readers out, so a steady stream of reads does not starve
+    the writes.
+
+    Methods:
+        reading: Holds the lock as a reader for the body of an async with block.
+
+        writing: Holds the lock as the writer for the body of an async with block.
+    """
+
+    def __init__(self) -> None:
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @asynccontextmanager
+    async def reading(self) -> AsyncIterator[None]:
+        """
+        Holds the lock as one of the readers.
+        """
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._writer and not self._waiting_writers
+            )
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @asynccontextmanager
+    async def writing(self) -> AsyncIterator[None]:
+        """
+        Holds the lock as the only writer, with no readers.
+        """
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._writer and not self._readers
+                )
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class ThreadLocalStdout(io.TextIOBase):
+    """
+    ThreadLocalStdout is installed as sys.stdout while the server runs. A thread that set a
+    buffer with capture gets its output written there, the other threads write to the
+    original stdout. This lets the commands print their results while running side by side.
+    """
+
+    def __init__(self, stdout: TextIO) -> None:
+        super().__init__()
+        self.stdout = stdout
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self.stdout).write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self.stdout.flush()
+
+    def capture(self, buffer: io.StringIO | None) -> None:
+        """
+        Sends the output of the current thread to the buffer, or back to stdout for None.
+        """
+        self._local.buffer = buffer
+
+
+def capture_output(run_command: Callable[[str], bool], command: str) -> dict[str, Any]:
+    """
+    The capture_output function runs one command and returns whether it succeeded together
+    with everything it printed. It is called in a thread of the pool of the server.
+
+    :param run_command: Callable[[str], bool]: Run a command line and tell if it succeeded
+    :param command: str: Pass the command line to run
+    """
+    output = io.StringIO()
+    stdout = sys.stdout
+    if isinstance(stdout, ThreadLocalStdout):
+        stdout.capture(output)
+        try:
+            ok = run_command(command)
+        finally:
+            stdout.capture(None)
+    else:
+        sys.stdout = output
+        try:
+            ok = run_command(command)
+        finally:
+            sys.stdout = stdout
+    return {"ok": ok, "output": output.getvalue()}
+
+
+class Server:
+    """
+    Server runs the commands received over a Unix domain socket.
+
+    Every command runs in the thread pool, so printing a large table does not hold up the
+    event loop. The commands for which is_read is true share the lock of the address book,
+    the other commands and the flushes of the session hold it alone.
+
+    Methods:
+        execute: Runs one command under the lock and returns the response.
+
+        start: Starts listening on the socket.
+
+        flush_periodically: Calls flush every interval seconds.
+
+        run: Serves the socket until SIGINT or SIGTERM.
+    """
+
+    def __init__(
+        self,
+        run_command: Callable[[str], bool],
+        is_read: Callable[[str], bool],
+        flush: Callable[[], None] = SESSION.flush,
+        workers: int = SERVER_WORKERS,
+    ) -> None:
+        self.run_command = run_command
+        self.is_read = is_read
+        self.flush = flush
+        self.executor = ThreadPoolExecutor(workers)
+        self.lock = ReadWriteLock()
+
+    async def execute(self, command: str) -> dict[str, Any]:
+        """
+        Runs one command in the thread pool, as a reader or as the writer.
+        """
+        lock = self.lock.reading() if self.is_read(command) else self.lock.writing()
+        loop = asyncio.get_running_loop()
+        async with lock:
+            return await loop.run_in_executor(
+                self.executor, capture_output, self.run_command, command
+            )
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Reads the requests of one connection line by line and writes a response line for
+        every request. A connection may send any number of requests.
+        """
+        try:
+            while line := await reader.readline():
+                try:
+                    command = json.loads(line)["command"]
+                    if not isinstance(command, str):
+                        raise TypeError
+                except (ValueError, KeyError, TypeError):
+                    response = {"ok": False, "output": "Invalid request.\n"}
+                else:
+                    response = await self.execute(command)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, socket_path: str) -> asyncio.AbstractServer:
+        """
+        Starts listening on the socket and returns the asyncio server.
+        """
+        return await asyncio.start_unix_server(self.handle, socket_path)
+
+    async def flush_periodically(self, interval: float) -> None:
+        """
+        Calls flush as the writer every interval seconds until the task is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            async with self.lock.writing():
+                await loop.run_in_executor(self.executor, self.flush)
+
+    async def run(self, socket_path: str, flush_interval: float) -> None:
+        """
+        Serves the socket until SIGINT or SIGTERM, then flushes once more.
+        """
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        server = await self.start(socket_path)
+        flusher = asyncio.create_task(self.flush_periodically(flush_interval))
+        print(f"The server is listening on {socket_path}")
+        try:
+            await stop.wait()
+        finally:
+            flusher.cancel()
+            server.close()
+            await server.wait_closed()
+            async with self.lock.writing():
+                await loop.run_in_executor(self.executor, self.flush)
+            self.executor.shutdown()
+
+
+def server_is_running(socket_path: str) -> bool:
+    """
+    The server_is_running function checks if a server accepts connections on the socket.
+
+    :param socket_path: str: Specify the path of the socket
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def serve(
+    run_command: Callable[[str], bool],
+    is_read: Callable[[str], bool],
+    socket_path: str = SOCKET_FILE,
+    flush_interval: float = SERVER_FLUSH_INTERVAL,
+) -> None:
+    """
+    The serve function runs the server on a Unix domain socket until it gets SIGINT or SIGTERM.
+    The address book and the notes are loaded at the start and kept in memory, and the
+    changes are written to the files every flush_interval seconds and on shutdown.
+
+    :param run_command: Callable[[str], bool]: Run a command line and tell if it succeeded
+    :param is_read: Callable[[str], bool]: Tell if a command line only reads the data
+    :param socket_path: str: Specify the path of the socket
+    :param flush_interval: float: Specify the number of seconds between the writes
+    """
+    if os.path.exists(socket_path):
+        if server_is_running(socket_path):
+            print(f"The server is already running on {socket_path}")
+            return
+        os.remove(socket_path)
+
+    SESSION.open(run_command)
+    load_contact_book()
+    load_notes()
+    stdout = sys.stdout
+    sys.stdout = ThreadLocalStdout(stdout)
+    try:
+        asyncio.run(Server(run_command, is_read).run(socket_path, flush_interval))
+    finally:
+        sys.stdout = stdout
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        SESSION.close()
+        print("The server has been stopped.")
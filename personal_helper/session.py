@@ -0,0 +1,124 @@
+"""
+The session module keeps the address book and the notes in memory for many commands.
+
+This module defines the following classes:
+    - Session: The address book and the notes shared by the commands of a batch or a server.
+
+SESSION is the session of the process. It is used by the commands of the address book and
+by the note commands, and it does not import the address book itself, so the note commands
+start without loading the modules of the address book and of its storage.
+"""
+
+import io
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING, Any, Callable
+
+try:
+    from .constants import STORAGE_RETRIES
+    from .profiling import PROFILER
+except ImportError:
+    from constants import STORAGE_RETRIES
+    from profiling import PROFILER
+
+if TYPE_CHECKING:
+    from .address_book import AddressBook as AB
+    from .notes import Notes
+
+
+class Session:
+    """
+    Session keeps one address book and one Notes instance in memory for many commands.
+
+    While a session is open, load_contact_book and load_notes return the instances of the
+    session, loaded on first use, and save_contact_book and save_notes only mark them as
+    changed. The changes are written to the files by flush and by close.
+
+    The session remembers the commands that changed the address book since the last flush.
+    If another process saved changes to the same contacts in the meantime, flush loads the
+    address book again, runs these commands once more with replay and retries the save.
+
+    Methods:
+        open: Starts keeping the address book and the notes in memory.
+
+        flush: Writes the changed address book and notes to their files.
+
+        close: Flushes the changes and ends the session.
+    """
+
+    def __init__(self) -> None:
+        self.active = False
+        self.replay: Callable[[str], Any] | None = None
+        self.commands: list[str] = []
+        self.addressbook: "AB | None" = None
+        self.notes: "Notes | None" = None
+        self.addressbook_changed = False
+        self.notes_changed = False
+
+    def open(self, replay: Callable[[str], Any] | None = None) -> None:
+        """
+        Starts keeping the address book and the notes in memory. The replay callable runs
+        a command line again after a conflict.
+        """
+        self.active = True
+        self.replay = replay
+
+    @PROFILER.timed("persist")
+    def flush(self) -> None:
+        """
+        Writes the address book and the notes to their files if they were changed.
+        """
+        if self.addressbook_changed:
+            self._save_addressbook()
+        if self.notes_changed:
+            self.notes.save()
+            self.notes_changed = False
+
+    def _save_addressbook(self) -> None:
+        """
+        Saves the address book, replaying the commands of the session on a freshly loaded
+        address book while the save conflicts with the changes of another process. The
+        snapshot file of the address book that is replaced is closed.
+        The address book of the session was loaded from the storage of the commands module,
+        so the module is already imported here.
+        """
+        try:
+            from .commands import STORAGE
+            from .storage import ConflictError
+        except ImportError:
+            from commands import STORAGE
+            from storage import ConflictError
+
+        for _ in range(STORAGE_RETRIES):
+            try:
+                STORAGE.save(self.addressbook)
+                break
+            except ConflictError as error:
+                conflict = error
+                commands, self.commands = self.commands, []
+                self.addressbook.close()
+                self.addressbook = STORAGE.load()
+                if self.replay is None or not commands:
+                    print(f"{conflict} The changes of the session to them were not saved.")
+                    break
+                with redirect_stdout(io.StringIO()):
+                    for command in commands:
+                        self.replay(command)
+        else:
+            print(f"{conflict} The changes of the session to them were not saved.")
+            self.addressbook.close()
+            self.addressbook = STORAGE.load()
+        self.commands = []
+        self.addressbook_changed = False
+
+    def close(self) -> None:
+        """
+        Writes the changes to the files, closes the snapshot file of the address book and
+        ends the session.
+        """
+        self.flush()
+        if self.addressbook is not None:
+            self.addressbook.close()
+        self.__init__()
+
+
+SESSION = Session()
@@ -0,0 +1,259 @@
+"""
+The snapshot module provides the indexed file format of the address book.
+
+This module defines the following classes:
+    - LazyRecords: A mapping of contact names to records that reads a record on first access.
+
+This module defines the following functions:
+    - write_snapshot: Writes the records to a file together with a directory of their offsets.
+    - read_snapshot: Opens a file written by write_snapshot or by an earlier version.
+    - read_generation: Returns the generation of a snapshot file from its header.
+
+A snapshot starts with a header holding a magic value, the offset of the directory and the
+generation, the number of the last commit included in the snapshot. The
+header is followed by the pickled records, one after another, then by the pickled sections,
+such as the phone numbers and the emails of every contact, and the directory at the end of the file is the
+pickled list of the contact names, the array of the offsets of their records and the offsets
+of the sections by name. Opening a snapshot reads only the header and the directory; a record
+is read from its offset and unpickled when it is accessed for the first time, and a section
+when it is asked for, so an index over the whole book is built without unpickling the records.
+"""
+
+import pickle
+import struct
+import threading
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Mapping
+
+SNAPSHOT_MAGIC = b"PBOTSNP2"
+SNAPSHOT_HEADER = struct.Struct("<8sQQ")
+
+
+class LazyRecords(MutableMapping):
+    """
+    LazyRecords maps the contact names of a snapshot to their records.
+
+    The names and the offsets of the records are known from the directory of the snapshot,
+    the records themselves are unpickled on first access and then kept in memory. Records set
+    after opening are kept in memory too and hide the ones in the file. The file stays open
+    for as long as the mapping is used, until close is called or the with block of the
+    mapping ends. A record is read and kept under a lock, so the threads that access the
+    same record for the first time at once get the same record, loaded once.
+
+    Attributes:
+        on_load (Callable | None): Called with every record read from the file.
+        generation (int): The generation of the snapshot.
+
+    Methods:
+        peek: Returns a record without keeping it in memory if it was never read.
+
+        encoded: Returns the pickled record, copied from the file if it was never read.
+
+        loaded: Returns the records kept in memory.
+
+        section: Returns a section of the snapshot.
+
+        close: Closes the snapshot file.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        names: list[str],
+        offsets: array,
+        generation: int = 0,
+        sections: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        self.on_load: Callable[[Any], None] | None = None
+        self.generation = generation
+        self._file = file
+        self._file_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._offsets = offsets
+        self._sections = sections or {}
+        self._positions = dict(zip(names, range(len(names))))
+        self._records: dict[str, Any] = {}
+        self._added = 0
+
+    def __len__(self) -> int:
+        return len(self._positions) + self._added
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._records or name in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._positions
+        for name in self._records:
+            if name not in self._positions:
+                yield name
+
+    def __getitem__(self, name: str) -> Any:
+        record = self._records.get(name)
+        if record is not None:
+            return record
+        with self._load_lock:
+            record = self._records.get(name)
+            if record is None:
+                record = pickle.loads(self._read(self._positions[name]))
+                if self.on_load is not None:
+                    self.on_load(record)
+                self._records[name] = record
+        return record
+
+    def __setitem__(self, name: str, record: Any) -> None:
+        if name not in self:
+            self._added += 1
+        self._records[name] = record
+
+    def __delitem__(self, name: str) -> None:
+        if name in self._positions:
+            del self._positions[name]
+            self._records.pop(name, None)
+        else:
+            del self._records[name]
+            self._added -= 1
+
+    def peek(self, name: str) -> Any:
+        """
+        Returns the record. A record that was never read is unpickled from the file
+        without keeping it, so reading every record once does not fill the memory.
+        """
+        if name in self._records:
+            return self._records[name]
+        return pickle.loads(self._read(self._positions[name]))
+
+    def encoded(self, name: str) -> bytes:
+        """
+        Returns the pickled record. A record that was never read is copied from the file
+        as it is, without unpickling it.
+        """
+        if name in self._records:
+            return pickle.dumps(self._records[name])
+        return self._read(self._positions[name])
+
+    def loaded(self) -> dict[str, Any]:
+        """
+        Returns the records kept in memory by name: those read from the file and those set
+        after opening. They may differ from the file, which holds the rest unchanged.
+        """
+        return self._records
+
+    def section(self, name: str) -> Any:
+        """
+        Returns the unpickled section of the snapshot with the given name, or None if the
+        snapshot has no such section. The section is read from the file at every call.
+        """
+        if name not in self._sections:
+            return None
+        return pickle.loads(self._read_range(*self._sections[name]))
+
+    def close(self) -> None:
+        """
+        Closes the snapshot file. The records that were not read yet are no longer available.
+        """
+        self._file.close()
+
+    def __enter__(self) -> "LazyRecords":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _read(self, position: int) -> bytes:
+        """
+        Reads the pickled record at the given position of the directory from the file.
+        """
+        return self._read_range(self._offsets[position], self._offsets[position + 1])
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        """
+        Reads the bytes from start to end from the file.
+        The lock keeps the seek and the read of one thread together.
+        """
+        with self._file_lock:
+            self._file.seek(start)
+            return self._file.read(end - start)
+
+
+def write_snapshot(
+    file_name: str,
+    names: Iterable[str],
+    records: Mapping[str, Any],
+    generation: int = 0,
+    sections: Mapping[str, Any] | None = None,
+) -> None:
+    """
+    Writes the records with the given names to a snapshot file in the order of the names,
+    followed by the sections, each pickled on its own so it can be read without the others.
+    """
+    def encode(name: str) -> bytes:
+        return pickle.dumps(records[name])
+
+    if isinstance(records, LazyRecords):
+        encode = records.encoded
+
+    written_names = []
+    offsets = array("Q")
+    with open(file_name, "wb") as file:
+        file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0, generation))
+        for name in names:
+            written_names.append(name)
+            offsets.append(file.tell())
+            file.write(encode(name))
+        offsets.append(file.tell())
+
+        section_offsets = {}
+        for section_name, section in (sections or {}).items():
+            start = file.tell()
+            pickle.dump(section, file)
+            section_offsets[section_name] = (start, file.tell())
+
+        directory_offset = file.tell()
+        pickle.dump((written_names, offsets, section_offsets), file)
+        file.seek(0)
+        file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, directory_offset, generation))
+
+
+def read_snapshot(file_name: str) -> LazyRecords | Any:
+    """
+    Opens a snapshot file and returns its LazyRecords, which keep the file open until they
+    are closed. A file written by an earlier version, which holds a single pickled mapping of
+    the records, is unpickled, closed and returned as it is.
+    """
+    file = open(file_name, "rb")
+    try:
+        header = _read_header(file)
+        if header is not None:
+            directory_offset, generation = header
+            file.seek(directory_offset)
+            names, offsets, sections = pickle.load(file)
+            return LazyRecords(file, names, offsets, generation, sections)
+        file.seek(0)
+        content = pickle.load(file)
+    except BaseException:
+        file.close()
+        raise
+    file.close()
+    return content
+
+
+def read_generation(file_name: str) -> int:
+    """
+    Returns the generation of a snapshot file, 0 for the files of the earlier versions.
+    """
+    with open(file_name, "rb") as file:
+        header = _read_header(file)
+    return header[1] if header is not None else 0
+
+
+def _read_header(file: BinaryIO) -> tuple[int, int] | None:
+    """
+    Returns the directory offset and the generation from the header of a snapshot file,
+    or None if the file is not a snapshot.
+    """
+    header = file.read(SNAPSHOT_HEADER.size)
+    if header.startswith(SNAPSHOT_MAGIC) and len(header) == SNAPSHOT_HEADER.size:
+        _, directory_offset, generation = SNAPSHOT_HEADER.unpack(header)
+        return directory_offset, generation
+    return None
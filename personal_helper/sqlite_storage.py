@@ -0,0 +1,469 @@
+"""
+The sqlite_storage module provides a SQLite backend for the address book.
+
+This module defines the following classes:
+    - SQLiteAddressBook: An address book that keeps its contacts in a SQLite database.
+    - SQLiteStorage: The storage that opens and commits a SQLiteAddressBook.
+
+The contacts are stored in normalized users, phones and emails tables with indexes on the
+casefolded name, the phone digits, the email, the email domain and the birthday. Lookups,
+searches and birthday queries run as SQL queries and only the Record objects of their
+results are built.
+"""
+
+import sqlite3
+from datetime import date
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+try:
+    from .address_book import Record, AddressBook as AB
+    from .entities import Phone, User, Email
+    from .indexes import NameIndex, FuzzyIndex, PhoneDirectory, EmailDomainIndex, BirthdayCalendar
+except ImportError:
+    from address_book import Record, AddressBook as AB
+    from entities import Phone, User, Email
+    from indexes import NameIndex, FuzzyIndex, PhoneDirectory, EmailDomainIndex, BirthdayCalendar
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    name TEXT PRIMARY KEY,
+    name_key TEXT NOT NULL,
+    birthday TEXT,
+    birthday_bucket INTEGER
+);
+CREATE INDEX IF NOT EXISTS users_name_key ON users (name_key);
+CREATE INDEX IF NOT EXISTS users_birthday_bucket ON users (birthday_bucket);
+
+CREATE TABLE IF NOT EXISTS phones (
+    user_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    phone TEXT NOT NULL,
+    digits TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS phones_user_name ON phones (user_name);
+CREATE INDEX IF NOT EXISTS phones_digits ON phones (digits);
+
+CREATE TABLE IF NOT EXISTS emails (
+    user_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL,
+    domain TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS emails_user_name ON emails (user_name);
+CREATE INDEX IF NOT EXISTS emails_email_key ON emails (email_key);
+CREATE INDEX IF NOT EXISTS emails_domain ON emails (domain);
+"""
+
+SQL_VARIABLES_LIMIT = 500
+
+
+class SQLiteAddressBook(AB):
+    """
+    SQLiteAddressBook is an AddressBook whose contacts live in a SQLite database.
+
+    Every change is written to the database as soon as it happens, in the open transaction
+    of the connection, and SQLiteStorage.save commits it. The records that were read are
+    kept in self.data, so a contact read twice is the same Record object and its changes
+    reach the database through record_changed.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        super().__init__()
+        self.connection = connection
+
+    def __contains__(self, name: object) -> bool:
+        if name in self.data:
+            return True
+        row = self.connection.execute(
+            "SELECT 1 FROM users WHERE name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self.connection.execute("SELECT name FROM users ORDER BY name")
+        return (name for (name,) in rows)
+
+    def __getitem__(self, name: str) -> Record:
+        if name not in self.data:
+            records = self._read_records([name])
+            if not records:
+                raise KeyError(name)
+        return self.data[name]
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        old_record = self.data.get(name)
+        if old_record is not None and old_record is not record and old_record._book is self:
+            old_record._book = None
+        self.data[name] = record
+        if record._book is None:
+            record._book = self
+        self._write_record(name, record)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        record = self.data.pop(name, None)
+        if record is not None and record._book is self:
+            record._book = None
+        for table, column in (("users", "name"), ("phones", "user_name"), ("emails", "user_name")):
+            self.connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+    def values(self) -> List[Record]:
+        """
+        Returns all records of the address book in name order, read with one query per table.
+        """
+        return self._read_records()
+
+    def items(self) -> List[tuple[str, Record]]:
+        """
+        Returns the (name, record) pairs of the address book in name order.
+        """
+        return [(record.user.name, record) for record in self._read_records()]
+
+    def get_contact(self, name: str) -> Record:
+        """Returns the contact record for the given name."""
+        return self[name]
+
+    def record_changed(self, record: Record) -> None:
+        """
+        Writes the record to the database after its data was changed.
+        """
+        name = record.user.name
+        if self.data.get(name) is record:
+            self._write_record(name, record)
+
+    def pop_changes(self) -> dict[str, Record | None]:
+        """
+        Returns no changes: every change is already written to the database.
+        """
+        return {}
+
+    def search(self, criteria: str) -> str | AB:
+        """
+        Searches the address book for contacts matching the given criteria.
+        """
+        if criteria.isdigit():
+            rows = self.connection.execute(
+                "SELECT DISTINCT user_name FROM phones WHERE instr(digits, ?) > 0",
+                (PhoneDirectory.normalize(criteria),),
+            )
+        else:
+            rows = self.connection.execute(
+                "SELECT name FROM users WHERE instr(name_key, ?) > 0",
+                (NameIndex.key(criteria),),
+            )
+
+        serch_contacts = AB()
+        for record in self._read_records([name for (name,) in rows]):
+            serch_contacts.add_record(record)
+
+        if len(serch_contacts) == 0:
+            return f"According to this '{criteria}' criterion, no matches were found"
+
+        return serch_contacts
+
+    def find_by_phone(self, phone: str) -> List[str]:
+        """
+        Returns the names of the contacts that own the phone number.
+        """
+        return self._names_where(
+            "SELECT DISTINCT user_name FROM phones WHERE digits = ?",
+            PhoneDirectory.normalize(phone),
+        )
+
+    def find_by_email(self, email: str) -> List[str]:
+        """
+        Returns the names of the contacts that own the email address, ignoring case.
+        """
+        return self._names_where(
+            "SELECT DISTINCT user_name FROM emails WHERE email_key = ?", email.lower()
+        )
+
+    def find_by_domain(self, domain: str) -> List[str]:
+        """
+        Returns the names of the contacts that have an email address in the domain, ignoring case.
+        """
+        return self._names_where(
+            "SELECT DISTINCT user_name FROM emails WHERE domain = ?",
+            EmailDomainIndex.normalize(domain),
+        )
+
+    def upcoming_birthdays(
+        self, days: int, current_date: date | None = None
+    ) -> List[Record]:
+        """
+        Returns the contacts with a birthday within the given number of days, the birthday today
+        included, ordered by the number of days left and then by name.
+        """
+        if current_date is None:
+            current_date = date.today()
+        window = BirthdayCalendar.window(days, current_date)
+        days_left: dict[int, int] = {}
+        for offset, bucket in window:
+            days_left.setdefault(bucket, offset)
+
+        rows = []
+        for chunk in _chunks(list(days_left)):
+            placeholders = ", ".join("?" * len(chunk))
+            rows += self.connection.execute(
+                f"SELECT name, birthday_bucket FROM users WHERE birthday_bucket IN ({placeholders})",
+                chunk,
+            ).fetchall()
+
+        names = [name for name, _ in sorted(rows, key=lambda row: (days_left[row[1]], row[0]))]
+        records = {record.user.name: record for record in self._read_records(names)}
+        return [records[name] for name in names]
+
+    def complete_name(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Returns up to limit contact names starting with the prefix, ignoring case.
+        """
+        key = NameIndex.key(prefix)
+        rows = self.connection.execute(
+            "SELECT name FROM users WHERE name_key >= ? AND name_key < ? "
+            "ORDER BY name_key, name LIMIT ?",
+            (key, key + "\U0010ffff", limit),
+        )
+        return [name for (name,) in rows]
+
+    def suggest_names(self, name: str, limit: int = 3) -> List[str]:
+        """
+        Returns up to limit contact names within a few typos of the name, ignoring case.
+        The names are indexed for the call, as it only runs when a name was not found.
+        """
+        index = FuzzyIndex()
+        index.build(self)
+        return index.suggest(name, limit)
+
+    def similar_names(self, text: str, limit: int = 10) -> List[tuple[str, float]]:
+        """
+        Returns up to limit contact names with their trigram similarity to the text, ignoring
+        case, the most similar first. The names are indexed for the call.
+        """
+        index = FuzzyIndex()
+        index.build(self)
+        return index.similar(text, limit)
+
+    def save_records_to_file(self, file_name: str, generation: int = 0) -> None:
+        """
+        Save all records of the address book to a snapshot file.
+        """
+        AB(dict(self.items())).save_records_to_file(file_name, generation)
+
+    def add_records(self, records: Iterable[Record]) -> None:
+        """
+        Writes many records to the database at once, replacing the contacts with the same names.
+        """
+        users, phones, emails, names = [], [], [], []
+        for record in records:
+            name = record.user.name
+            names.append((name,))
+            users.append(self._user_row(name, record))
+            phones += self._phone_rows(name, record)
+            emails += self._email_rows(name, record)
+
+        self.connection.executemany("DELETE FROM phones WHERE user_name = ?", names)
+        self.connection.executemany("DELETE FROM emails WHERE user_name = ?", names)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)", users
+        )
+        self.connection.executemany("INSERT INTO phones VALUES (?, ?, ?, ?)", phones)
+        self.connection.executemany("INSERT INTO emails VALUES (?, ?, ?, ?, ?)", emails)
+
+    def clear(self) -> None:
+        """
+        Deletes all contacts from the database.
+        """
+        for table in ("users", "phones", "emails"):
+            self.connection.execute(f"DELETE FROM {table}")
+        for record in self.data.values():
+            if record._book is self:
+                record._book = None
+        self.data.clear()
+
+    def _names_where(self, query: str, value: str) -> List[str]:
+        """
+        Returns the sorted names returned by a query with one parameter.
+        """
+        return sorted(name for (name,) in self.connection.execute(query, (value,)))
+
+    def _write_record(self, name: str, record: Record) -> None:
+        """
+        Replaces the rows of the contact in the users, phones and emails tables.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)", self._user_row(name, record)
+        )
+        self.connection.execute("DELETE FROM phones WHERE user_name = ?", (name,))
+        self.connection.execute("DELETE FROM emails WHERE user_name = ?", (name,))
+        self.connection.executemany(
+            "INSERT INTO phones VALUES (?, ?, ?, ?)", self._phone_rows(name, record)
+        )
+        self.connection.executemany(
+            "INSERT INTO emails VALUES (?, ?, ?, ?, ?)", self._email_rows(name, record)
+        )
+
+    @staticmethod
+    def _user_row(name: str, record: Record) -> tuple:
+        """
+        Returns the row of the users table for the record.
+        """
+        birthday = record.user.birthday_date
+        return (
+            name,
+            NameIndex.key(name),
+            birthday.isoformat() if birthday else None,
+            BirthdayCalendar.normalize(birthday) if birthday else None,
+        )
+
+    @staticmethod
+    def _phone_rows(name: str, record: Record) -> list[tuple]:
+        """
+        Returns the rows of the phones table for the record.
+        """
+        return [
+            (name, position, phone, PhoneDirectory.normalize(phone))
+            for position, phone in enumerate(record.phones())
+        ]
+
+    @staticmethod
+    def _email_rows(name: str, record: Record) -> list[tuple]:
+        """
+        Returns the rows of the emails table for the record.
+        """
+        return [
+            (name, position, email, email.lower(), EmailDomainIndex.normalize(email))
+            for position, email in enumerate(record.email_addresses())
+        ]
+
+    def iter_records(self) -> Iterator[Record]:
+        """
+        Yields all records of the address book in name order, read from the database a chunk
+        at a time. The records that were not read before are not kept in memory.
+        """
+        names = iter(self)
+        while chunk := list(islice(names, SQL_VARIABLES_LIMIT)):
+            records = self._build_records([name for name in chunk if name not in self.data])
+            for name in chunk:
+                yield self.data.get(name) or records[name]
+
+    def _build_records(self, names: List[str] | None) -> dict[str, Record]:
+        """
+        Builds the records with the given names, or all records, from the database, except
+        the records that were already read.
+        """
+        where, params = "", ()
+        if names is not None:
+            where = f" WHERE {{}} IN ({', '.join('?' * len(names))})"
+            params = tuple(names)
+
+        users = self.connection.execute(
+            "SELECT name, birthday FROM users" + where.format("name"), params
+        ).fetchall()
+        phones = self.connection.execute(
+            "SELECT user_name, phone FROM phones" + where.format("user_name")
+            + " ORDER BY user_name, position",
+            params,
+        ).fetchall()
+        emails = self.connection.execute(
+            "SELECT user_name, email FROM emails" + where.format("user_name")
+            + " ORDER BY user_name, position",
+            params,
+        ).fetchall()
+
+        records: dict[str, Record] = {}
+        for name, birthday in users:
+            if name in self.data:
+                continue
+            user = User(name, date.fromisoformat(birthday) if birthday else None)
+            records[name] = Record(user)
+        for name, phone in phones:
+            if name in records:
+                records[name].phone_numbers.append(Phone(phone))
+        for name, email in emails:
+            if name in records:
+                records[name].emails.append(Email(email))
+        return records
+
+    def _read_records(self, names: List[str] | None = None) -> List[Record]:
+        """
+        Builds the records with the given names, or all records, from the database in name
+        order. The records that were already read are taken from self.data.
+        """
+        if names is None:
+            chunks: Iterable[list] = [None]
+        else:
+            missing = [name for name in dict.fromkeys(names) if name not in self.data]
+            chunks = _chunks(missing)
+
+        for chunk in chunks:
+            for name, record in self._build_records(chunk).items():
+                record._book = self
+                self.data[name] = record
+
+        if names is None:
+            names = list(self)
+        return [self.data[name] for name in names if name in self.data]
+
+
+class SQLiteStorage:
+    """
+    SQLiteStorage keeps the address book in a SQLite database file.
+
+    Methods:
+        load: Opens the database and returns the address book backed by it.
+
+        save: Commits the changes of the address book.
+
+        replace: Replaces all contacts of the database with the given address book.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection to the database, creating the tables on first use.
+        The connection may be used by the threads of the server, one writer at a time.
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.file_name, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def load(self) -> SQLiteAddressBook:
+        """
+        Returns the address book backed by the database. No contact is read until it is needed.
+        """
+        return SQLiteAddressBook(self.connection)
+
+    def save(self, address_book: Any) -> None:
+        """
+        Commits the changes made to the address book.
+        """
+        self.connection.commit()
+
+    def replace(self, address_book: AB) -> None:
+        """
+        Replaces all contacts of the database with the contacts of the given address book.
+        """
+        book = self.load()
+        book.clear()
+        book.add_records(address_book.values())
+        self.connection.commit()
+
+
+def _chunks(values: list) -> Iterator[list]:
+    """
+    Splits the values into chunks small enough to be passed as SQL parameters.
+    """
+    for i in range(0, len(values), SQL_VARIABLES_LIMIT):
+        yield values[i : i + SQL_VARIABLES_LIMIT]
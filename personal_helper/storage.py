@@ -0,0 +1,331 @@
+"""
+The storage module provides the persistence of the address book.
+
+This module defines the following classes:
+    - JournalStorage: A snapshot file plus an append-only journal of the changes.
+    - ConflictError: Raised when another process changed the same contacts.
+
+This module defines the following functions:
+    - get_storage: Returns the storage of the given backend.
+
+The snapshot is the indexed file written by AddressBook.save_records_to_file. It is opened
+lazily, so a command that touches one contact reads only that record, and the pickled dict
+files of the earlier versions still load. Every save appends only the records
+that were changed since the load to the journal, and the journal is folded into a new
+snapshot once it grows past a share of the snapshot size. The columnar layout reads the
+whole snapshot into the arrays of a ColumnarAddressBook instead.
+"""
+
+import os
+import pickle
+import struct
+import zlib
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from .constants import (
+        FILE,
+        FILE_SQLITE,
+        STORAGE_BACKEND,
+        JOURNAL_COMPACT_SIZE,
+        JOURNAL_COMPACT_RATIO,
+        ADDRESS_BOOK_LAYOUT,
+    )
+    from .address_book import AddressBook as AB
+    from .snapshot import LazyRecords, read_snapshot, read_generation
+except ImportError:
+    from constants import (
+        FILE,
+        FILE_SQLITE,
+        STORAGE_BACKEND,
+        JOURNAL_COMPACT_SIZE,
+        JOURNAL_COMPACT_RATIO,
+        ADDRESS_BOOK_LAYOUT,
+    )
+    from address_book import AddressBook as AB
+    from snapshot import LazyRecords, read_snapshot, read_generation
+
+if TYPE_CHECKING:
+    from .sqlite_storage import SQLiteStorage
+
+
+FRAME_HEADER = struct.Struct("<II")
+
+
+class ConflictError(Exception):
+    """
+    ConflictError is raised when another process has committed changes to the same contacts
+    since the address book was loaded, or when that can't be ruled out.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names = sorted(names)
+        super().__init__(
+            f"The contacts {', '.join(self.names)} were changed by another process."
+        )
+
+
+class JournalStorage:
+    """
+    JournalStorage keeps the address book in a snapshot file and a journal next to it.
+
+    The journal is a sequence of frames. A frame holds the generation of one commit and the
+    pickled list of its (name, record) pairs, with None as the record of a deleted contact,
+    and starts with the length and the CRC32 of that payload. The snapshot holds the
+    generation of the last commit folded into it. Loading reads the snapshot and replays the
+    frames of the later generations in order; a frame cut short by a crash fails its check
+    and is dropped together with everything after it.
+
+    Many processes may use the same files. Loading takes no lock: the snapshot is only ever
+    replaced by a rename and the frames are only appended, so a reader always sees the state
+    after some commit. A commit takes an advisory fcntl lock on the lock file, applies the
+    frames committed by other processes since the load and appends its own frame. If those
+    frames changed the same contacts, ConflictError is raised and the caller retries with a
+    fresh load.
+
+    Methods:
+        load: Reads the snapshot, replays the journal and returns the address book.
+
+        save: Commits the changes of the address book to the journal.
+
+        compact: Writes the whole address book to a new snapshot and removes the journal.
+
+        replace: Replaces the stored address book with the given one.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        compact_size: int = JOURNAL_COMPACT_SIZE,
+        compact_ratio: float = JOURNAL_COMPACT_RATIO,
+        book_class: type[AB] = AB,
+    ) -> None:
+        self.file_name = file_name
+        self.book_class = book_class
+        self.journal_name = file_name + ".journal"
+        self.lock_name = file_name + ".lock"
+        self.compact_size = compact_size
+        self.compact_ratio = compact_ratio
+        self.generation = 0
+        self._snapshot_generation = 0
+        self._journal_end = 0
+
+    def load(self) -> AB:
+        """
+        Reads the snapshot, replays the journal on top of it and returns the address book.
+        A missing snapshot or journal counts as empty.
+        """
+        while True:
+            address_book = self._load()
+            if address_book is not None:
+                return address_book
+
+    def save(self, address_book: AB) -> None:
+        """
+        Commits the records changed since the last load or save as one frame of the journal,
+        and compacts the journal when it has grown too large. The commits of other processes
+        made in the meantime are applied to the address book first.
+        """
+        changes = address_book.pop_changes()
+        if not changes:
+            return
+
+        with self._commit_lock():
+            self._catch_up(address_book, changes)
+            generation = self.generation + 1
+            payload = pickle.dumps((generation, list(changes.items())))
+            with open(self.journal_name, "ab") as file:
+                if file.tell() != self._journal_end:
+                    file.truncate(self._journal_end)
+                file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)))
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+                self._journal_end = file.tell()
+            self.generation = generation
+
+            if self._needs_compaction():
+                self._publish(address_book, generation)
+
+    def compact(self, address_book: AB) -> None:
+        """
+        Commits the changes of the address book, then writes the whole address book to a new
+        snapshot, replaces the old snapshot with it in one rename and removes the journal.
+        """
+        self.save(address_book)
+        with self._commit_lock():
+            self._catch_up(address_book, {})
+            self._publish(address_book, self.generation)
+
+    def replace(self, address_book: AB) -> None:
+        """
+        Replaces the stored address book with the given one, which may come from another storage.
+        """
+        with self._commit_lock():
+            generation = self._latest_generation() + 1
+            self._publish(address_book, generation)
+            self.generation = generation
+
+    def _load(self) -> AB | None:
+        """
+        Reads the snapshot and replays the frames of the later generations. Returns None if
+        another process compacted the journal in between, so the frames do not follow the
+        snapshot that was read, after closing the snapshot file.
+        """
+        try:
+            records = read_snapshot(self.file_name)
+        except FileNotFoundError:
+            records = {}
+        generation = records.generation if isinstance(records, LazyRecords) else 0
+        address_book = self.book_class.from_records(records)
+        self._snapshot_generation = generation
+
+        for frame_generation, changes in self._read_journal():
+            if frame_generation <= self._snapshot_generation:
+                continue
+            if frame_generation != generation + 1:
+                address_book.close()
+                return None
+            self._apply(address_book, changes)
+            generation = frame_generation
+
+        self.generation = generation
+        address_book.pop_changes()
+        return address_book
+
+    def _catch_up(self, address_book: AB, changes: dict) -> None:
+        """
+        Applies the frames committed by other processes since the last load or save to the
+        address book. Raises ConflictError if they changed any of the given changed contacts.
+        Must be called with the commit lock held.
+        """
+        snapshot_generation = (
+            read_generation(self.file_name) if os.path.exists(self.file_name) else 0
+        )
+        if snapshot_generation != self._snapshot_generation:
+            if snapshot_generation > self.generation:
+                raise ConflictError(changes)
+            self._snapshot_generation = snapshot_generation
+            self._journal_end = 0
+
+        for frame_generation, frame in self._read_journal(self._journal_end):
+            if frame_generation <= self.generation:
+                continue
+            conflicts = {name for name, _ in frame} & changes.keys()
+            if conflicts:
+                raise ConflictError(conflicts)
+            self._apply(address_book, frame)
+            self.generation = frame_generation
+        address_book.pop_changes()
+
+    def _latest_generation(self) -> int:
+        """
+        Returns the generation of the last commit in the snapshot or the journal.
+        Must be called with the commit lock held.
+        """
+        generation = read_generation(self.file_name) if os.path.exists(self.file_name) else 0
+        for frame_generation, _ in self._read_journal():
+            generation = max(generation, frame_generation)
+        return generation
+
+    def _publish(self, address_book: AB, generation: int) -> None:
+        """
+        Writes the address book to a new snapshot of the given generation, publishes it with
+        one rename and removes the journal. Must be called with the commit lock held.
+        """
+        temp_name = f"{self.file_name}.{generation}.tmp"
+        address_book.save_records_to_file(temp_name, generation)
+        os.replace(temp_name, self.file_name)
+        if os.path.exists(self.journal_name):
+            os.remove(self.journal_name)
+        self._snapshot_generation = generation
+        self._journal_end = 0
+        address_book.pop_changes()
+
+    @contextmanager
+    def _commit_lock(self) -> Iterator[None]:
+        """
+        Holds the advisory lock of the lock file while a commit is written.
+        Without fcntl, as on Windows, the commits are not locked.
+        """
+        with open(self.lock_name, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    @staticmethod
+    def _apply(address_book: AB, changes: list) -> None:
+        """
+        Applies the (name, record) pairs of one frame to the address book.
+        """
+        for name, record in changes:
+            if record is None:
+                if name in address_book:
+                    address_book.delete_record(name)
+            else:
+                address_book[name] = record
+
+    def _needs_compaction(self) -> bool:
+        """
+        Checks if the journal is larger than both the minimal size and the share of the snapshot.
+        """
+        snapshot_size = (
+            os.path.getsize(self.file_name) if os.path.exists(self.file_name) else 0
+        )
+        return self._journal_end > max(
+            self.compact_size, snapshot_size * self.compact_ratio
+        )
+
+    def _read_journal(self, start: int = 0) -> Iterator[tuple[int, list]]:
+        """
+        Yields the generation and the list of changes of the complete frames of the journal
+        from the start offset on, and remembers where the last complete frame ends.
+        """
+        self._journal_end = start
+        if not os.path.exists(self.journal_name):
+            return
+
+        with open(self.journal_name, "rb") as file:
+            file.seek(start)
+            while True:
+                header = file.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                length, checksum = FRAME_HEADER.unpack(header)
+                payload = file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                self._journal_end = file.tell()
+                yield pickle.loads(payload)
+
+
+def get_storage(
+    backend: str = STORAGE_BACKEND, layout: str = ADDRESS_BOOK_LAYOUT
+) -> "JournalStorage | SQLiteStorage":
+    """
+    Returns the storage of the given backend: "journal" keeps the address book in FILE,
+    "sqlite" keeps it in the FILE_SQLITE database. With the "columnar" layout the journal
+    storage loads the contacts into a ColumnarAddressBook. The modules of the SQLite
+    storage and of the columnar layout are imported only when they are used.
+    """
+    if backend == "sqlite":
+        try:
+            from .sqlite_storage import SQLiteStorage
+        except ImportError:
+            from sqlite_storage import SQLiteStorage
+        return SQLiteStorage(FILE_SQLITE)
+    if backend == "journal":
+        book_class = AB
+        if layout == "columnar":
+            try:
+                from .columnar import ColumnarAddressBook as book_class
+            except ImportError:
+                from columnar import ColumnarAddressBook as book_class
+        return JournalStorage(FILE, book_class=book_class)
+    raise ValueError(f"Unknown storage backend: {backend}")
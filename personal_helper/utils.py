@@ -1,6 +1,10 @@
 """utils"""
 
-from typing import Callable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .indexes import FuzzyIndex
 
 
 def format_phone_number(func: Callable[..., str]) -> Callable[..., str]:
@@ -18,48 +22,28 @@ def sanitize_phone_number(phone: str) -> str:
     return ''.join(number.strip().strip('(, ), -, +, x, .') for number in phone)
 
 
-def transformation_commands(commands: list, target_command: str) -> dict:
-    """
-    The transformation_commands function takes a list of commands and a target command as input.
-    It returns a dictionary with the keys being each command in the list, and the values being lists
-    of booleans indicating whether or not that character in that position is correct for the target 
-    command.
-
-    :param commands: list: Store the commands that are to be transformed
-    :param target_command: str: Create a dictionary of commands and their corresponding
-    """
-    result: dict = {}
-
-    for command in commands:
-        result[command] = []
-        for index, char in enumerate(command):
-            try:
-                result[command].append(target_command[index] == char)
-            except IndexError:
-                pass
+@lru_cache(maxsize=None)
+def _command_index(commands: tuple[str, ...]) -> "FuzzyIndex":
+    """Returns the trigram index for the commands, built once for every list of commands."""
+    try:
+        from .indexes import FuzzyIndex
+    except ImportError:
+        from indexes import FuzzyIndex
 
-    return result
+    index = FuzzyIndex()
+    index.build(commands)
+    return index
 
 
-def get_close_command(commands_dict: dict) -> str | None:
+def get_close_command(commands: list, target_command: str) -> str | None:
     """
-    The get_close_command function takes in a dictionary of commands and their respective values.
-    It then iterates through the dictionary, counting how many True values each command has.
-    The command with the most True values is returned as a string.
+    The get_close_command function takes a list of commands and a mistyped command as input.
+    It returns the command with the fewest typos, that is letters added, removed, changed or
+    swapped with the next one, within one typo for the short commands and two for the longer
+    ones, or None if no command is so close.
 
-    :param commands_dict: dict: Store the commands and their values
+    :param commands: list: Store the commands that are to be compared
+    :param target_command: str: Pass the mistyped command
     """
-    max_true_count = 0
-    max_true_element = None
-
-    for element, values in commands_dict.items():
-        true_count = values.count(True)
-
-        if true_count > max_true_count:
-            max_true_count = true_count
-            max_true_element = element
-
-    if max_true_element is None:
-        return None
-
-    return f"{max_true_element}"
+    close = _command_index(tuple(commands)).suggest(target_command, limit=1)
+    return close[0] if close else None
@@ -4,19 +4,22 @@ import re
 from string import digits
 from datetime import datetime
 import os
-from pathlib import Path
+from typing import TYPE_CHECKING
 
 try:
     from .error import input_error
-    from .constants import LETTERS, NAME_RANGE, PHONE_RANGE
+    from .constants import LETTERS, NAME_RANGE, PHONE_RANGE, STORAGE_BACKENDS, EXPORT_FORMATS
     from .address_book import Record, AddressBook as AB
     from .entities import Phone, Email
 except ImportError:
     from error import input_error
-    from constants import LETTERS, NAME_RANGE, PHONE_RANGE
+    from constants import LETTERS, NAME_RANGE, PHONE_RANGE, STORAGE_BACKENDS, EXPORT_FORMATS
     from address_book import Record, AddressBook as AB
     from entities import Phone, Email
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 @input_error
 def name_validation(name: str) -> None:
@@ -110,11 +113,13 @@ def check_name_in_address_book(address_book: AB, name: str) -> None:
 def check_name_not_in_address_book(address_book: AB, name: str) -> None:
     """
     The check_name_not_in_address_book function checks if the name is already in the address book.
-        If it is, then a ValueError exception will be raised with an error message explaining that
-        the contact already exists in the address book.
+        If it is not, then a KeyError exception will be raised with an error message explaining that
+        the contact was not found, with the names of the contacts within a few typos of it.
     """
     if name not in address_book:
-        raise KeyError(f"The contact '{name}' was not found.")
+        suggestions = address_book.suggest_names(name)
+        hint = f" Did you mean {', '.join(repr(suggestion) for suggestion in suggestions)}?" if suggestions else ""
+        raise KeyError(f"The contact '{name}' was not found.{hint}")
 
 
 @input_error
@@ -125,12 +130,26 @@ def check_phone_number_in_address_book(
     The check_phone_number_in_address_book function checks if a phone number already exists in the address book.
         If it does, then an error is raised.
     """
-    if phone in [phone_number.subrecord for phone_number in contact.phone_numbers]:
+    if phone in contact.phone_numbers:
         raise ValueError(
             f"The phone number '{phone.phone}' already exists in the '{contact_name}' contact."
         )
 
 
+@input_error
+def check_phone_number_owner(address_book: AB, phone: Phone, contact_name: str) -> None:
+    """
+    The check_phone_number_owner function checks that the phone number does not belong to another
+    contact of the address book. The owners are looked up in the phone directory of the book,
+    which is built from the phone numbers saved in the snapshot, so no record is read for it.
+    """
+    owners = [name for name in address_book.find_by_phone(phone.phone) if name != contact_name]
+    if owners:
+        raise ValueError(
+            f"The phone number '{phone.phone}' already belongs to the '{owners[0]}' contact."
+        )
+
+
 @input_error
 def check_phone_number_not_in_address_book(
     contact: Record, phone: Phone, contact_name: str
@@ -139,21 +158,30 @@ def check_phone_number_not_in_address_book(
     The check_phone_number_not_in_address_book function checks that the phone number to be updated is in the address book.
         If it is not, then an error message will be raised.
     """
-    if phone not in [phone_number.subrecord for phone_number in contact.phone_numbers]:
+    if phone not in contact.phone_numbers:
         raise ValueError(
             f"Contact's phone '{phone.phone}' was not found in the '{contact_name}' contact."
         )
 
 
+def contact_has_email(address_book: AB, email: Email, contact_name: str) -> bool:
+    """
+    The contact_has_email function checks if the contact has the email, ignoring case.
+    The owners of the email are looked up in the email directory of the address book,
+    which is built from the emails saved in the snapshot, so no record is read for it.
+    """
+    return contact_name in address_book.find_by_email(email.email)
+
+
 @input_error
 def check_email_in_address_book(
-    contact: Record, email: Email, contact_name: str
+    address_book: AB, email: Email, contact_name: str
 ) -> None:
     """
     The check_email_in_address_book function checks if the email already exists in the contact's emails.
         If it does, then a ValueError is raised with an error message explaining that this email already exists.
     """
-    if email in [email.subrecord for email in contact.emails]:
+    if contact_has_email(address_book, email, contact_name):
         raise ValueError(
             f"The contact's email '{email.email}' already exists in this '{contact_name}' contact."
         )
@@ -161,20 +189,20 @@ def check_email_in_address_book(
 
 @input_error
 def check_email_not_in_address_book(
-    contact: Record, email: Email, contact_name: str
+    address_book: AB, email: Email, contact_name: str
 ) -> None:
     """
     The check_email_not_in_address_book function checks to see if the email is in the contact's list of emails.
     If it is not, then a ValueError exception will be raised.
     """
-    if email not in [email.subrecord for email in contact.emails]:
+    if not contact_has_email(address_book, email, contact_name):
         raise ValueError(
             f"Contact's email '{email.email}' was not found in the '{contact_name}' contact."
         )
 
 
 @input_error
-def check_path_address_to_sort_files_in_it(path: Path) -> None:
+def check_path_address_to_sort_files_in_it(path: "Path") -> None:
     """Checks if the path (for sorting files) exists and if it points to a folder"""
     if not path.exists():
         raise ValueError("The way is not exists!")
@@ -192,3 +220,25 @@ def check_birthday_in_next_days(days_interval: str) -> None:
         int(days_interval)
     except ValueError as error:
         raise ValueError("The days parameter should be a digit.") from error
+
+
+@input_error
+def storage_backend_validation(backend: str) -> None:
+    """
+    The storage_backend_validation function checks if the backend is one of the storage backends.
+    """
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"The storage can be one of {', '.join(STORAGE_BACKENDS)}, but got '{backend}'"
+        )
+
+
+@input_error
+def export_format_validation(file_format: str) -> None:
+    """
+    The export_format_validation function checks if the format is one of the export formats.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"The format can be one of {', '.join(EXPORT_FORMATS)}, but got '{file_format}'"
+        )
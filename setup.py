@@ -19,5 +19,6 @@ setup(
              'Roman Lomachinskiy', 'Oleksii Chaika', 'Artem Ivanina'],
     license='MIT',
     python_requires='>=3.11',
-    entry_points={'console_scripts': ['pbot = personal_helper.run_bot:main']}    
+    entry_points={'console_scripts': ['pbot = personal_helper.run_bot:main',
+                                    'pbotc = personal_helper.client:main']}    
 )
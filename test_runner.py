@@ -2,19 +2,47 @@
 
 import unittest
 from tests import (
+    test_batch,
+    test_benchmark_suite,
     test_class_AB,
+    test_class_BirthdayColumns,
+    test_class_ColumnarAddressBook,
     test_class_Email,
+    test_class_FuzzyIndex,
+    test_class_JournalStorage,
     test_class_Phone,
     test_class_Record,
+    test_class_SQLiteStorage,
     test_class_User,
+    test_export,
+    test_generator_of_contacts,
+    test_import,
+    test_parsers,
+    test_profiling,
+    test_server,
+    test_startup,
     test_validation)
 
 ABTestSuite = unittest.TestSuite()
+ABTestSuite.addTest(unittest.makeSuite(test_batch.TestBatch))
+ABTestSuite.addTest(unittest.makeSuite(test_benchmark_suite.TestBenchmarkSuite))
 ABTestSuite.addTest(unittest.makeSuite(test_class_AB.TestAddressBook))
+ABTestSuite.addTest(unittest.makeSuite(test_class_BirthdayColumns.TestBirthdayColumns))
+ABTestSuite.addTest(unittest.makeSuite(test_class_ColumnarAddressBook.TestColumnarAddressBook))
 ABTestSuite.addTest(unittest.makeSuite(test_class_Email.TestEmail))
+ABTestSuite.addTest(unittest.makeSuite(test_class_FuzzyIndex.TestFuzzyIndex))
+ABTestSuite.addTest(unittest.makeSuite(test_class_JournalStorage.TestJournalStorage))
 ABTestSuite.addTest(unittest.makeSuite(test_class_Phone.TestPhone))
 ABTestSuite.addTest(unittest.makeSuite(test_class_Record.TestRecord))
+ABTestSuite.addTest(unittest.makeSuite(test_class_SQLiteStorage.TestSQLiteStorage))
 ABTestSuite.addTest(unittest.makeSuite(test_class_User.TestUser))
+ABTestSuite.addTest(unittest.makeSuite(test_export.TestExport))
+ABTestSuite.addTest(unittest.makeSuite(test_generator_of_contacts.TestGeneratorOfContacts))
+ABTestSuite.addTest(unittest.makeSuite(test_import.TestImport))
+ABTestSuite.addTest(unittest.makeSuite(test_parsers.TestParsers))
+ABTestSuite.addTest(unittest.makeSuite(test_profiling.TestProfiling))
+ABTestSuite.addTest(unittest.makeSuite(test_server.TestServer))
+ABTestSuite.addTest(unittest.makeSuite(test_startup.TestStartup))
 ABTestSuite.addTest(unittest.makeSuite(test_validation.TestValidation))
 
 runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,78 @@
+"""Tests batch mode"""
+
+import argparse
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from personal_helper import commands
+from personal_helper.run_bot import batch_controller
+from personal_helper.storage import JournalStorage
+
+
+class TestBatch(unittest.TestCase):
+    """Tests batch mode"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = JournalStorage(os.path.join(self.temp_dir.name, 'address_book.bin'))
+        self.script = os.path.join(self.temp_dir.name, 'commands.txt')
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def run_batch(self, lines: list[str], every: int = 0) -> str:
+        """
+        Runs the lines as a batch against the temporary storage and returns the printed output.
+        """
+        with open(self.script, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(lines))
+        output = io.StringIO()
+        with patch.object(commands, 'STORAGE', self.storage), \
+                patch.object(self.storage, 'save', wraps=self.storage.save) as save, \
+                redirect_stdout(output):
+            batch_controller(argparse.Namespace(source=self.script, every=every))
+        self.saves = save.call_count
+        return output.getvalue()
+
+    def test_batch_saves_once_and_reports_errors(self) -> None:
+        """
+        The test_batch_saves_once_and_reports_errors function tests that the commands of a
+        batch share one address book that is saved once, and that a failing command is
+        reported without stopping the run.
+        """
+        output = self.run_batch([
+            '# contacts',
+            'add -n Alice -p 380501234567',
+            'add -n Bob -p 380501234567',
+            'add -n Bob',
+            'unknown -x',
+            'change -n Bob -e bob@gmail.com',
+        ])
+
+        self.assertIn('Line 3 failed: add -n Bob -p 380501234567', output)
+        self.assertIn('Line 5 failed: unknown -x', output)
+        self.assertIn('5 commands executed, 2 failed.', output)
+        self.assertEqual(self.saves, 1)
+        self.assertFalse(commands.SESSION.active)
+
+        address_book = JournalStorage(self.storage.file_name).load()
+        self.assertEqual(list(address_book), ['Alice', 'Bob'])
+        self.assertEqual(address_book['Bob'].email_addresses(), ['bob@gmail.com'])
+
+    def test_batch_saves_every_n_commands(self) -> None:
+        """
+        The test_batch_saves_every_n_commands function tests that the changes are saved after
+        every n commands and once more at the end.
+        """
+        self.run_batch([f'add -n {name}' for name in ['Alice', 'Bob', 'Carl', 'Dana', 'Olya']], every=2)
+
+        self.assertEqual(self.saves, 3)
+        self.assertEqual(len(JournalStorage(self.storage.file_name).load()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
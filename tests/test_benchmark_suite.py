@@ -0,0 +1,43 @@
+"""Tests the benchmark suite"""
+
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from benchmarks.suite import compare, run_suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Tests the benchmark suite"""
+
+    def test_run_suite(self) -> None:
+        """
+        The test_run_suite function tests that every operation of every size gets a time.
+        """
+        with redirect_stderr(io.StringIO()):
+            results = run_suite([50], [20], [10], repeat=1)
+
+        self.assertIn('address_book.search[50]', results)
+        self.assertIn('address_book.read_records_from_file[50]', results)
+        self.assertIn('notes.add_note[20]', results)
+        self.assertIn('sorting_files.sort[10]', results)
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+    def test_compare_flags_regressions(self) -> None:
+        """
+        The test_compare_flags_regressions function tests that only the operations slower than
+        the baseline by more than the threshold are flagged, and the new ones are skipped.
+        """
+        baseline = {'a[1]': 1.0, 'b[1]': 1.0, 'c[1]': 1.0}
+        results = {'a[1]': 1.2, 'b[1]': 1.5, 'c[1]': 0.5, 'd[1]': 9.0}
+        output = io.StringIO()
+        with redirect_stdout(output):
+            regressions = compare(results, baseline, threshold=0.25)
+
+        self.assertEqual(regressions, ['b[1]'])
+        self.assertIn('+50.0%  REGRESSION', output.getvalue())
+        self.assertNotIn('d[1]', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
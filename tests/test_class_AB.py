@@ -2,10 +2,13 @@
 
 import os
 import pickle
+import random
 import unittest
+from datetime import date
 
 from personal_helper.entities import Phone, User, Email
 from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.snapshot import read_snapshot
 
 
 class TestAddressBook(unittest.TestCase):
@@ -51,6 +54,45 @@ class TestAddressBook(unittest.TestCase):
         self.addressbook_test.delete_record('sasha')
         self.assertFalse('Sasha' in self.addressbook_test)
 
+    def test_add_record_keeps_name_order(self) -> None:
+        """
+        The test_add_record_keeps_name_order function tests that the address book is iterated
+        in name order regardless of the order in which the records were added or deleted.
+        """
+        for name in ['olya', 'alex', 'sasha', 'bogdan', 'yana']:
+            self.addressbook_test.add_record(Record(User(name)))
+        self.addressbook_test.delete_record('bogdan')
+
+        self.assertEqual(list(self.addressbook_test), ['alex', 'olya', 'sasha', 'yana'])
+        self.assertEqual(
+            [record.user.name for record in self.addressbook_test.values()],
+            ['alex', 'olya', 'sasha', 'yana'])
+
+    def test_add_record_many_contacts(self) -> None:
+        """
+        The test_add_record_many_contacts function tests that the name order is kept when the
+        address book grows past the size of a single block of the sorted name index.
+        """
+        names = [f'contact{number}' for number in range(5000)]
+        random.Random(1).shuffle(names)
+        for name in names:
+            self.addressbook_test.add_record(Record(User(name)))
+        for name in names[:2500]:
+            self.addressbook_test.delete_record(name)
+
+        self.assertEqual(list(self.addressbook_test), sorted(names[2500:]))
+
+    def test_add_record_replaces_existing_contact(self) -> None:
+        """
+        The test_add_record_replaces_existing_contact function tests that adding a record with
+        a name that is already in the address book replaces it without duplicating the name.
+        """
+        self.addressbook_test.add_record(self.record_test)
+        self.addressbook_test.add_record(self.record_test)
+
+        self.assertEqual(list(self.addressbook_test), ['sasha'])
+        self.assertEqual(len(self.addressbook_test), 1)
+
     def test_search_name(self) -> None:
         """
         The test_search_name function tests the search function in AddressBook.py
@@ -61,6 +103,66 @@ class TestAddressBook(unittest.TestCase):
         addressbook_search = self.addressbook_test.search('sa')
         self.assertTrue('sasha' in addressbook_search)
 
+    def test_search_name_ignores_case(self) -> None:
+        """
+        The test_search_name_ignores_case function tests the name search with Latin and Cyrillic
+        names written in different cases.
+        """
+        for name in ['Sasha', 'Олександр', 'oleksii', 'Аліна']:
+            self.addressbook_test.add_record(Record(User(name)))
+
+        self.assertEqual(list(self.addressbook_test.search('sash')), ['Sasha'])
+        self.assertEqual(list(self.addressbook_test.search('олек')), ['Олександр'])
+        self.assertEqual(list(self.addressbook_test.search('лі')), ['Аліна'])
+
+    def test_complete_name(self) -> None:
+        """
+        The test_complete_name function tests that complete_name returns the names starting with
+        the prefix in order, limited to the requested number, and follows deleted records.
+        """
+        for name in ['olya', 'Oleksii', 'oleg', 'sasha', 'Olena']:
+            self.addressbook_test.add_record(Record(User(name)))
+
+        self.assertEqual(
+            self.addressbook_test.complete_name('ole'), ['oleg', 'Oleksii', 'Olena'])
+        self.assertEqual(self.addressbook_test.complete_name('OL', 2), ['oleg', 'Oleksii'])
+
+        self.addressbook_test.delete_record('oleg')
+        self.addressbook_test.add_record(Record(User('Olesya')))
+        self.assertEqual(
+            self.addressbook_test.complete_name('ole'), ['Oleksii', 'Olena', 'Olesya'])
+        self.assertEqual(self.addressbook_test.complete_name('x'), [])
+
+    def test_suggest_names(self) -> None:
+        """
+        The test_suggest_names function tests that suggest_names returns the names within a few
+        typos of a name, the closest first, and follows the added and deleted records.
+        """
+        for name in ['olya', 'Oleksii', 'oleg', 'sasha', 'Olena']:
+            self.addressbook_test.add_record(Record(User(name)))
+
+        self.assertEqual(self.addressbook_test.suggest_names('Olesii'), ['Oleksii'])
+        self.assertEqual(self.addressbook_test.suggest_names('olea'), ['oleg', 'Olena', 'olya'])
+
+        self.addressbook_test.delete_record('oleg')
+        self.addressbook_test.add_records([Record(User('Olea'))])
+        self.assertEqual(self.addressbook_test.suggest_names('olea', 2), ['Olea', 'Olena'])
+        self.assertEqual(self.addressbook_test.suggest_names('Victoria'), [])
+
+    def test_similar_names(self) -> None:
+        """
+        The test_similar_names function tests that similar_names ranks the names by their
+        similarity to the text and follows the deleted records.
+        """
+        for name in ['Oleksandr', 'Aleksandr', 'Alexander', 'Olga']:
+            self.addressbook_test.add_record(Record(User(name)))
+
+        matches = self.addressbook_test.similar_names('aleksandr')
+        self.assertEqual([name for name, _ in matches], ['Aleksandr', 'Oleksandr'])
+
+        self.addressbook_test.delete_record('Aleksandr')
+        self.assertEqual(self.addressbook_test.similar_names('aleksandr', 1)[0][0], 'Oleksandr')
+
     def test_search_phone(self) -> None:
         """
         The test_search_phone function tests the search function of the AddressBook class.
@@ -72,9 +174,138 @@ class TestAddressBook(unittest.TestCase):
         addressbook_search = self.addressbook_test.search('38095')
         if isinstance(addressbook_search, AB):
             contact = addressbook_search.get_contact('sasha')
-        record_phone = contact.phone_numbers[0].subrecord.phone
+        record_phone = contact.phone_numbers[0].phone
         self.assertTrue('380951234567' in record_phone)
 
+    def test_search_phone_follows_record_changes(self) -> None:
+        """
+        The test_search_phone_follows_record_changes function tests that the phone search finds
+        the numbers added, changed and deleted through the Record methods after the record was
+        added to the address book.
+        """
+        self.addressbook_test.add_record(self.record_test)
+        self.assertIsInstance(self.addressbook_test.search('1234'), AB)
+
+        self.record_test.add_phone_number(Phone('380671112233'))
+        self.assertTrue('sasha' in self.addressbook_test.search('6711'))
+
+        self.record_test.change_phone_number(Phone('380671112233'), Phone('380509998877'))
+        self.assertIsInstance(self.addressbook_test.search('6711'), str)
+        self.assertTrue('sasha' in self.addressbook_test.search('5099'))
+
+        self.record_test.delete_phone_number(Phone('380951234567'))
+        self.assertIsInstance(self.addressbook_test.search('1234'), str)
+
+    def test_search_phone_short_criteria(self) -> None:
+        """
+        The test_search_phone_short_criteria function tests the phone search with criteria
+        shorter than an n-gram of the phone index.
+        """
+        self.addressbook_test.add_record(self.record_test)
+        other = Record(User('olya'))
+        other.add_phone_number(Phone('380501112233'))
+        self.addressbook_test.add_record(other)
+
+        self.assertEqual(list(self.addressbook_test.search('95')), ['sasha'])
+        self.assertEqual(list(self.addressbook_test.search('3')), ['olya', 'sasha'])
+
+    def test_delete_record_removes_phones_from_search(self) -> None:
+        """
+        The test_delete_record_removes_phones_from_search function tests that the phone numbers
+        of a deleted record are no longer found and that the record is detached from the book.
+        """
+        self.addressbook_test.add_record(self.record_test)
+        self.addressbook_test.search('380')
+        self.addressbook_test.delete_record('sasha')
+
+        self.record_test.add_phone_number(Phone('380671112233'))
+        self.assertIsInstance(self.addressbook_test.search('380'), str)
+
+    def test_find_by_phone(self) -> None:
+        """
+        The test_find_by_phone function tests that find_by_phone returns the owner of a phone number
+        written with or without '+' and follows the phone numbers changed through the Record methods.
+        """
+        self.addressbook_test.add_record(self.record_test)
+
+        self.assertEqual(self.addressbook_test.find_by_phone('+380951234567'), ['sasha'])
+        self.assertEqual(self.addressbook_test.find_by_phone('380951234567'), ['sasha'])
+
+        self.record_test.change_phone_number(Phone('380951234567'), Phone('+380501112233'))
+        self.assertEqual(self.addressbook_test.find_by_phone('380951234567'), [])
+        self.assertEqual(self.addressbook_test.find_by_phone('380501112233'), ['sasha'])
+
+        self.addressbook_test.delete_record('sasha')
+        self.assertEqual(self.addressbook_test.find_by_phone('380501112233'), [])
+
+    def test_find_by_email_and_domain(self) -> None:
+        """
+        The test_find_by_email_and_domain function tests that the email and domain lookups follow
+        the emails added, changed and deleted through the Record methods.
+        """
+        self.addressbook_test.add_record(self.record_test)
+        other = Record(User('olya'))
+        other.add_email(Email('olya@example.com'))
+        self.addressbook_test.add_record(other)
+
+        self.assertEqual(self.addressbook_test.find_by_email('TEST_sasha@gmail.com'), ['sasha'])
+        self.assertEqual(self.addressbook_test.find_by_domain('example.com'), ['olya'])
+
+        self.record_test.add_email(Email('sasha@example.com'))
+        self.assertEqual(self.addressbook_test.find_by_domain('Example.com'), ['olya', 'sasha'])
+
+        self.record_test.change_email(Email('sasha@example.com'), Email('sasha@ukr.net'))
+        self.assertEqual(self.addressbook_test.find_by_domain('example.com'), ['olya'])
+        self.assertEqual(self.addressbook_test.find_by_email('sasha@ukr.net'), ['sasha'])
+
+        self.record_test.delete_email(Email('test_sasha@gmail.com'))
+        self.assertEqual(self.addressbook_test.find_by_domain('gmail.com'), [])
+        self.assertEqual(self.addressbook_test.find_by_email('test_sasha@gmail.com'), [])
+
+    def test_upcoming_birthdays(self) -> None:
+        """
+        The test_upcoming_birthdays function tests that upcoming_birthdays returns the contacts with
+        a birthday in the interval ordered by the days left, including a 29th of February birthday
+        in a year that is not a leap year.
+        """
+        birthdays = {'olya': '05-03-1990', 'yana': '29-02-2000', 'alex': '28-02-1985',
+                     'bogdan': '01-03-1999', 'ivan': '10-03-1990'}
+        for name, birthday in birthdays.items():
+            record = Record(User(name))
+            record.add_birthday(birthday)
+            self.addressbook_test.add_record(record)
+        self.addressbook_test.add_record(self.record_test)
+
+        upcoming = self.addressbook_test.upcoming_birthdays(5, date(2023, 2, 28))
+        self.assertEqual([record.user.name for record in upcoming],
+                         ['alex', 'yana', 'bogdan', 'olya'])
+        self.assertEqual([record.days_to_birthday(date(2023, 2, 28)) for record in upcoming],
+                         [0, 0, 1, 5])
+
+        upcoming = self.addressbook_test.upcoming_birthdays(1, date(2024, 2, 28))
+        self.assertEqual([record.user.name for record in upcoming], ['alex', 'yana'])
+
+        self.addressbook_test.get_contact('ivan').add_birthday('01-03-1990')
+        self.addressbook_test.delete_record('olya')
+        upcoming = self.addressbook_test.upcoming_birthdays(365, date(2023, 3, 1))
+        self.assertEqual([record.user.name for record in upcoming],
+                         ['bogdan', 'ivan', 'alex', 'yana'])
+
+    def test_upcoming_birthdays_february_in_common_year(self) -> None:
+        """
+        The test_upcoming_birthdays_february_in_common_year function tests that the birthdays on the
+        28th and the 29th of February are ordered by name in a year that is not a leap year,
+        as they are both celebrated on the 28th.
+        """
+        for name, birthday in {'Zed': '28-02-1990', 'Amy': '29-02-2000', 'Bob': '01-03-1991'}.items():
+            record = Record(User(name))
+            record.add_birthday(birthday)
+            self.addressbook_test.add_record(record)
+
+        upcoming = self.addressbook_test.upcoming_birthdays(10, date(2023, 2, 20))
+        self.assertEqual([record.user.name for record in upcoming], ['Amy', 'Zed', 'Bob'])
+        self.assertEqual([record.days_to_birthday(date(2023, 2, 20)) for record in upcoming], [8, 8, 9])
+
     def test_search_nothing(self) -> None:
         """
         The test_search_nothing function tests the search function in AddressBook.py
@@ -96,9 +327,51 @@ class TestAddressBook(unittest.TestCase):
 
         self.addressbook_test.save_records_to_file(self.test_file)
 
-        with open(self.test_file, 'rb') as file:
-            content = pickle.load(file)
-            self.assertTrue('sasha' in content)
+        content = read_snapshot(self.test_file)
+        self.assertTrue('sasha' in content)
+        content.close()
+
+    def test_from_file_reads_records_on_access(self) -> None:
+        """
+        The test_from_file_reads_records_on_access function tests that an address book opened
+        from a snapshot knows all names but unpickles a record only when it is accessed.
+        """
+        for name in ['olya', 'sasha', 'ivan']:
+            record = Record(User(name))
+            record.add_phone_number(Phone('380951234567' if name == 'sasha' else '380501112233'))
+            self.addressbook_test.add_record(record)
+        self.addressbook_test.save_records_to_file(self.test_file)
+
+        address_book = AB.from_file(self.test_file)
+        self.assertEqual(list(address_book), ['ivan', 'olya', 'sasha'])
+        self.assertEqual(len(address_book), 3)
+        self.assertTrue('olya' in address_book)
+        self.assertEqual(address_book.data._records, {})
+
+        sasha = address_book.get_contact('sasha')
+        self.assertEqual(list(address_book.data._records), ['sasha'])
+        self.assertIs(sasha.address_book, address_book)
+        self.assertEqual(sasha.phones(), ['380951234567'])
+
+        address_book.delete_record('ivan')
+        address_book.add_record(Record(User('yana')))
+        address_book.save_records_to_file(self.test_file + '.new')
+        self.assertEqual(list(AB.from_file(self.test_file + '.new')), ['olya', 'sasha', 'yana'])
+        address_book.data.close()
+        os.remove(self.test_file + '.new')
+
+    def test_from_file_reads_pickled_dict(self) -> None:
+        """
+        The test_from_file_reads_pickled_dict function tests that the pickled dict written by
+        the earlier versions of save_records_to_file is still read.
+        """
+        with open(self.test_file, 'wb') as file:
+            pickle.dump({'sasha': self.record_test}, file)
+
+        address_book = AB.from_file(self.test_file)
+
+        self.assertEqual(list(address_book), ['sasha'])
+        self.assertEqual(address_book.pop_changes(), {})
 
     def test_read_records_from_file(self) -> None:
         """
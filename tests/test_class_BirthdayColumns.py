@@ -0,0 +1,93 @@
+"""Tests class BirthdayColumns"""
+
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from personal_helper import birthday_columns
+from personal_helper.entities import User
+from personal_helper.address_book import Record
+from personal_helper.birthday_columns import BirthdayColumns
+
+
+class TestBirthdayColumns(unittest.TestCase):
+    """Tests class BirthdayColumns"""
+
+    def setUp(self) -> None:
+        self.records = []
+        for birthday in ['01-01-2000', '29-02-2000', '28-02-1985', '01-03-1999',
+                         '31-12-1990', '29-02-1996', None, '15-06-2001']:
+            record = Record(User('contact'))
+            if birthday:
+                record.add_birthday(birthday)
+            self.records.append(record)
+        self.current_dates = [date(2023, 1, 1) + timedelta(days=offset)
+                              for offset in range(0, 800, 7)]
+        self.current_dates += [date(2023, 2, 28), date(2023, 3, 1),
+                               date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)]
+        self.numpy = birthday_columns.numpy_module()
+
+    def check_days_to_birthday(self) -> None:
+        """
+        The check_days_to_birthday function compares the days to birthday of the columns
+        with Record.days_to_birthday for every test date.
+        """
+        columns = BirthdayColumns(self.records)
+        for current_date in self.current_dates:
+            expected = [record.days_to_birthday(current_date) for record in self.records]
+            self.assertEqual(columns.days_to_birthday(current_date), expected)
+
+    def test_days_to_birthday_without_numpy(self) -> None:
+        """
+        The test_days_to_birthday_without_numpy function tests the pure Python columns against
+        Record.days_to_birthday, the 29th of February included.
+        """
+        with patch.object(birthday_columns, 'numpy_module', return_value=None), \
+                patch.object(birthday_columns, 'NUMPY_MIN_CONTACTS', 0):
+            self.check_days_to_birthday()
+
+    @unittest.skipIf(birthday_columns.numpy_module() is None, 'NumPy is not installed')
+    def test_days_to_birthday_with_numpy(self) -> None:
+        """
+        The test_days_to_birthday_with_numpy function tests the NumPy columns against
+        Record.days_to_birthday, the 29th of February included.
+        """
+        with patch.object(birthday_columns, 'NUMPY_MIN_CONTACTS', 0):
+            self.check_days_to_birthday()
+
+    def test_small_address_book_skips_numpy(self) -> None:
+        """
+        The test_small_address_book_skips_numpy function tests that NumPy is not imported
+        for fewer contacts than NUMPY_MIN_CONTACTS, and is used from that number on.
+        """
+        with patch.object(birthday_columns, 'numpy_module') as numpy_module:
+            columns = BirthdayColumns(self.records)
+        numpy_module.assert_not_called()
+        self.assertIsNone(columns.np)
+
+        with patch.object(birthday_columns, 'NUMPY_MIN_CONTACTS', len(self.records)), \
+                patch.object(birthday_columns, 'numpy_module') as numpy_module:
+            columns = BirthdayColumns(self.records)
+        numpy_module.assert_called_once_with()
+        self.assertIs(columns.np, numpy_module.return_value)
+
+    def test_ages_and_upcoming_mask(self) -> None:
+        """
+        The test_ages_and_upcoming_mask function tests the ages and the upcoming window with and
+        without NumPy for a date in a year that is not a leap year.
+        """
+        backends = [None] if self.numpy is None else [None, self.numpy]
+        for backend in backends:
+            with patch.object(birthday_columns, 'numpy_module', return_value=backend), \
+                    patch.object(birthday_columns, 'NUMPY_MIN_CONTACTS', 0):
+                columns = BirthdayColumns(self.records)
+            current_date = date(2023, 2, 28)
+
+            self.assertEqual(columns.ages(current_date),
+                             [23, 23, 38, 23, 32, 27, None, 21])
+            self.assertEqual(columns.upcoming_mask(1, current_date),
+                             [False, True, True, True, False, True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
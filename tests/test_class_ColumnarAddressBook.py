@@ -0,0 +1,119 @@
+"""Tests class ColumnarAddressBook"""
+
+import gc
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from personal_helper.entities import Phone, User, Email
+from personal_helper.address_book import Record
+from personal_helper.columnar import ColumnarAddressBook as CAB
+from personal_helper.storage import JournalStorage
+
+
+class TestColumnarAddressBook(unittest.TestCase):
+    """Tests class ColumnarAddressBook"""
+
+    def setUp(self) -> None:
+        self.addressbook_test = CAB()
+        for name, phone in [('sasha', '+380951234567'), ('olya', '0501112233')]:
+            record = Record(User(name))
+            record.add_phone_number(Phone(phone))
+            record.add_email(Email(f'{name}@gmail.com'))
+            self.addressbook_test.add_record(record)
+        gc.collect()
+
+    def tearDown(self) -> None:
+        del self.addressbook_test
+
+    def test_record_is_built_from_columns(self) -> None:
+        """
+        The test_record_is_built_from_columns function tests that a record read back after the
+        added object is gone has the same data, with the leading zero and the plus sign kept.
+        """
+        sasha = self.addressbook_test.get_contact('sasha')
+        olya = self.addressbook_test.get_contact('olya')
+
+        self.assertEqual(sasha.phones(), ['+380951234567'])
+        self.assertEqual(olya.phones(), ['0501112233'])
+        self.assertEqual(olya.email_addresses(), ['olya@gmail.com'])
+        self.assertIs(olya.address_book, self.addressbook_test)
+        self.assertIs(self.addressbook_test.get_contact('olya'), olya)
+
+    def test_phone_that_does_not_pack(self) -> None:
+        """
+        The test_phone_that_does_not_pack function tests that a phone number with other
+        characters or too many digits is kept as it is.
+        """
+        record = Record(User('ivan'))
+        record.add_phone_number(Phone('(050) 111'))
+        record.add_phone_number(Phone('+12345678901234567890'))
+        self.addressbook_test.add_record(record)
+        del record
+        gc.collect()
+
+        self.assertEqual(self.addressbook_test.get_contact('ivan').phones(),
+                         ['(050) 111', '+12345678901234567890'])
+
+    def test_changes_are_written_back(self) -> None:
+        """
+        The test_changes_are_written_back function tests that a change of a record built from the
+        columns reaches the columns, the indexes and the tracked changes.
+        """
+        self.addressbook_test.pop_changes()
+        self.assertEqual(self.addressbook_test.find_by_phone('+380951234567'), ['sasha'])
+
+        contact = self.addressbook_test.get_contact('sasha')
+        contact.change_phone_number(Phone('+380951234567'), Phone('+380957654321'))
+        contact.add_birthday('17-05-1990')
+        del contact
+        gc.collect()
+
+        sasha = self.addressbook_test.get_contact('sasha')
+        self.assertEqual(sasha.phones(), ['+380957654321'])
+        self.assertEqual(sasha.user.birthday_date, date(1990, 5, 17))
+        self.assertEqual(self.addressbook_test.find_by_phone('+380957654321'), ['sasha'])
+        self.assertEqual(self.addressbook_test.find_by_phone('+380951234567'), [])
+        self.assertEqual(list(self.addressbook_test.pop_changes()), ['sasha'])
+
+    def test_delete_and_compact(self) -> None:
+        """
+        The test_delete_and_compact function tests that deleted contacts are gone and that
+        rebuilding the columns keeps the data of the other contacts.
+        """
+        self.addressbook_test.delete_record('olya')
+        for _ in range(3):
+            contact = self.addressbook_test.get_contact('sasha')
+            contact.add_email(Email('sasha@ukr.net'))
+            contact.delete_email(Email('sasha@ukr.net'))
+        self.addressbook_test.data.compact()
+        gc.collect()
+
+        self.assertEqual(list(self.addressbook_test), ['sasha'])
+        self.assertNotIn('olya', self.addressbook_test)
+        self.assertEqual(self.addressbook_test.get_contact('sasha').email_addresses(),
+                         ['sasha@gmail.com'])
+
+    def test_load_and_save_with_journal_storage(self) -> None:
+        """
+        The test_load_and_save_with_journal_storage function tests that the journal storage
+        loads a snapshot into the columns and saves their changes.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, 'address_book.bin')
+            self.addressbook_test.save_records_to_file(file_name)
+            storage = JournalStorage(file_name, book_class=CAB)
+
+            address_book = storage.load()
+            self.assertIsInstance(address_book, CAB)
+            self.assertEqual(list(address_book), ['olya', 'sasha'])
+            address_book.get_contact('olya').add_phone_number(Phone('0509998877'))
+            storage.save(address_book)
+
+            loaded = JournalStorage(file_name, book_class=CAB).load()
+            self.assertEqual(loaded.get_contact('olya').phones(), ['0501112233', '0509998877'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,5 +39,15 @@ class TestEmail(unittest.TestCase):
         self.assertNotEqual(self.email_test, self.email_test_none)
         self.assertNotEqual(self.email_test, self.non_email)
 
+    def test_email_is_immutable(self) -> None:
+        """
+        The test_email_is_immutable function tests that the email address can't be changed after
+        the email is created, so its hash stays the same.
+        """
+        emails = {self.email_test}
+        with self.assertRaises(AttributeError):
+            self.email_test.email = 'olya@ukr.net'
+        self.assertIn(self.email_test_second, emails)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
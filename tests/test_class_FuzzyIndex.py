@@ -0,0 +1,140 @@
+"""Tests class FuzzyIndex"""
+
+import random
+import unittest
+
+from personal_helper.constants import LIST_COMMANDS
+from personal_helper.indexes import FuzzyIndex, edit_distance
+from personal_helper.utils import get_close_command
+
+
+def distance(first: str, second: str) -> int:
+    """Returns the restricted Damerau-Levenshtein distance computed with the full table."""
+    table = [[i + j if not i * j else 0 for j in range(len(second) + 1)] for i in range(len(first) + 1)]
+    for i in range(1, len(first) + 1):
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1, table[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[-1][-1]
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    """Tests class FuzzyIndex"""
+
+    def setUp(self) -> None:
+        self.index = FuzzyIndex()
+        self.index.build(['Alexander', 'Alexandra', 'Olga', 'Olya', 'Sasha', 'sasha'])
+
+    def test_edit_distance(self) -> None:
+        """
+        The test_edit_distance function tests that a letter added, removed, replaced or two
+        neighbouring letters swapped count as one typo each.
+        """
+        for first, second, expected in [
+            ('shwo', 'show', 1),
+            ('serch', 'search', 1),
+            ('sasha', 'sasa', 1),
+            ('olga', 'olya', 1),
+            ('ca', 'abc', 3),
+            ('', 'note', 4),
+            ('whois', 'whois', 0),
+        ]:
+            with self.subTest(first=first, second=second):
+                self.assertEqual(edit_distance(first, second), expected)
+                self.assertEqual(edit_distance(second, first), expected)
+
+    def test_edit_distance_matches_table(self) -> None:
+        """
+        The test_edit_distance_matches_table function tests the bit-parallel edit_distance
+        against the distance table on random texts.
+        """
+        randomizer = random.Random(7)
+        for _ in range(500):
+            first = ''.join(randomizer.choices('abc', k=randomizer.randint(0, 9)))
+            second = ''.join(randomizer.choices('abc', k=randomizer.randint(0, 9)))
+            self.assertEqual(edit_distance(first, second), distance(first, second), (first, second))
+
+    def test_suggest(self) -> None:
+        """
+        The test_suggest function tests that the names closest to a text are returned first,
+        ignoring case, and that names too far from it are left out.
+        """
+        self.assertEqual(self.index.suggest('alexandr'), ['Alexander', 'Alexandra'])
+        self.assertEqual(self.index.suggest('OLYA'), ['Olya', 'Olga'])
+        self.assertEqual(self.index.suggest('sahsa', limit=1), ['Sasha'])
+        self.assertEqual(self.index.suggest('Victoria'), [])
+
+    def test_add_and_remove(self) -> None:
+        """
+        The test_add_and_remove function tests that the names added and removed are found
+        and left out by the next searches.
+        """
+        self.index.add('Oleg')
+        self.index.remove('Olga')
+        self.index.remove('Sasha')
+
+        self.assertEqual(self.index.suggest('olgg'), ['Oleg'])
+        self.assertEqual(self.index.suggest('sasha'), ['sasha'])
+        self.assertEqual(len(self.index), 5)
+
+    def test_suggest_matches_brute_force(self) -> None:
+        """
+        The test_suggest_matches_brute_force function tests that the search finds the same
+        names as comparing the text with every name.
+        """
+        randomizer = random.Random(3)
+        names = {''.join(randomizer.choices('abcde', k=randomizer.randint(2, 9))) for _ in range(800)}
+        index = FuzzyIndex()
+        index.build(names)
+        for _ in range(200):
+            text = ''.join(randomizer.choices('abcde', k=randomizer.randint(1, 9)))
+            typos = FuzzyIndex.typos(text)
+            expected = sorted((distance(text, name), name) for name in names if distance(text, name) <= typos)
+            self.assertEqual(index.suggest(text, limit=len(names)), [name for _, name in expected], text)
+
+    def test_similar(self) -> None:
+        """
+        The test_similar function tests that the names are ranked by the share of their trigrams
+        with the text, ignoring case, and that names less similar than the threshold are left out.
+        """
+        self.index.build(['Oleksandr', 'Aleksandr'])
+
+        self.assertEqual(self.index.similar('Aleksandr', 2), [('Aleksandr', 1.0), ('Oleksandr', 8 / 14)])
+        self.assertEqual([name for name, _ in self.index.similar('SASHA')], ['Sasha', 'sasha'])
+        self.assertEqual(self.index.similar('Victoria'), [])
+        self.assertEqual(len(self.index.similar('Olga', threshold=0.0)), 6)
+
+    def test_similar_matches_brute_force(self) -> None:
+        """
+        The test_similar_matches_brute_force function tests that the scores counted from the
+        posting lists give the same names as comparing the trigrams of the text with every name.
+        """
+        randomizer = random.Random(5)
+        names = {''.join(randomizer.choices('abcdef', k=randomizer.randint(3, 9))) for _ in range(800)}
+        index = FuzzyIndex()
+        index.build(names)
+        for _ in range(200):
+            text = ''.join(randomizer.choices('abcdef', k=randomizer.randint(2, 9)))
+            limit = randomizer.choice([1, 5, 20])
+            grams = index.ngrams(text)
+            scores = sorted(
+                (-len(grams & index.ngrams(name)) / len(grams | index.ngrams(name)), name) for name in names
+            )
+            expected = [(name, -score) for score, name in scores if -score >= FuzzyIndex.MIN_SIMILARITY]
+            self.assertEqual(index.similar(text, limit), expected[:limit], text)
+
+    def test_get_close_command(self) -> None:
+        """
+        The test_get_close_command function tests that a mistyped command is matched to the
+        closest command of pbot, and that a text unlike any command is not.
+        """
+        self.assertEqual(get_close_command(LIST_COMMANDS, 'serch'), 'search')
+        self.assertEqual(get_close_command(LIST_COMMANDS, 'shwo'), 'show')
+        self.assertEqual(get_close_command(LIST_COMMANDS, 'exprot'), 'export')
+        self.assertIsNone(get_close_command(LIST_COMMANDS, 'xyz'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,404 @@
+"""Tests class JournalStorage"""
+
+import io
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from typing import Any, Callable
+from unittest.mock import patch
+
+from personal_helper import commands
+from personal_helper.entities import Phone, User, Email
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.indexes import PhoneDirectory
+from personal_helper.snapshot import LazyRecords, read_snapshot
+from personal_helper.storage import FRAME_HEADER, ConflictError, JournalStorage
+from personal_helper.validation import check_email_not_in_address_book, contact_has_email
+
+WRITERS = 6
+COMMITS = 15
+
+
+def write_contacts(file_name: str, writer: int) -> None:
+    """
+    Commits COMMITS times a phone number added to sasha together with a new contact,
+    loading the address book again after every conflict.
+    """
+    storage = JournalStorage(file_name, compact_size=2048, compact_ratio=0)
+    for commit in range(COMMITS):
+        while True:
+            address_book = storage.load()
+            address_book.get_contact('sasha').add_phone_number(
+                Phone(f'38050{writer:02d}{commit:05d}'))
+            address_book.add_record(Record(User(f'w{writer}_{commit}')))
+            try:
+                storage.save(address_book)
+                break
+            except ConflictError:
+                continue
+
+
+def read_contacts(file_name: str, stop: multiprocessing.Event, errors: multiprocessing.Queue) -> None:
+    """
+    Loads the address book until stop is set and reports every load in which the number of
+    the phone numbers of sasha does not match the number of the new contacts.
+    """
+    storage = JournalStorage(file_name)
+    while not stop.is_set():
+        address_book = storage.load()
+        phones = len(address_book.get_contact('sasha').phones()) - 1
+        contacts = sum(name.startswith('w') for name in address_book)
+        if phones != contacts:
+            errors.put((phones, contacts))
+
+
+class TestJournalStorage(unittest.TestCase):
+    """Tests class JournalStorage"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file = os.path.join(self.temp_dir.name, 'address_book.bin')
+        self.storage = JournalStorage(self.test_file)
+
+        address_book = AB()
+        for name in ['sasha', 'olya']:
+            record = Record(User(name))
+            record.add_phone_number(Phone('380951234567' if name == 'sasha' else '380501112233'))
+            address_book.add_record(record)
+        address_book.save_records_to_file(self.test_file)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def save_many_contacts(self, count: int) -> None:
+        """
+        Saves a snapshot of count contacts named c0, c1 and so on with one phone number each,
+        and an email in the gmail.com domain for every hundredth of them.
+        """
+        address_book = AB()
+        for number in range(count):
+            record = Record(User(f'c{number}'))
+            record.add_phone_number(Phone(f'+38050{number:07d}'))
+            if number % 100 == 0:
+                record.add_email(Email(f'c{number}@gmail.com'))
+            address_book.add_record(record)
+        address_book.save_records_to_file(self.test_file)
+
+    def run_counting_reads(self, command: Callable[..., Any], *args: Any) -> tuple[int, str]:
+        """
+        Runs the command on the storage and returns the number of the records read from the
+        snapshot file and the output.
+        """
+        reads = []
+        read = LazyRecords._read
+
+        def counted_read(records: LazyRecords, position: int) -> bytes:
+            reads.append(position)
+            return read(records, position)
+
+        output = io.StringIO()
+        with patch.object(commands, 'STORAGE', self.storage), \
+                patch.object(LazyRecords, '_read', counted_read), redirect_stdout(output):
+            command(*args)
+        return len(reads), output.getvalue()
+
+    def test_load_snapshot_without_journal(self) -> None:
+        """
+        The test_load_snapshot_without_journal function tests that a file written by
+        save_records_to_file loads without a journal and without pending changes.
+        """
+        address_book = self.storage.load()
+
+        self.assertEqual(list(address_book), ['olya', 'sasha'])
+        self.assertEqual(address_book.pop_changes(), {})
+
+    def test_save_appends_only_changes(self) -> None:
+        """
+        The test_save_appends_only_changes function tests that a save leaves the snapshot as it
+        is, appends the changed contacts to the journal and that a new load replays them.
+        """
+        snapshot = os.path.getmtime(self.test_file), os.path.getsize(self.test_file)
+        address_book = self.storage.load()
+        address_book.get_contact('sasha').add_email(Email('sasha@gmail.com'))
+        address_book.delete_record('olya')
+        address_book.add_record(Record(User('ivan')))
+        self.storage.save(address_book)
+
+        self.assertEqual(
+            (os.path.getmtime(self.test_file), os.path.getsize(self.test_file)), snapshot)
+        self.assertTrue(os.path.exists(self.storage.journal_name))
+
+        loaded = JournalStorage(self.test_file).load()
+        self.assertEqual(list(loaded), ['ivan', 'sasha'])
+        self.assertEqual(loaded.get_contact('sasha').email_addresses(), ['sasha@gmail.com'])
+
+    def test_load_drops_incomplete_frame(self) -> None:
+        """
+        The test_load_drops_incomplete_frame function tests that a frame cut short at the end of
+        the journal is ignored on load and overwritten by the next save.
+        """
+        address_book = self.storage.load()
+        address_book.add_record(Record(User('ivan')))
+        self.storage.save(address_book)
+        with open(self.storage.journal_name, 'ab') as file:
+            file.write(b'\x10\x00\x00\x00broken')
+
+        storage = JournalStorage(self.test_file)
+        address_book = storage.load()
+        self.assertEqual(list(address_book), ['ivan', 'olya', 'sasha'])
+
+        address_book.add_record(Record(User('yana')))
+        storage.save(address_book)
+        self.assertEqual(list(JournalStorage(self.test_file).load()),
+                         ['ivan', 'olya', 'sasha', 'yana'])
+
+    def test_save_compacts_large_journal(self) -> None:
+        """
+        The test_save_compacts_large_journal function tests that the journal is folded into the
+        snapshot once it grows larger than the compaction size.
+        """
+        storage = JournalStorage(self.test_file, compact_size=0, compact_ratio=0)
+        address_book = storage.load()
+        address_book.add_record(Record(User('ivan')))
+        storage.save(address_book)
+
+        self.assertFalse(os.path.exists(storage.journal_name))
+        self.assertEqual(list(AB.from_file(self.test_file)), ['ivan', 'olya', 'sasha'])
+
+    def test_save_applies_changes_of_other_writers(self) -> None:
+        """
+        The test_save_applies_changes_of_other_writers function tests that a save commits on top
+        of the changes another storage saved to other contacts since the load.
+        """
+        first, second = JournalStorage(self.test_file), JournalStorage(self.test_file)
+        first_book, second_book = first.load(), second.load()
+        first_book.add_record(Record(User('ivan')))
+        second_book.get_contact('olya').add_email(Email('olya@gmail.com'))
+        first.save(first_book)
+        second.save(second_book)
+
+        self.assertEqual(list(second_book), ['ivan', 'olya', 'sasha'])
+        loaded = JournalStorage(self.test_file).load()
+        self.assertEqual(list(loaded), ['ivan', 'olya', 'sasha'])
+        self.assertEqual(loaded.get_contact('olya').email_addresses(), ['olya@gmail.com'])
+
+    def test_save_raises_conflict_on_same_contact(self) -> None:
+        """
+        The test_save_raises_conflict_on_same_contact function tests that a save of a contact
+        changed by another storage since the load raises ConflictError and writes nothing.
+        """
+        first, second = JournalStorage(self.test_file), JournalStorage(self.test_file)
+        first_book, second_book = first.load(), second.load()
+        first_book.get_contact('sasha').add_email(Email('sasha@gmail.com'))
+        second_book.get_contact('sasha').add_email(Email('sasha@ukr.net'))
+        first.save(first_book)
+
+        with self.assertRaises(ConflictError) as error:
+            second.save(second_book)
+        self.assertEqual(error.exception.names, ['sasha'])
+        loaded = JournalStorage(self.test_file).load()
+        self.assertEqual(loaded.get_contact('sasha').email_addresses(), ['sasha@gmail.com'])
+
+    def test_save_raises_conflict_after_compaction(self) -> None:
+        """
+        The test_save_raises_conflict_after_compaction function tests that a save raises
+        ConflictError when another storage committed and compacted since the load.
+        """
+        first = JournalStorage(self.test_file, compact_size=0, compact_ratio=0)
+        second = JournalStorage(self.test_file)
+        first_book, second_book = first.load(), second.load()
+        first_book.add_record(Record(User('ivan')))
+        second_book.add_record(Record(User('yana')))
+        first.save(first_book)
+
+        with self.assertRaises(ConflictError):
+            second.save(second_book)
+
+    def test_phone_commands_read_one_record(self) -> None:
+        """
+        The test_phone_commands_read_one_record function tests that the check that a phone
+        number has no other owner takes the phone numbers from the snapshot, so changing the
+        phone number of a contact reads only that contact and adding a contact reads none.
+        """
+        self.save_many_contacts(2000)
+
+        reads, output = self.run_counting_reads(
+            commands.change_phone_number_contact, 'c10', '380990000010', '380500000010')
+        self.assertEqual(reads, 1)
+        self.assertIn("The contact 'c10' has been updated", output)
+
+        reads, output = self.run_counting_reads(commands.add_contact, 'Newcomer', '380990000011')
+        self.assertEqual(reads, 0)
+        self.assertIn("The contact 'Newcomer' has been added", output)
+
+    def test_email_checks_read_no_records(self) -> None:
+        """
+        The test_email_checks_read_no_records function tests that the email checks look the
+        owners up in the emails saved in the snapshot, so they read no record and adding an
+        email to a contact reads only that contact.
+        """
+        self.save_many_contacts(2000)
+        address_book = self.storage.load()
+
+        reads, _ = self.run_counting_reads(
+            lambda: self.assertTrue(contact_has_email(address_book, Email('C100@gmail.com'), 'c100')))
+        self.assertEqual(reads, 0)
+        reads, _ = self.run_counting_reads(
+            lambda: self.assertFalse(contact_has_email(address_book, Email('c100@gmail.com'), 'c101')))
+        self.assertEqual(reads, 0)
+        reads, _ = self.run_counting_reads(
+            check_email_not_in_address_book, address_book, Email('c200@gmail.com'), 'c200')
+        self.assertEqual(reads, 0)
+
+        reads, output = self.run_counting_reads(commands.add_email_to_contact, 'c5', 'c5@ukr.net')
+        self.assertEqual(reads, 1)
+        self.assertIn("The email 'c5@ukr.net' has been successfully added", output)
+
+    def test_concurrent_readers_build_and_load_once(self) -> None:
+        """
+        The test_concurrent_readers_build_and_load_once function tests that the threads that
+        ask a lazily loaded address book for the same index or record at once, as the read
+        commands of the server do, get the same index built once and the same record read once.
+        """
+        self.save_many_contacts(200)
+        address_book = self.storage.load()
+        builds, reads = [], []
+        build, read = PhoneDirectory.build, LazyRecords._read
+        workers = 8
+        barrier = threading.Barrier(workers)
+
+        def slow_build(index: PhoneDirectory, contacts: Any) -> None:
+            builds.append(index)
+            time.sleep(0.05)
+            build(index, contacts)
+
+        def slow_read(records: LazyRecords, position: int) -> bytes:
+            reads.append(position)
+            time.sleep(0.05)
+            return read(records, position)
+
+        def read_book(_: int) -> tuple[Any, Any]:
+            barrier.wait()
+            return address_book.phone_directory, address_book.get_contact('c42')
+
+        with patch.object(PhoneDirectory, 'build', slow_build), \
+                patch.object(LazyRecords, '_read', slow_read), ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(read_book, range(workers)))
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(len({id(directory) for directory, _ in results}), 1)
+        self.assertEqual(len({id(record) for _, record in results}), 1)
+        self.assertEqual(address_book.find_by_phone('+380500000042'), ['c42'])
+
+    def test_whois_reads_only_owners(self) -> None:
+        """
+        The test_whois_reads_only_owners function tests that the owners of a phone number, an
+        email and an email domain are looked up in the sections of the snapshot, so whois
+        reads only the records of the owners it prints.
+        """
+        self.save_many_contacts(2000)
+        address_book = self.storage.load()
+        address_book.get_contact('c7').add_email(Email('c7@ukr.net'))
+        self.storage.save(address_book)
+
+        reads, output = self.run_counting_reads(commands.whois_phone_number, '+380500001234')
+        self.assertEqual(reads, 1)
+        self.assertIn('c1234', output)
+
+        reads, output = self.run_counting_reads(commands.whois_email, 'C200@gmail.com')
+        self.assertEqual(reads, 1)
+        self.assertIn('c200', output)
+
+        reads, output = self.run_counting_reads(commands.whois_email, 'C7@ukr.net')
+        self.assertEqual(reads, 0)
+        self.assertIn('c7', output)
+
+        reads, output = self.run_counting_reads(commands.whois_domain, 'gmail.com')
+        self.assertEqual(reads, 20)
+        self.assertIn('c1900', output)
+
+    def test_phone_owner_check_follows_journal(self) -> None:
+        """
+        The test_phone_owner_check_follows_journal function tests that the phone numbers of the
+        snapshot are combined with the changes of the journal: a phone number that was moved
+        to another contact is free and the new one is taken.
+        """
+        self.save_many_contacts(20)
+        address_book = self.storage.load()
+        address_book.get_contact('c1').change_phone_number(Phone('+380500000001'), Phone('+380990000001'))
+        self.storage.save(address_book)
+
+        self.assertEqual(self.storage.load().find_by_phone('380500000001'), [])
+        self.assertEqual(self.storage.load().find_by_phone('380990000001'), ['c1'])
+        _, output = self.run_counting_reads(commands.add_contact, 'Newcomer', '380500000001')
+        self.assertIn("The contact 'Newcomer' has been added", output)
+        with self.assertRaises(SystemExit):
+            self.run_counting_reads(commands.add_contact, 'Other', '380990000001')
+
+    def test_load_closes_snapshot_of_retried_load(self) -> None:
+        """
+        The test_load_closes_snapshot_of_retried_load function tests that a load that meets
+        frames which do not follow its snapshot, so it has to be retried, closes the snapshot.
+        """
+        payload = pickle.dumps((3, [('ivan', Record(User('ivan')))]))
+        with open(self.storage.journal_name, 'wb') as file:
+            file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+        opened = []
+
+        def recorded_read_snapshot(file_name: str) -> LazyRecords:
+            opened.append(read_snapshot(file_name))
+            return opened[-1]
+
+        with patch('personal_helper.storage.read_snapshot', recorded_read_snapshot):
+            self.assertIsNone(self.storage._load())
+        self.assertTrue(opened[0]._file.closed)
+
+    def test_lazy_records_close_with_block(self) -> None:
+        """
+        The test_lazy_records_close_with_block function tests that the snapshot file of
+        LazyRecords is closed at the end of their with block.
+        """
+        with read_snapshot(self.test_file) as records:
+            self.assertEqual(records['sasha'].phones(), ['380951234567'])
+        self.assertTrue(records._file.closed)
+
+    def test_concurrent_writer_processes(self) -> None:
+        """
+        The test_concurrent_writer_processes function tests that many processes committing to
+        the same contact at once, with compactions in between, lose none of the commits, and
+        that a process loading at the same time always sees whole commits.
+        """
+        stop, errors = multiprocessing.Event(), multiprocessing.Queue()
+        reader = multiprocessing.Process(target=read_contacts, args=(self.test_file, stop, errors))
+        writers = [
+            multiprocessing.Process(target=write_contacts, args=(self.test_file, writer))
+            for writer in range(WRITERS)
+        ]
+        reader.start()
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join()
+        stop.set()
+        reader.join()
+
+        self.assertTrue(all(process.exitcode == 0 for process in writers))
+        self.assertTrue(errors.empty())
+        address_book = JournalStorage(self.test_file).load()
+        self.assertEqual(
+            len(address_book.get_contact('sasha').phones()), WRITERS * COMMITS + 1)
+        self.assertEqual(
+            sum(name.startswith('w') for name in address_book), WRITERS * COMMITS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,18 @@ class TestPhone(unittest.TestCase):
         phone_test_invalid = '380951234567'
         self.assertNotEqual(phone_test_invalid, self.phone_test)
 
+    def test_hash_phones(self) -> None:
+        """The test_hash_phones function tests that equal phone numbers hash alike and have no __dict__."""
+        self.assertEqual(hash(Phone('380951234567')), hash(self.phone_test))
+        self.assertEqual(len({Phone('380951234567'), self.phone_test}), 1)
+        self.assertFalse(hasattr(self.phone_test, '__dict__'))
+
+    def test_phone_is_immutable(self) -> None:
+        """The test_phone_is_immutable function tests that the phone number can't be changed after it is created."""
+        with self.assertRaises(AttributeError):
+            self.phone_test.phone = '380501112233'
+        self.assertEqual(self.phone_test.phone, '380951234567')
+
     def test_sanitize_phone_number(self) -> None:
         """
         The test_sanitize_phone_number function tests the sanitize_phone_number function in Phone.py
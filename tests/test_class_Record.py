@@ -1,11 +1,24 @@
 """Test class Record"""
 
+import pickle
 import unittest
 from datetime import date, datetime
 
 from personal_helper.entities import Phone, User, Email
 from personal_helper.address_book import Record
 
+# A record pickled by the earlier versions, with a Subrecord around the phone number and the email.
+OLD_RECORD = (
+    b'\x80\x04\x95m\x01\x00\x00\x00\x00\x00\x00\x8c\x1cpersonal_helper.address_book\x94'
+    b'\x8c\x06Record\x94\x93\x94)\x81\x94}\x94(\x8c\x04user\x94\x8c\x18personal_helper.entities'
+    b'\x94\x8c\x04User\x94\x93\x94)\x81\x94}\x94(\x8c\x14_User__birthday_date\x94\x8c\x08datetime'
+    b'\x94\x8c\x04date\x94\x93\x94C\x04\x07\xc6\x05\x11\x94\x85\x94R\x94\x8c\x0b_User__name\x94'
+    b'\x8c\x05sasha\x94ub\x8c\rphone_numbers\x94]\x94h\x00\x8c\x10Record.Subrecord\x94\x93\x94)'
+    b'\x81\x94}\x94\x8c\tsubrecord\x94h\x06\x8c\x05Phone\x94\x93\x94)\x81\x94}\x94\x8c\r_Phone__phone'
+    b'\x94\x8c\x0c380951234567\x94sbsba\x8c\x06emails\x94]\x94h\x17)\x81\x94}\x94h\x1ah\x06\x8c\x05'
+    b'Email\x94\x93\x94)\x81\x94}\x94\x8c\r_Email__email\x94\x8c\x0fsasha@gmail.com\x94sbsbaub.'
+)
+
 
 class TestRecord(unittest.TestCase):
     """Tests class Record"""
@@ -31,7 +44,7 @@ class TestRecord(unittest.TestCase):
         numbers for that record.
         """
 
-        self.assertEqual(self.record_test.phone_numbers[0].subrecord, Phone('380951234567'))
+        self.assertEqual(self.record_test.phone_numbers[0], Phone('380951234567'))
 
     def test_change_phone_number(self) -> None:
         """
@@ -41,7 +54,7 @@ class TestRecord(unittest.TestCase):
         """
         new_phone = Phone('380951234500')
         self.record_test.change_phone_number(self.phone_test, new_phone)
-        self.assertEqual(self.record_test.phone_numbers[0].subrecord, new_phone)
+        self.assertEqual(self.record_test.phone_numbers[0], new_phone)
 
     def test_delete_phone_number(self) -> None:
         """
@@ -58,19 +71,19 @@ class TestRecord(unittest.TestCase):
             The test_add_email function takes a self parameter, which is an instance of the TestRecord class.
             The assertEquals method compares two values and returns True if they are equal, or False otherwise.
         """
-        self.assertEqual(self.record_test.emails[0].subrecord, Email('test_sasha@gmail.com'))
+        self.assertEqual(self.record_test.emails[0], Email('test_sasha@gmail.com'))
 
     def test_change_email(self) -> None:
         """
         The test_edit_email function tests the edit_email function in Record.py
             It creates a new email object and then calls the edit_email function on it, passing in
-            an old email object and a new one. The test checks to see if the subrecord of emails[0] is equal to 
+            an old email object and a new one. The test checks to see if emails[0] is equal to 
             our newly created email.
         """
 
         new_email = Email('test_pasha@gmail.com')
         self.record_test.change_email(self.email_test, new_email)
-        self.assertEqual(self.record_test.emails[0].subrecord, new_email)
+        self.assertEqual(self.record_test.emails[0], new_email)
 
     def test_delete_email(self) -> None:
         """
@@ -88,27 +101,75 @@ class TestRecord(unittest.TestCase):
         The test_add_birthday function tests the add_birthday function in the Record class.
         It takes a date object as an argument and adds it to the birthday attribute of a record instance.
         """
+        old_user = self.record_test.user
+        users = {old_user}
         self.record_test.add_birthday('26-06-1982')
         self.assertEqual(self.record_test.user.birthday_date, date(1982, 6, 26))
+        self.assertIsNone(old_user.birthday_date)
+        self.assertIn(old_user, users)
+
+    def test_days_to_birthday(self) -> None:
+        """
+        The test_days_to_birthday function tests the days_to_birthday function in Record.py
+            It does this by creating a mock date and then comparing it to the birthday of a record object.
+            If they are equal, then the test passes.
+        """
+        current_date = datetime(2023, 1, 1)
+
+        self.record_test.add_birthday('1-1-2000')
+        self.assertEqual(self.record_test.days_to_birthday(current_date), 0)
+
+        self.record_test.add_birthday('2-1-2000')
+        self.assertEqual(self.record_test.days_to_birthday(current_date), 1)
+
+        self.record_test.add_birthday('31-12-2000')
+        self.assertEqual(self.record_test.days_to_birthday(date(2023, 1, 1)), 364)
+
+    def test_days_to_birthday_29_february(self) -> None:
+        """
+        The test_days_to_birthday_29_february function tests that a birthday on the 29th of February
+        is counted to the 28th of February in the years that are not leap years.
+        """
+        self.record_test.add_birthday('29-02-2000')
+
+        self.assertEqual(self.record_test.days_to_birthday(date(2023, 2, 27)), 1)
+        self.assertEqual(self.record_test.days_to_birthday(date(2023, 2, 28)), 0)
+        self.assertEqual(self.record_test.days_to_birthday(date(2024, 2, 28)), 1)
+        self.assertEqual(self.record_test.days_to_birthday(date(2023, 3, 1)), 365)
+
+    def test_days_to_birthday_none(self) -> None:
+        """
+        The test_days_to_birthday_none function tests the days_to_birthday function in Record.py
+            to see if it returns None when the record has no birthday.
+        """
+        current_date = datetime(2023, 1, 1)
+        self.assertEqual(self.record_test.days_to_birthday(current_date), None)
+
+    def test_pickle_round_trip(self) -> None:
+        """
+        The test_pickle_round_trip function tests that a record keeps its user, phone numbers and
+        emails through pickle and is not attached to any address book after it.
+        """
+        self.record_test.add_birthday('26-06-1982')
+        record = pickle.loads(pickle.dumps(self.record_test))
+
+        self.assertEqual(record.user, self.record_test.user)
+        self.assertEqual(record.phone_numbers, [self.phone_test])
+        self.assertEqual(record.emails, [self.email_test])
+        self.assertIsNone(record.address_book)
+
+    def test_unpickle_old_record(self) -> None:
+        """
+        The test_unpickle_old_record function tests that a record pickled by the earlier versions
+        loads with its phone numbers and emails unwrapped from their Subrecord.
+        """
+        record = pickle.loads(OLD_RECORD)
 
-    # def test_days_to_birthday(self) -> None:
-    #     """
-    #     The test_days_to_birthday function tests the days_to_birthday function in Record.py
-    #         It does this by creating a mock date and then comparing it to the birthday of a record object.
-    #         If they are equal, then the test passes.
-    #     """
-    #     current_date = datetime(2023, 1, 1)
-        
-    #     self.record_test.add_birthday('1-1-2000')
-    #     self.assertEqual(self.record_test.days_to_birthday(current_date), 0)
-
-    # def test_days_to_birthday_none(self) -> None:
-    #     """
-    #     The test_days_to_birthday_none function tests the days_to_birthday function in Record.py
-    #         to see if it returns None when the current date is after the birthday of a record.
-    #     """
-    #     current_date = datetime(2023, 1, 1)
-    #     self.assertEqual(self.record_test.days_to_birthday(current_date), None)
+        self.assertEqual(record.user.name, 'sasha')
+        self.assertEqual(record.user.birthday_date, date(1990, 5, 17))
+        self.assertEqual(record.phone_numbers, [Phone('380951234567')])
+        self.assertEqual(record.emails, [Email('sasha@gmail.com')])
+        self.assertIsNone(record.address_book)
 
 if __name__ == '__main__':
     unittest.main()
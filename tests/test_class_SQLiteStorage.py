@@ -0,0 +1,117 @@
+"""Tests class SQLiteStorage"""
+
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from personal_helper.entities import Phone, User, Email
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.storage import JournalStorage
+from personal_helper.sqlite_storage import SQLiteStorage
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Tests class SQLiteStorage"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file = os.path.join(self.temp_dir.name, 'address_book.sqlite3')
+        self.storage = SQLiteStorage(self.test_file)
+
+        address_book = AB()
+        sasha = Record(User('sasha', date(1990, 5, 10)))
+        sasha.add_phone_number(Phone('380951234567'))
+        sasha.add_email(Email('sasha@gmail.com'))
+        address_book.add_record(sasha)
+        olya = Record(User('olya', date(1995, 5, 12)))
+        olya.add_phone_number(Phone('380501112233'))
+        olya.add_email(Email('olya@ukr.net'))
+        address_book.add_record(olya)
+        address_book.add_record(Record(User('Oleg')))
+        self.storage.replace(address_book)
+
+    def tearDown(self) -> None:
+        self.storage.connection.close()
+        self.temp_dir.cleanup()
+
+    def test_load_reads_contacts(self) -> None:
+        """
+        The test_load_reads_contacts function tests that the contacts written by replace
+        are read back with their phones, emails and birthdays.
+        """
+        address_book = SQLiteStorage(self.test_file).load()
+
+        self.assertEqual(len(address_book), 3)
+        self.assertEqual(list(address_book), ['Oleg', 'olya', 'sasha'])
+        self.assertIn('olya', address_book)
+        self.assertNotIn('ivan', address_book)
+        sasha = address_book.get_contact('sasha')
+        self.assertIs(sasha, address_book['sasha'])
+        self.assertEqual(sasha.phones(), ['380951234567'])
+        self.assertEqual(sasha.email_addresses(), ['sasha@gmail.com'])
+        self.assertEqual(sasha.user.birthday_date, date(1990, 5, 10))
+
+    def test_changes_are_committed_by_save(self) -> None:
+        """
+        The test_changes_are_committed_by_save function tests that the edits of a record and the
+        added and deleted contacts are written to the database and kept after save.
+        """
+        address_book = self.storage.load()
+        address_book.get_contact('sasha').add_phone_number(Phone('380671234567'))
+        address_book.delete_record('olya')
+        address_book.add_record(Record(User('ivan')))
+        self.storage.save(address_book)
+
+        loaded = SQLiteStorage(self.test_file).load()
+        self.assertEqual(list(loaded), ['Oleg', 'ivan', 'sasha'])
+        self.assertEqual(loaded['sasha'].phones(), ['380951234567', '380671234567'])
+        self.assertEqual(loaded.find_by_phone('380501112233'), [])
+
+    def test_queries(self) -> None:
+        """
+        The test_queries function tests that the searches and lookups run on the database
+        give the same results as the AddressBook ones.
+        """
+        address_book = self.storage.load()
+
+        self.assertEqual(list(address_book.search('ol')), ['Oleg', 'olya'])
+        self.assertEqual(list(address_book.search('0951')), ['sasha'])
+        self.assertIsInstance(address_book.search('zz'), str)
+        self.assertEqual(address_book.find_by_phone('+380951234567'), ['sasha'])
+        self.assertEqual(address_book.find_by_email('OLYA@ukr.net'), ['olya'])
+        self.assertEqual(address_book.find_by_domain('gmail.com'), ['sasha'])
+        self.assertEqual(address_book.complete_name('OL'), ['Oleg', 'olya'])
+        self.assertEqual(address_book.complete_name('ol', 1), ['Oleg'])
+
+    def test_upcoming_birthdays(self) -> None:
+        """
+        The test_upcoming_birthdays function tests that the birthdays in the window are found
+        by the birthday bucket and ordered by the days left.
+        """
+        address_book = self.storage.load()
+
+        upcoming = address_book.upcoming_birthdays(3, date(2023, 5, 10))
+        self.assertEqual([record.user.name for record in upcoming], ['sasha', 'olya'])
+        upcoming = address_book.upcoming_birthdays(1, date(2023, 5, 10))
+        self.assertEqual([record.user.name for record in upcoming], ['sasha'])
+
+    def test_migrate_from_journal(self) -> None:
+        """
+        The test_migrate_from_journal function tests that the address book of a JournalStorage
+        is copied to SQLite and back unchanged.
+        """
+        journal_file = os.path.join(self.temp_dir.name, 'address_book.bin')
+        JournalStorage(journal_file).replace(self.storage.load())
+
+        storage = SQLiteStorage(os.path.join(self.temp_dir.name, 'copy.sqlite3'))
+        storage.replace(JournalStorage(journal_file).load())
+        address_book = storage.load()
+
+        self.assertEqual(list(address_book), ['Oleg', 'olya', 'sasha'])
+        self.assertEqual(address_book['olya'].email_addresses(), ['olya@ukr.net'])
+        storage.connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
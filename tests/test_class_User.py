@@ -23,12 +23,24 @@ class TestUser(unittest.TestCase):
 
     def test_set_birthday_date(self) -> None:
         """
-        The test_set_birthday_date function tests the setter for birthday_date.
-        It sets the birthday_date to &quot;01-01-2000&quot; and then checks that it is equal to date(2000, 1, 1)
+        The test_set_birthday_date function tests that the birthday date is set when the user is created.
         """
-        self.user_test.birthday_date = date(2000, 1, 1)
-        self.assertEqual(self.user_test.birthday_date, date(2000, 1, 1))
+        user = User('Sasha', date(2000, 1, 1))
+        self.assertEqual(user.birthday_date, date(2000, 1, 1))
+        self.assertIsNone(self.user_test.birthday_date)
 
+    def test_user_is_immutable(self) -> None:
+        """
+        The test_user_is_immutable function tests that the attributes of a user can't be changed,
+        so a user kept in a set is still found there.
+        """
+        users = {self.user_test}
+        with self.assertRaises(AttributeError):
+            self.user_test.birthday_date = date(2000, 1, 1)
+        with self.assertRaises(AttributeError):
+            self.user_test.name = 'Olya'
+        self.assertIn(self.user_test, users)
+        self.assertIn(User('Sasha'), users)
 
 if __name__ == '__main__':
     unittest.main()
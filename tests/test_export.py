@@ -0,0 +1,150 @@
+"""Tests export"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest.mock import patch
+
+from personal_helper import commands
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.entities import Email, Phone, User
+from personal_helper.exporter import export_contacts
+from personal_helper.importer import import_contacts
+from personal_helper.storage import JournalStorage
+
+
+class TestExport(unittest.TestCase):
+    """Tests export"""
+
+    def setUp(self) -> None:
+        self.address_book = AB()
+        record = Record(User('sasha', date(1990, 5, 17)))
+        record.add_phone_number(Phone('+380951234567'))
+        record.add_phone_number(Phone('+380501112233'))
+        record.add_email(Email('sasha@gmail.com'))
+        self.address_book.add_record(record)
+        self.address_book.add_record(Record(User('olya')))
+
+    def export(self, file_format: str, address_book: AB | None = None) -> str:
+        """
+        Exports the address book in the format and returns the text.
+        """
+        output = io.StringIO(newline='')
+        count = export_contacts(address_book or self.address_book, output, file_format)
+        self.assertEqual(count, 2)
+        return output.getvalue()
+
+    def test_export_csv_imports_back(self) -> None:
+        """
+        The test_export_csv_imports_back function tests that a CSV export in name order is read
+        back by the import into the same contacts.
+        """
+        text = self.export('csv')
+        self.assertEqual(text.splitlines()[:2], [
+            'name,phones,emails,birthday',
+            'olya,,,',
+        ])
+
+        imported = AB()
+        import_contacts(imported, io.StringIO(text), 'csv', io.StringIO(), workers=1)
+        sasha = imported.get_contact('sasha')
+        self.assertEqual(list(imported), ['olya', 'sasha'])
+        self.assertEqual(sasha.phones(), ['+380951234567', '+380501112233'])
+        self.assertEqual(sasha.email_addresses(), ['sasha@gmail.com'])
+        self.assertEqual(sasha.user.birthday_date, date(1990, 5, 17))
+
+    def test_export_jsonl(self) -> None:
+        """
+        The test_export_jsonl function tests that every contact is one JSON object per line.
+        """
+        rows = [json.loads(line) for line in self.export('jsonl').splitlines()]
+
+        self.assertEqual(rows[1], {
+            'name': 'sasha',
+            'phones': ['+380951234567', '+380501112233'],
+            'emails': ['sasha@gmail.com'],
+            'birthday': '17-05-1990',
+        })
+
+    def test_export_vcf(self) -> None:
+        """
+        The test_export_vcf function tests that every contact is a vCard with CRLF line ends
+        and that the special characters of the text values are escaped.
+        """
+        self.address_book.get_contact('olya').add_email(Email('olya;work@gmail.com'))
+        text = self.export('vcf')
+
+        self.assertEqual(text.count('BEGIN:VCARD\r\n'), 2)
+        self.assertIn('EMAIL;TYPE=INTERNET:olya\\;work@gmail.com\r\n', text)
+        self.assertIn('TEL;TYPE=CELL:+380501112233\r\n', text)
+        self.assertIn('BDAY:1990-05-17\r\n', text)
+
+    def test_export_does_not_keep_records_of_snapshot(self) -> None:
+        """
+        The test_export_does_not_keep_records_of_snapshot function tests that exporting a book
+        opened from a snapshot file reads every record without keeping it in memory.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, 'address_book.bin')
+            self.address_book.save_records_to_file(file_name)
+            address_book = AB.from_file(file_name)
+            text = self.export('jsonl', address_book)
+            address_book.data.close()
+
+        self.assertIn('"sasha"', text)
+        self.assertEqual(address_book.data._records, {})
+
+    def test_export_command_writes_file(self) -> None:
+        """
+        The test_export_command_writes_file function tests that the export command writes the
+        saved contacts to the file and reports their number.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = JournalStorage(os.path.join(temp_dir, 'address_book.bin'))
+            storage.save(self.address_book)
+            output_file = os.path.join(temp_dir, 'contacts.vcf')
+            output = io.StringIO()
+            with patch.object(commands, 'STORAGE', storage), redirect_stdout(output):
+                commands.export_contact_book('vcf', output_file)
+            with open(output_file, encoding='utf-8', newline='') as file:
+                text = file.read()
+
+        self.assertIn(f'2 contacts have been exported to {output_file}', output.getvalue())
+        self.assertTrue(text.startswith('BEGIN:VCARD\r\nVERSION:3.0\r\nFN:olya\r\n'))
+
+
+    def test_export_to_closed_pipe(self) -> None:
+        """
+        The test_export_to_closed_pipe function tests that an export to the standard output
+        stops without a traceback when the reader of the pipe exits, as head does.
+        """
+        address_book = AB()
+        address_book.add_records(Record(User(f'contact{number}')) for number in range(5000))
+        with tempfile.TemporaryDirectory() as home:
+            JournalStorage(os.path.join(home, 'address_book.bin')).replace(address_book)
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'personal_helper.run_bot', 'export', '-f', 'jsonl'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=home,
+                env={**os.environ, 'HOME': home, 'PYTHONPATH': root},
+            )
+            first_line = process.stdout.readline()
+            process.stdout.close()
+            errors = process.stderr.read().decode()
+            process.stderr.close()
+            process.wait()
+
+        self.assertIn(b'"contact0"', first_line)
+        self.assertNotIn('Traceback', errors)
+        self.assertEqual(process.returncode, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests the contact generator"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from personal_helper.address_book import AddressBook as AB
+from personal_helper.importer import import_contacts
+from personal_helper.storage import JournalStorage
+
+try:
+    import generator_of_contacts
+except ImportError:
+    generator_of_contacts = None
+
+
+@unittest.skipIf(generator_of_contacts is None, 'Faker is not installed')
+class TestGeneratorOfContacts(unittest.TestCase):
+    """Tests the contact generator"""
+
+    def generate(self, n: int, workers: int = 1, **distribution) -> str:
+        """
+        Generates n contacts with small chunks and returns the text of the JSON Lines file.
+        """
+        chunks = generator_of_contacts.generate_chunks(
+            n, seed=5, workers=workers, chunk_size=40, **distribution
+        )
+        return ''.join(chunks)
+
+    def test_same_seed_same_contacts(self) -> None:
+        """
+        The test_same_seed_same_contacts function tests that the contacts depend on the seed
+        and not on the number of workers.
+        """
+        text = self.generate(200, cyrillic=0.5)
+
+        self.assertEqual(self.generate(200, workers=2, cyrillic=0.5), text)
+        self.assertNotEqual(''.join(generator_of_contacts.generate_chunks(200, seed=6, chunk_size=40)), text)
+
+    def test_contacts_are_valid_and_unique(self) -> None:
+        """
+        The test_contacts_are_valid_and_unique function tests that every generated contact,
+        Cyrillic names included, is accepted by the import.
+        """
+        address_book = AB()
+        imported, rejected = import_contacts(
+            address_book, io.StringIO(self.generate(500, cyrillic=0.5)), 'jsonl', io.StringIO(), workers=1
+        )
+
+        self.assertEqual((imported, rejected), (500, 0))
+        self.assertTrue(any(not name.isascii() for name in address_book))
+
+    def test_distribution(self) -> None:
+        """
+        The test_distribution function tests the numbers of phone numbers, emails and birthdays.
+        """
+        rows = [json.loads(line) for line in self.generate(100, phones=(0, 0, 1), emails=0, birthdays=1).splitlines()]
+
+        self.assertTrue(all(len(row['phones']) == 2 for row in rows))
+        self.assertTrue(all(row['emails'] == [] for row in rows))
+        self.assertTrue(all(row['birthday'] for row in rows))
+        with self.assertRaises(ValueError):
+            next(generator_of_contacts.generate_chunks(1, phones=(1,) * 10))
+
+    def test_write_storage(self) -> None:
+        """
+        The test_write_storage function tests that the generated records replace the stored
+        address book chunk by chunk.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = JournalStorage(os.path.join(temp_dir, 'address_book.bin'))
+            chunks = generator_of_contacts.generate_chunks(120, seed=5, as_records=True, chunk_size=40)
+            generator_of_contacts.write_storage(chunks, storage)
+
+            self.assertEqual(len(storage.load()), 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests bulk import"""
+
+import csv
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest.mock import patch
+
+from personal_helper import commands
+from personal_helper.address_book import Record, AddressBook as AB
+from personal_helper.entities import Phone, User
+from personal_helper.importer import import_contacts
+from personal_helper.storage import JournalStorage
+
+
+class TestImport(unittest.TestCase):
+    """Tests bulk import"""
+
+    def setUp(self) -> None:
+        self.address_book = AB()
+        record = Record(User('Alice'))
+        record.add_phone_number(Phone('+380501234567'))
+        self.address_book.add_record(record)
+
+    def import_text(self, text: str, file_format: str, workers: int = 1) -> tuple:
+        """
+        Imports the text into the address book and returns the counts and the rejected rows.
+        """
+        rejects = io.StringIO()
+        counts = import_contacts(
+            self.address_book, io.StringIO(text), file_format, rejects, workers, chunk_size=2
+        )
+        return counts, list(csv.reader(io.StringIO(rejects.getvalue())))[1:]
+
+    def test_import_csv(self) -> None:
+        """
+        The test_import_csv function tests that the valid rows of a CSV file are added with
+        their sanitized phone numbers, emails and birthdays, and the others are rejected with
+        their line numbers and reasons.
+        """
+        (imported, rejected), rejects = self.import_text(
+            'name,phones,emails,birthday\n'
+            'Bob,38(050)111-22-33;0671234567,bob@gmail.com,17-05-1990\n'
+            'B0b,380501112244,,\n'
+            'Carol,,carol,\n'
+            'Dave,380501234567,,\n'
+            'Alice,,,\n'
+            'Eve,,,31-02-1990\n'
+            'Bob,,,\n',
+            'csv',
+        )
+
+        self.assertEqual((imported, rejected), (1, 6))
+        self.assertEqual(list(self.address_book), ['Alice', 'Bob'])
+        bob = self.address_book.get_contact('Bob')
+        self.assertEqual(bob.phones(), ['+380501112233', '+0671234567'])
+        self.assertEqual(bob.email_addresses(), ['bob@gmail.com'])
+        self.assertEqual(bob.user.birthday_date, date(1990, 5, 17))
+        self.assertEqual([row[0] for row in rejects], ['3', '4', '5', '6', '7', '8'])
+        self.assertIn("belongs to Alice", rejects[2][1])
+        self.assertIn("already exists", rejects[3][1])
+        self.assertIn("already exists", rejects[5][1])
+
+    def test_import_jsonl_with_workers(self) -> None:
+        """
+        The test_import_jsonl_with_workers function tests that a JSON Lines file validated in
+        worker processes is imported in the order of the file, with lists of values accepted
+        and broken lines rejected.
+        """
+        (imported, rejected), rejects = self.import_text(
+            '{"name": "Bob", "phones": ["380501112233", "380501112244"]}\n'
+            '\n'
+            'not json\n'
+            '{"name": "Carol", "email": "carol@gmail.com"}\n'
+            '{"name": "Dave", "phone": "380501112244"}\n',
+            'jsonl',
+            workers=2,
+        )
+
+        self.assertEqual((imported, rejected), (2, 2))
+        self.assertEqual(list(self.address_book), ['Alice', 'Bob', 'Carol'])
+        self.assertEqual(self.address_book.find_by_phone('+380501112244'), ['Bob'])
+        self.assertEqual([row[0] for row in rejects], ['3', '5'])
+        self.assertIn('Invalid JSON', rejects[0][1])
+
+    def test_import_command_saves_once(self) -> None:
+        """
+        The test_import_command_saves_once function tests that the import command saves the
+        address book once and writes the reject file next to the source.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, 'contacts.csv')
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write('name,phones\nBob,380501112233\nC4rol,\n')
+            storage = JournalStorage(os.path.join(temp_dir, 'address_book.bin'))
+            output = io.StringIO()
+            with patch.object(commands, 'STORAGE', storage), \
+                    patch.object(storage, 'save', wraps=storage.save) as save, \
+                    redirect_stdout(output):
+                commands.import_contact_book(source, workers=1)
+
+            self.assertEqual(save.call_count, 1)
+            self.assertIn('1 contacts have been imported, 1 rows rejected.', output.getvalue())
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, 'contacts.rejects.csv')))
+            self.assertEqual(list(storage.load()), ['Bob'])
+
+
+if __name__ == '__main__':
+    unittest.main()
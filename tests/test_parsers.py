@@ -0,0 +1,120 @@
+"""Tests parsers"""
+
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from personal_helper import run_bot
+from personal_helper.constants import LIST_COMMANDS, SOCKET_FILE
+from personal_helper.parsers import COMMANDS, fast_parse, get_parser, parse_arguments
+
+
+class TestParsers(unittest.TestCase):
+    """Tests parsers"""
+
+    def test_every_command_has_arguments(self) -> None:
+        """
+        The test_every_command_has_arguments function tests that the registry defines the
+        arguments of every command of pbot.
+        """
+        self.assertEqual(list(COMMANDS), LIST_COMMANDS)
+
+    def test_parser_is_built_once(self) -> None:
+        """
+        The test_parser_is_built_once function tests that the parser of a command is kept.
+        """
+        self.assertIs(get_parser('add'), get_parser('add'))
+
+    def test_fast_parse_matches_argparse(self) -> None:
+        """
+        The test_fast_parse_matches_argparse function tests that the fast path gives the same
+        values as the parser of the command, defaults included.
+        """
+        lines = [
+            ('show', '-a all'),
+            ('show', '-a sasha -a olya'),
+            ('search', '-s 095'),
+            ('search', '-s sa --prefix -k 3'),
+            ('search', '--prefix -s sa'),
+            ('search', '-s oleksandr --fuzzy -k 3'),
+            ('whois', '-p +380951234567'),
+            ('whois', '-d gmail.com'),
+            ('birth', '-d 7'),
+            ('show', ''),
+        ]
+        for command, arguments in lines:
+            with self.subTest(command=command, arguments=arguments):
+                parsed = fast_parse(command, arguments.split())
+                expected = get_parser(command).parse_args(arguments.split())
+                self.assertEqual(vars(parsed), vars(expected))
+
+    def test_fast_parse_leaves_other_arguments_to_argparse(self) -> None:
+        """
+        The test_fast_parse_leaves_other_arguments_to_argparse function tests that the fast path
+        gives up on help, unknown options, missing values and values of the wrong type.
+        """
+        for command, arguments in [
+            ('show', '-h'),
+            ('show', '-x all'),
+            ('show', '-a'),
+            ('search', '-s sa -k many'),
+            ('search', '-s -k 3'),
+            ('whois', '-p=+380951234567'),
+        ]:
+            with self.subTest(command=command, arguments=arguments):
+                self.assertIsNone(fast_parse(command, arguments.split()))
+
+    def test_parse_arguments_reports_errors_with_argparse(self) -> None:
+        """
+        The test_parse_arguments_reports_errors_with_argparse function tests that invalid
+        arguments of a fast command end with the error of argparse.
+        """
+        errors = io.StringIO()
+        with redirect_stderr(errors), self.assertRaises(SystemExit):
+            parse_arguments('search', '-s sa -k many')
+
+        self.assertIn("argument -k: invalid int value: 'many'", errors.getvalue())
+
+    def test_parse_arguments_joins_note_text(self) -> None:
+        """
+        The test_parse_arguments_joins_note_text function tests that the words of a note are
+        joined into one text and the defaults of the other commands are set.
+        """
+        note = parse_arguments('note', '-a #work -n buy some milk')
+        serve = parse_arguments('serve', '-i 5')
+
+        self.assertEqual(note.add, ['#work'])
+        self.assertEqual(note.note, 'buy some milk ')
+        self.assertEqual((serve.socket, serve.interval), (SOCKET_FILE, 5.0))
+
+    def test_run_command_dispatches_to_handler(self) -> None:
+        """
+        The test_run_command_dispatches_to_handler function tests that a command line is parsed
+        and sent to the command of the address book.
+        """
+        commands = run_bot.import_subsystem('commands')
+        with patch.object(commands, 'complete_contact_name') as complete_contact_name:
+            self.assertTrue(run_bot.run_command('search -s sa --prefix -k 3'))
+
+        complete_contact_name.assert_called_once_with('sa', 3)
+
+        with patch.object(commands, 'fuzzy_search_contact') as fuzzy_search_contact:
+            self.assertTrue(run_bot.run_command('search -s oleksandr --fuzzy'))
+
+        fuzzy_search_contact.assert_called_once_with('oleksandr', 10)
+
+    def test_run_command_without_arguments_fails(self) -> None:
+        """
+        The test_run_command_without_arguments_fails function tests that a command used without
+        the arguments it needs is rejected.
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertFalse(run_bot.run_command('note'))
+
+        self.assertIn('Command *note* invalid or used without arguments!', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests profiling"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from benchmarks.bench_startup import ROOT
+from personal_helper import commands, run_bot
+from personal_helper.profiling import PHASES, Profiler, split_profile_options
+from personal_helper.storage import JournalStorage
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests profiling"""
+
+    def test_nested_phases_add_up(self) -> None:
+        """
+        The test_nested_phases_add_up function tests that the time of a phase started inside
+        another one is taken off the outer phase, so the phases add up to the total.
+        """
+        profiler = Profiler()
+        with profiler.phase('execute'):
+            pass
+        self.assertEqual(profiler.seconds, {})
+
+        profiler.start(memory=True)
+        with profiler.phase('execute'):
+            with profiler.phase('load'):
+                time.sleep(0.02)
+                buffer = bytearray(1024 * 1024)
+            del buffer
+        report = profiler.stop()
+
+        self.assertGreaterEqual(report['seconds']['load'], 0.02)
+        self.assertLess(report['seconds']['execute'], 0.02)
+        self.assertAlmostEqual(report['total'], sum(report['seconds'].values()))
+        self.assertGreaterEqual(report['peaks']['load'], 1024 * 1024)
+
+    def test_split_profile_options(self) -> None:
+        """
+        The test_split_profile_options function tests that only the options before the
+        command are taken as profiling options.
+        """
+        options, args = split_profile_options(['--profile-metrics', 'm.jsonl', 'show', '-a', '--profile'])
+
+        self.assertEqual(options.profile_metrics, 'm.jsonl')
+        self.assertFalse(options.profile)
+        self.assertEqual(args, ['show', '-a', '--profile'])
+        self.assertEqual(split_profile_options(['show', '-a', 'all']), (None, ['show', '-a', 'all']))
+
+    def test_main_writes_metrics(self) -> None:
+        """
+        The test_main_writes_metrics function tests that pbot --profile prints the phases to
+        the standard error and appends them to the metrics file.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = JournalStorage(os.path.join(temp_dir, 'address_book.bin'))
+            metrics = os.path.join(temp_dir, 'metrics.jsonl')
+            argv = ['pbot', '--profile', '--profile-metrics', metrics, 'add', '-n', 'Sasha', '-p', '380951234567']
+            output, errors = io.StringIO(), io.StringIO()
+            with patch.object(commands, 'STORAGE', storage), patch.object(run_bot, 'argv', argv), \
+                    redirect_stdout(output), redirect_stderr(errors):
+                run_bot.main()
+            with open(metrics, encoding='utf-8') as file:
+                report = json.loads(file.readline())
+
+        self.assertIn("The contact 'Sasha' has been added", output.getvalue())
+        self.assertEqual([line.split()[0] for line in errors.getvalue().splitlines()[1:-1]], PHASES)
+        self.assertEqual(report['command'], 'add')
+        self.assertTrue({'startup', 'parse', 'load', 'execute', 'persist'} <= set(report['seconds']))
+
+    def test_subsystem_import_is_not_execute(self) -> None:
+        """
+        The test_subsystem_import_is_not_execute function tests that the import of the address
+        book by a profiled show is measured as the import phase and not as the execute phase.
+        """
+        with tempfile.TemporaryDirectory() as home:
+            metrics = os.path.join(home, 'metrics.jsonl')
+            subprocess.run(
+                [sys.executable, '-m', 'personal_helper.run_bot', '--profile-metrics', metrics, 'show', '-a', 'all'],
+                capture_output=True,
+                cwd=home,
+                env={**os.environ, 'HOME': home, 'PYTHONPATH': ROOT},
+                check=True,
+            )
+            with open(metrics, encoding='utf-8') as file:
+                seconds = json.loads(file.readline())['seconds']
+
+        self.assertGreater(seconds['import'], seconds['execute'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests the pbot server and client"""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from personal_helper.server import Server, ThreadLocalStdout
+from personal_helper.client import send_command
+
+
+class TestServer(unittest.TestCase):
+    """Tests the pbot server and client"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, 'pbot.sock')
+        self.commands = []
+        self.running = 0
+        self.most_running = {'show': 0, 'add': 0}
+        self.counter_lock = threading.Lock()
+        self.stdout = sys.stdout
+        sys.stdout = ThreadLocalStdout(self.stdout)
+
+        self.server = Server(self.run_command, lambda command: command.startswith('show'),
+                             flush=lambda: None)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.listener = self.call(self.server.start(self.socket_path))
+
+    def tearDown(self) -> None:
+        self.listener.close()
+        self.call(self.listener.wait_closed())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.server.executor.shutdown()
+        sys.stdout = self.stdout
+        self.temp_dir.cleanup()
+
+    def call(self, coroutine):
+        """
+        Runs a coroutine in the event loop of the server and returns its result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    def run_command(self, command: str) -> bool:
+        """
+        Records the command and how many commands of its kind run at the same time, prints
+        it back and fails the commands starting with 'bad'.
+        """
+        kind = command.split(' ')[0]
+        with self.counter_lock:
+            self.commands.append(command)
+            self.running += 1
+            if kind in self.most_running:
+                self.most_running[kind] = max(self.most_running[kind], self.running)
+        time.sleep(0.05)
+        print(f'ran {command}')
+        with self.counter_lock:
+            self.running -= 1
+        return not command.startswith('bad')
+
+    def send_many(self, commands: list[str]) -> list[dict]:
+        """
+        Sends every command from its own thread at the same time and returns the responses.
+        """
+        responses = [None] * len(commands)
+
+        def send(i: int) -> None:
+            responses[i] = send_command(commands[i], self.socket_path)
+
+        threads = [threading.Thread(target=send, args=(i,)) for i in range(len(commands))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_send_command(self) -> None:
+        """
+        The test_send_command function tests that the client gets the output of the command
+        and whether it succeeded.
+        """
+        self.assertEqual(send_command('show -a all', self.socket_path),
+                         {'ok': True, 'output': 'ran show -a all\n'})
+        self.assertEqual(send_command('bad command', self.socket_path),
+                         {'ok': False, 'output': 'ran bad command\n'})
+        self.assertEqual(self.commands, ['show -a all', 'bad command'])
+
+    def test_many_requests_over_one_connection(self) -> None:
+        """
+        The test_many_requests_over_one_connection function tests that a connection can send
+        many requests and that an invalid request gets an error response.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            with sock.makefile('rwb') as file:
+                file.write(b'{"command": "show -a one"}\nnot json\n{"command": "show -a two"}\n')
+                file.flush()
+                responses = [file.readline() for _ in range(3)]
+
+        self.assertIn(b'"ok": true', responses[0])
+        self.assertEqual(responses[1], b'{"ok": false, "output": "Invalid request.\\n"}\n')
+        self.assertIn(b'ran show -a two', responses[2])
+        self.assertEqual(self.commands, ['show -a one', 'show -a two'])
+
+    def test_reads_run_together_and_writes_alone(self) -> None:
+        """
+        The test_reads_run_together_and_writes_alone function tests that the reads sent at the
+        same time run side by side, that a write never runs with another command, and that
+        every client gets only the output of its own command.
+        """
+        commands = [f'show -a {i}' for i in range(4)] + [f'add -n {i}' for i in range(2)]
+        responses = self.send_many(commands)
+
+        self.assertEqual([response['output'] for response in responses],
+                         [f'ran {command}\n' for command in commands])
+        self.assertGreater(self.most_running['show'], 1)
+        self.assertEqual(self.most_running['add'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests startup"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from benchmarks.bench_startup import ROOT, import_times, imported_modules
+
+HEAVY_MODULES = {
+    'personal_helper.address_book',
+    'personal_helper.commands',
+    'personal_helper.importer',
+    'personal_helper.server',
+    'personal_helper.storage',
+}
+
+
+class TestStartup(unittest.TestCase):
+    """Tests startup"""
+
+    def run_pbot(self, *args: str) -> set[str]:
+        """
+        Runs pbot with the arguments in a temporary home directory and returns the modules of
+        the package it imported, apart from run_bot, which is run as the main module.
+        """
+        with tempfile.TemporaryDirectory() as home:
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-m', 'personal_helper.run_bot', *args],
+                capture_output=True,
+                text=True,
+                cwd=home,
+                env={**os.environ, 'HOME': home, 'PYTHONPATH': ROOT},
+                check=True,
+            )
+        return imported_modules(result.stderr)
+
+    def test_help_imports_no_subsystem(self) -> None:
+        """
+        The test_help_imports_no_subsystem function tests that the help of pbot imports none
+        of the modules of the commands, the storage and the server.
+        """
+        modules = self.run_pbot('-h')
+
+        self.assertIn('personal_helper.profiling', modules)
+        self.assertFalse(modules & HEAVY_MODULES)
+
+    def test_note_command_imports_notes_only(self) -> None:
+        """
+        The test_note_command_imports_notes_only function tests that a note command imports
+        the notes without the address book.
+        """
+        modules = self.run_pbot('note', '-f', 'work')
+
+        self.assertIn('personal_helper.note_commands', modules)
+        self.assertFalse(modules & HEAVY_MODULES)
+
+    def test_show_command_imports_address_book(self) -> None:
+        """
+        The test_show_command_imports_address_book function tests that a command on the
+        contacts imports the commands and the storage but not the server or the importer.
+        """
+        modules = self.run_pbot('show', '-a', 'all')
+
+        self.assertTrue({'personal_helper.commands', 'personal_helper.storage'} <= modules)
+        self.assertNotIn('personal_helper.server', modules)
+        self.assertNotIn('personal_helper.importer', modules)
+
+    def test_import_times_keeps_top_level_imports(self) -> None:
+        """
+        The test_import_times_keeps_top_level_imports function tests that the nested imports
+        are left out of the import times.
+        """
+        stderr = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        100 |     _json\n'
+            'import time:       300 |        400 | json\n'
+        )
+
+        self.assertEqual(import_times(stderr), {'json': 400})
+
+
+if __name__ == '__main__':
+    unittest.main()
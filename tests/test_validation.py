@@ -1,6 +1,8 @@
 """Tests validation"""
 
+import io
 import unittest
+from contextlib import redirect_stdout
 from personal_helper.entities import User, Email, Phone
 from personal_helper.address_book import AddressBook as AB, Record
 from personal_helper.validation import (
@@ -14,6 +16,7 @@ from personal_helper.validation import (
     check_email_in_address_book,
     check_email_not_in_address_book,
     check_phone_number_in_address_book,
+    check_phone_number_owner,
     check_phone_number_not_in_address_book
 )
 
@@ -163,6 +166,20 @@ class TestValidation(unittest.TestCase):
             check_name_not_in_address_book(address_book, name)
         self.assertEqual('Try again!', context.exception.code)
 
+    def test_check_name_not_in_address_book_suggests_names(self) -> None:
+        """
+        The test_check_name_not_in_address_book_suggests_names function checks that the error
+        of a contact that was not found names the contacts within a few typos of it.
+        """
+        address_book = AB()
+        for name in ("Alex", "Olga", "Olya"):
+            address_book.add_record(Record(User(name)))
+
+        output = io.StringIO()
+        with redirect_stdout(output), self.assertRaises(SystemExit):
+            check_name_not_in_address_book(address_book, "Oyla")
+        self.assertIn("The contact 'Oyla' was not found. Did you mean 'Olya'?", output.getvalue())
+
     def test_check_phone_number_in_address_book(self) -> None:
         """
         The test_check_phone_number_in_address_book function checks if the phone number is already in the address book.
@@ -180,6 +197,22 @@ class TestValidation(unittest.TestCase):
             check_phone_number_in_address_book(contact, phone, name)
         self.assertEqual('Try again!', context.exception.code)
 
+    def test_check_phone_number_owner(self) -> None:
+        """
+        The test_check_phone_number_owner function checks that a phone number of one contact
+        can not be added to another contact, while the owner itself passes the check.
+        """
+        address_book = AB()
+        contact = Record(User("Alex"))
+        contact.add_phone_number(Phone('3809991112233'))
+        address_book.add_record(contact)
+        phone = Phone('+3809991112233')
+
+        self.assertIsNone(check_phone_number_owner(address_book, phone, "Alex"))
+        with self.assertRaises(SystemExit) as context:
+            check_phone_number_owner(address_book, phone, "Olya")
+        self.assertEqual('Try again!', context.exception.code)
+
     def test_check_phone_number_not_in_address_book(self) -> None:
         """
         The test_check_phone_number_not_in_address_book function checks if the phone number is already in the address book.
@@ -212,7 +245,7 @@ class TestValidation(unittest.TestCase):
         name = "Alex"
 
         with self.assertRaises(SystemExit) as context:
-            check_email_in_address_book(contact, email, name)
+            check_email_in_address_book(address_book, email, name)
         self.assertEqual('Try again!', context.exception.code)
 
     def test_check_email_not_in_address_book(self) -> None:
@@ -229,7 +262,7 @@ class TestValidation(unittest.TestCase):
         name = "Alex"
 
         with self.assertRaises(SystemExit) as context:
-            check_email_not_in_address_book(contact, email, name)
+            check_email_not_in_address_book(address_book, email, name)
         self.assertEqual('Try again!', context.exception.code)
 
 